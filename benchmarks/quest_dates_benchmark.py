@@ -0,0 +1,258 @@
+"""
+Benchmark de l'extraction des dates de quêtes (utils/quest_dates.py).
+
+Génère un corpus de quelques milliers d'annonces de quêtes dans le style du
+canal #quetes (dates numériques, textuelles FR/EN, horaires, mentions...),
+puis mesure le débit (messages/seconde) de l'extracteur actuel et de
+l'implémentation d'origine, et vérifie que les deux donnent le même résultat
+pour chaque message.
+
+UTILISATION:
+    python -m benchmarks.quest_dates_benchmark [--messages 5000] [--repeat 3]
+
+Code de sortie 1 si un résultat diffère de l'implémentation d'origine.
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from utils.quest_dates import determine_best_year, extract_quest_date
+
+MOIS_FR = ['janvier', 'février', 'mars', 'avril', 'mai', 'juin', 'juillet',
+           'août', 'septembre', 'octobre', 'novembre', 'décembre']
+MOIS_EN = ['january', 'february', 'march', 'april', 'may', 'june', 'july',
+           'august', 'september', 'october', 'november', 'december']
+
+TITRES = [
+    "La crypte oubliée", "Escorte vers Padhiver", "Les loups de la Haute Lande",
+    "Le marché noir d'Eauprofonde", "Chasse au dragon vert", "Le bal masqué",
+    "Ruines de Myth Drannor", "Contrat de la guilde des marchands",
+]
+
+CORPS = [
+    "Niveau {niv1}-{niv2}, {places} places.",
+    "Durée prévue : {duree}h environ. Prévoir vos fiches à jour.",
+    "Récompense : {po} po + objet magique mineur.",
+    "Merci de confirmer votre présence en réaction ✅",
+    "Session en vocal, salon #table-{table}.",
+]
+
+
+def _format_date(rng: random.Random, date: datetime) -> str:
+    """Écrit une date dans l'un des formats utilisés par les MJ."""
+    jour, mois, annee = date.day, date.month, date.year
+    heure = f"{rng.randint(14, 21)}h{rng.choice(['', '00', '30'])}"
+    formats = [
+        f"{jour:02d}/{mois:02d}/{annee}",
+        f"{jour}/{mois}/{annee % 100:02d}",
+        f"{jour:02d}-{mois:02d}-{annee}",
+        f"{jour:02d}.{mois:02d}",
+        f"{annee}-{mois:02d}-{jour:02d}",
+        f"le {jour:02d}/{mois:02d} à {heure}",
+        f"{jour:02d}/{mois:02d} prochain",
+        f"{jour}/{mois} à {heure}",
+        f"{jour} {MOIS_FR[mois - 1]}",
+        f"{jour} {MOIS_FR[mois - 1]} {annee}",
+        f"{jour} {MOIS_FR[mois - 1].capitalize()}",
+        f"{jour} {MOIS_FR[mois - 1][:3]}. {annee}",
+        f"{jour} {MOIS_EN[mois - 1]}",
+        f"{jour} {MOIS_EN[mois - 1][:3]} {annee}",
+        f"{jour} {mois} {annee}",
+        f"Le {jour:02d}/{mois:02d}",
+    ]
+    return rng.choice(formats)
+
+
+def build_corpus(count: int, seed: int = 42):
+    """Génère `count` annonces (texte, date de publication) reproductibles."""
+    rng = random.Random(seed)
+    origin = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    corpus = []
+
+    for _ in range(count):
+        posted = origin + timedelta(minutes=rng.randint(0, 2 * 365 * 24 * 60))
+        quest = posted + timedelta(days=rng.randint(-5, 60))
+
+        lignes = [f"**{rng.choice(TITRES)}**"]
+        if rng.random() < 0.9:
+            lignes.append(f"📅 {_format_date(rng, quest)}")
+        for modele in rng.sample(CORPS, rng.randint(1, 4)):
+            lignes.append(modele.format(
+                niv1=rng.randint(1, 10), niv2=rng.randint(11, 20),
+                places=rng.randint(3, 6), duree=rng.randint(2, 5),
+                po=rng.randint(1, 20) * 50, table=rng.randint(1, 4)))
+        lignes.append(" ".join(f"<@{rng.randint(10**17, 10**18)}>"
+                               for _ in range(rng.randint(2, 6))))
+        rng.shuffle(lignes[1:])
+        corpus.append(("\n".join(lignes), posted))
+
+    return corpus
+
+
+def legacy_extract_quest_date(text: str, now: datetime) -> tuple:
+    """Implémentation d'origine (un re.finditer par format), pour comparaison."""
+
+    # Nettoyer le texte pour éviter les faux positifs
+    text_clean = text.replace('h', ':').replace('H',
+                                                ':')  # "14h30" -> "14:30"
+
+    # MEGA liste de patterns pour tous les formats possibles
+    date_patterns = [
+        # === FORMATS AVEC ANNÉE COMPLÈTE ===
+        r'(\d{1,2})[/\-\.](\d{1,2})[/\-\.](\d{4})',  # JJ/MM/AAAA, JJ-MM-AAAA, JJ.MM.AAAA
+        r'(\d{1,2})\s+(\d{1,2})\s+(\d{4})',  # JJ MM AAAA
+        r'(\d{4})[/\-\.](\d{1,2})[/\-\.](\d{1,2})',  # AAAA/MM/JJ (format ISO inversé)
+
+        # === FORMATS AVEC ANNÉE COURTE ===
+        r'(\d{1,2})[/\-\.](\d{1,2})[/\-\.](\d{2})',  # JJ/MM/AA, JJ-MM-AA, JJ.MM.AA
+        r'(\d{1,2})\s+(\d{1,2})\s+(\d{2})',  # JJ MM AA
+
+        # === FORMATS SANS ANNÉE (priorité aux plus spécifiques) ===
+        r'(\d{1,2})[/\-\.](\d{1,2})(?:\s+[aà]\s+\d{1,2}[h:]?\d{0,2})',  # JJ/MM à 14h30
+        r'(\d{1,2})[/\-\.](\d{1,2})(?=\s+[^\d/\-\.])',  # JJ/MM suivi d'un mot
+        r'(\d{1,2})[/\-\.](\d{1,2})(?![/\-\.\d])',  # JJ/MM pas suivi de chiffres
+        r'(\d{1,2})\s+(\d{1,2})(?!\s+\d{2,4})',  # JJ MM (pas suivi d'année)
+
+        # === FORMATS TEXTUELS FRANÇAIS ===
+        r'(\d{1,2})\s+(janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)\s+(\d{4})',
+        r'(\d{1,2})\s+(janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)\s+(\d{2})',
+        r'(\d{1,2})\s+(janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)(?!\s+\d)',
+        r'(\d{1,2})\s+(jan|fév|mar|avr|mai|jun|jul|aoû|sep|oct|nov|déc)\.?\s+(\d{4})',
+        r'(\d{1,2})\s+(jan|fév|mar|avr|mai|jun|jul|aoû|sep|oct|nov|déc)\.?(?!\s+\d)',
+
+        # === FORMATS ANGLAIS ===
+        r'(\d{1,2})\s+(january|february|march|april|may|june|july|august|september|october|november|december)\s+(\d{4})',
+        r'(\d{1,2})\s+(january|february|march|april|may|june|july|august|september|october|november|december)(?!\s+\d)',
+        r'(\d{1,2})\s+(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\.?\s+(\d{4})',
+        r'(\d{1,2})\s+(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\.?(?!\s+\d)',
+
+        # === FORMATS AVEC MOTS-CLÉS ===
+        r'le\s+(\d{1,2})[/\-\.](\d{1,2})(?:[/\-\.](\d{2,4}))?',  # "le 28/06" ou "le 28/06/2025"
+        r'(\d{1,2})[/\-\.](\d{1,2})\s+prochain',  # "28/06 prochain"
+        r'(\d{1,2})[/\-\.](\d{1,2})\s+à\s+',  # "28/06 à 14h30"
+    ]
+
+    # Dictionnaire pour convertir les mois textuels (FR + EN)
+    mois_mapping = {
+        # Français complet
+        'janvier': 1, 'février': 2, 'mars': 3, 'avril': 4,
+        'mai': 5, 'juin': 6, 'juillet': 7, 'août': 8,
+        'septembre': 9, 'octobre': 10, 'novembre': 11, 'décembre': 12,
+        # Français abrégé
+        'jan': 1, 'fév': 2, 'mar': 3, 'avr': 4,
+        'jun': 6, 'jul': 7, 'aoû': 8,
+        'sep': 9, 'oct': 10, 'nov': 11, 'déc': 12,
+        # Anglais complet
+        'january': 1, 'february': 2, 'march': 3, 'april': 4,
+        'may': 5, 'june': 6, 'july': 7, 'august': 8,
+        'september': 9, 'october': 10, 'november': 11, 'december': 12,
+        # Anglais abrégé (uniquement ceux différents du français)
+        'feb': 2, 'apr': 4, 'aug': 8, 'dec': 12
+    }
+
+    for pattern in date_patterns:
+        matches = re.finditer(pattern, text_clean, re.IGNORECASE)
+        for match in matches:
+            try:
+                groups = match.groups()
+                date_string_found = match.group(0)
+
+                # Identifier le type de format
+                if any(month in groups for month in mois_mapping.keys()):
+                    # Format textuel avec nom de mois
+                    jour = int(groups[0])
+                    mois_text = groups[1].lower()
+                    mois = mois_mapping.get(mois_text)
+                    if not mois:
+                        continue
+
+                    if len(groups) >= 3 and groups[2]:
+                        annee = int(groups[2])
+                        if annee < 100:
+                            annee = 2000 + annee if annee < 50 else 1900 + annee
+                    else:
+                        annee = determine_best_year(jour, mois, now)
+
+                elif pattern.startswith(r'(\d{4})'):
+                    # Format AAAA/MM/JJ (ISO inversé)
+                    annee = int(groups[0])
+                    mois = int(groups[1])
+                    jour = int(groups[2])
+
+                else:
+                    # Format numérique standard JJ/MM[/AA[AA]]
+                    jour = int(groups[0])
+                    mois = int(groups[1])
+
+                    if len(groups) >= 3 and groups[2]:
+                        annee = int(groups[2])
+                        if annee < 100:
+                            annee = 2000 + annee if annee < 50 else 1900 + annee
+                    else:
+                        annee = determine_best_year(jour, mois, now)
+
+                # Validation des valeurs
+                if not (1 <= jour <= 31 and 1 <= mois <= 12):
+                    continue
+
+                # Créer la date
+                quest_date = datetime(annee,
+                                      mois,
+                                      jour,
+                                      tzinfo=timezone.utc)
+                return quest_date, date_string_found
+
+            except (ValueError, IndexError) as e:
+                continue
+
+    return None, None
+
+
+def _measure(extractor, corpus, repeat: int):
+    """Retourne (résultats, meilleur débit en messages/seconde)."""
+    best = None
+    results = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = [extractor(text, posted) for text, posted in corpus]
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return results, len(corpus) / best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.messages)
+    expected, legacy_rate = _measure(legacy_extract_quest_date, corpus, args.repeat)
+    actual, rate = _measure(extract_quest_date, corpus, args.repeat)
+
+    mismatches = [(text, want, got)
+                  for (text, _), want, got in zip(corpus, expected, actual)
+                  if want != got]
+
+    found = sum(1 for date, _ in actual if date)
+    print(f"Corpus : {len(corpus)} messages ({found} dates trouvées)")
+    print(f"Implémentation d'origine : {legacy_rate:,.0f} messages/s")
+    print(f"Extracteur actuel        : {rate:,.0f} messages/s "
+          f"(x{rate / legacy_rate:.2f})")
+
+    if mismatches:
+        print(f"❌ {len(mismatches)} résultat(s) différent(s), par exemple :")
+        for text, want, got in mismatches[:5]:
+            print(f"  {text!r}\n    attendu {want}\n    obtenu  {got}")
+        return 1
+
+    print("✅ Résultats identiques à l'implémentation d'origine")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Benchmark du score flou de /recherche-objet (utils/batch_scorer.py).
+
+Génère des catalogues d'objets magiques de 1 000, 10 000 et 100 000 lignes
+(noms FR/VO, type, source), puis mesure pour une série de recherches le
+débit (recherches/seconde) du score vectorisé et du score ligne par ligne
+sur tout le catalogue (FuzzyIndex.rank), et vérifie que les deux donnent le
+même classement.
+
+UTILISATION:
+    python -m benchmarks.search_scoring_benchmark [--rows 1000 10000 100000] [--limit 10]
+
+Le score ligne par ligne prend une minute environ sur 100 000 lignes.
+Code de sortie 1 si un classement diffère, 2 si NumPy n'est pas installé.
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from commands.boutique.search_index import SEARCH_WEIGHTS
+from utils.batch_scorer import NUMPY_AVAILABLE, BatchScorer
+from utils.fuzzy_search import FuzzyIndex
+
+OBJETS = [
+    ("épée", "sword", "arme"), ("bouclier", "shield", "armure"),
+    ("anneau", "ring", "anneau"), ("cape", "cloak", "objet merveilleux"),
+    ("bottes", "boots", "objet merveilleux"), ("baguette", "wand", "baguette"),
+    ("bâton", "staff", "bâton"), ("amulette", "amulet", "objet merveilleux"),
+    ("potion", "potion", "potion"), ("armure de plates", "plate armor", "armure"),
+    ("heaume", "helm", "objet merveilleux"), ("gantelets", "gauntlets", "objet merveilleux"),
+    ("ceinture", "belt", "objet merveilleux"), ("sceptre", "rod", "sceptre"),
+    ("arc long", "longbow", "arme"), ("hache d'armes", "battleaxe", "arme"),
+]
+
+EFFETS = [
+    ("de feu", "of fire"), ("de protection", "of protection"), ("du dragon", "of the dragon"),
+    ("des ombres", "of shadows"), ("de vitesse", "of speed"), ("elfique", "elven"),
+    ("nain", "dwarven"), ("de résistance", "of resistance"), ("+1", "+1"), ("+2", "+2"),
+    ("+3", "+3"), ("de lumière", "of light"), ("vorpale", "vorpal"), ("du mage", "of the mage"),
+    ("sacré", "holy"), ("de givre", "of frost"),
+]
+
+SOURCES = ["DMG", "XGE", "TCE", "FTD", "BGDIA", "Homebrew"]
+
+RECHERCHES = [
+    "épée de feu", "epee", "bouclier +2", "anneau prot", "cape des ombre",
+    "sword", "sceptre sacre", "bâton du mage", "dragon", "arc long elfique",
+    "gantelet", "armure naine", "potion vitesse", "xyz",
+]
+
+
+def build_catalog(count: int, seed: int = 42):
+    """Génère `count` lignes (nom FR, nom VO, type, source) reproductibles."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        nom_fr, nom_en, type_objet = rng.choice(OBJETS)
+        effet_fr, effet_en = rng.choice(EFFETS)
+        suffixe = f" {i}" if rng.random() < 0.5 else ""
+        rows.append((f"{nom_fr} {effet_fr}{suffixe}", f"{nom_en} {effet_en}",
+                     type_objet, rng.choice(SOURCES)))
+    return rows
+
+
+def _measure(rank, limit: int, min_similarity: float):
+    """Retourne (résultats, recherches/seconde)."""
+    started = time.perf_counter()
+    results = [rank(term, limit, min_similarity) for term in RECHERCHES]
+    elapsed = time.perf_counter() - started
+    return results, len(RECHERCHES) / elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--min-similarity", type=float, default=0.4)
+    args = parser.parse_args()
+
+    if not NUMPY_AVAILABLE:
+        print("❌ NumPy n'est pas installé : le score vectorisé est indisponible")
+        return 2
+
+    failed = False
+    for count in args.rows:
+        rows = build_catalog(count)
+
+        started = time.perf_counter()
+        batch = BatchScorer(rows, SEARCH_WEIGHTS)
+        build_time = time.perf_counter() - started
+        fuzzy = FuzzyIndex(rows, SEARCH_WEIGHTS)
+        all_rows = range(count)
+
+        actual, rate = _measure(
+            lambda term, limit, min_sim: batch.rank(term, None, limit, min_sim),
+            args.limit, args.min_similarity)
+        expected, loop_rate = _measure(
+            lambda term, limit, min_sim: fuzzy.rank(term, all_rows, limit, min_sim),
+            args.limit, args.min_similarity)
+
+        print(f"Catalogue : {count:,} lignes (encodage {build_time * 1000:.0f} ms)")
+        print(f"  Score ligne par ligne : {loop_rate:,.1f} recherches/s")
+        print(f"  Score vectorisé       : {rate:,.1f} recherches/s "
+              f"(x{rate / loop_rate:.1f})")
+
+        mismatches = [(term, want, got)
+                      for term, want, got in zip(RECHERCHES, expected, actual)
+                      if want != got]
+        if mismatches:
+            failed = True
+            print(f"  ❌ {len(mismatches)} classement(s) différent(s), par exemple :")
+            for term, want, got in mismatches[:3]:
+                print(f"    {term!r}\n      attendu {want[:3]}\n      obtenu  {got[:3]}")
+
+    if failed:
+        return 1
+
+    print("✅ Classements identiques au score ligne par ligne")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
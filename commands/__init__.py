@@ -23,6 +23,8 @@ from .mention_list import MentionListCommand
 from .recap_mj import RecapMjCommand
 from .top_mj import TopMjCommand
 from .stats_logs import StatsLogsCommand
+from .stats_usage import StatsUsageCommand
+from .search_logs import SearchLogsCommand
 from .topjoueurs import TopJoueurs as TopJoueursCommand
 
 # ============================================================================
@@ -44,6 +46,7 @@ from .pj_dispo import PjDispoCommand
 # CONFIGURATION ET ADMINISTRATION
 # ============================================================================
 from .config_channels import ConfigChannelsCommand
+from .index_status import IndexStatusCommand
 
 # ============================================================================
 # DISBOARD BUMP
@@ -102,6 +105,8 @@ ALL_COMMANDS = [
     RecapMjCommand,
     TopMjCommand,
     StatsLogsCommand,
+    StatsUsageCommand,
+    SearchLogsCommand,
     TopJoueursCommand,
     # Quêtes
 #    MesQuetesCommand,
@@ -111,6 +116,7 @@ ALL_COMMANDS = [
     PjDispoCommand,
     # Administration
     ConfigChannelsCommand,
+    IndexStatusCommand,
     # Disboard Bump
     DisboardBumpCommand,
 ]
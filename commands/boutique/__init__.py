@@ -8,7 +8,9 @@ pour générer des objets magiques au format OM_PRICE.
 ARCHITECTURE MODULAIRE:
     - main_command_v2.py        : Commande principale OM_PRICE
     - google_sheets_client.py   : Client pour accéder au Google Sheets public
+    - item_catalog.py           : Catalogue typé des objets (analysé une fois)
     - item_selector_v2.py       : Sélecteur d'objets OM_PRICE
+    - search_index.py           : Index mots/trigrammes pour /recherche-objet
     - response_builder_v2.py    : Constructeur de réponses OM_PRICE
     - config_v2.py             : Configuration OM_PRICE
     - __init__.py              : Assemblage et exports du module
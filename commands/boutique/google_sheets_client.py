@@ -3,13 +3,15 @@
 Client Google Sheets pour accéder aux données publiques sans authentification.
 """
 
-import aiohttp
 import csv
 import io
 import logging
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from urllib.parse import quote
 
+from utils.sheet_cache import get_sheet_cache
+from utils.sheet_prefetcher import get_sheet_prefetcher
+
 logger = logging.getLogger(__name__)
 
 class GoogleSheetsClient:
@@ -58,32 +60,59 @@ class GoogleSheetsClient:
         url = self._build_csv_url(sheet_name)
         
         try:
-            async with aiohttp.ClientSession() as session:
-                logger.info(f"Récupération des données depuis: {url}")
-                
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        raise Exception(f"Erreur HTTP {response.status}: {await response.text()}")
-                    
-                    # Récupération du contenu CSV
-                    csv_content = await response.text()
-                    
-                    # Parsing du CSV
-                    csv_reader = csv.DictReader(io.StringIO(csv_content))
-                    data = []
-                    
-                    for row in csv_reader:
-                        # Nettoyage des données (suppression des espaces)
-                        cleaned_row = {key.strip(): value.strip() for key, value in row.items()}
-                        data.append(cleaned_row)
-                    
-                    logger.info(f"Récupération réussie: {len(data)} lignes")
-                    return data
-                    
+            # Servi depuis le cache partagé (rechargé en fond après expiration)
+            return await get_sheet_cache().get(url, self._parse_csv)
+
         except Exception as e:
             logger.error(f"Erreur lors de la récupération des données: {e}")
             raise Exception(f"Impossible de récupérer les données du Google Sheets: {e}")
     
+    def peek_sheet_data(self, sheet_name: str) -> Optional[List[Dict[str, str]]]:
+        """
+        Retourne les données déjà en cache, sans appel réseau (autocomplétion).
+        
+        Args:
+            sheet_name: Nom de la feuille
+            
+        Returns:
+            Optional[List[Dict[str, str]]]: Lignes en cache, ou None si jamais chargées
+        """
+        return get_sheet_cache().peek(self._build_csv_url(sheet_name))
+    
+    def register_prefetch(self, sheet_name: str,
+                          on_update: Optional[Callable[[List[Dict[str, str]]], None]] = None):
+        """
+        Déclare la feuille au préchargement en tâche de fond
+        (voir utils/sheet_prefetcher.py).
+        
+        Args:
+            sheet_name: Nom de la feuille
+            on_update: Appelée avec les nouvelles lignes quand la feuille change
+        """
+        get_sheet_prefetcher().register(
+            sheet_name, self._build_csv_url(sheet_name), self._parse_csv, on_update)
+    
+    def _parse_csv(self, csv_content: str) -> List[Dict[str, str]]:
+        """
+        Analyse le contenu CSV d'une feuille.
+        
+        Args:
+            csv_content: Contenu CSV brut
+            
+        Returns:
+            List[Dict[str, str]]: Liste des lignes avec les colonnes comme clés
+        """
+        csv_reader = csv.DictReader(io.StringIO(csv_content))
+        data = []
+        
+        for row in csv_reader:
+            # Nettoyage des données (suppression des espaces)
+            cleaned_row = {key.strip(): value.strip() for key, value in row.items()}
+            data.append(cleaned_row)
+        
+        logger.info(f"Récupération réussie: {len(data)} lignes")
+        return data
+    
     async def test_connection(self, sheet_name: str) -> bool:
         """
         Test la connexion au Google Sheets.
@@ -0,0 +1,184 @@
+# commands/boutique/item_catalog.py
+"""
+Catalogue typé des objets OM_PRICE.
+
+Les lignes brutes du CSV (dictionnaires de chaînes) sont converties une
+seule fois en enregistrements compacts : rareté normalisée, prix numérique,
+drapeau VALIDATE, lien magique et textes d'affichage sont calculés à la
+construction. Les filtres et le constructeur de réponses ne font plus que
+des comparaisons d'attributs.
+
+Le catalogue est reconstruit seulement quand le cache des feuilles fournit
+de nouvelles lignes (nouvel objet liste) : tant que la feuille est
+inchangée, le même catalogue est réutilisé. À la reconstruction, les
+lignes inchangées (même objet, voir SheetCache._diff_rows) reprennent leur
+objet déjà analysé : seules les lignes modifiées sont analysées.
+"""
+
+import copy
+import logging
+from typing import Dict, List, Optional
+
+from .config_v2 import get_config, normalize_rarity_name
+
+logger = logging.getLogger(__name__)
+
+# Valeurs de prix affichées comme "Prix non spécifié"
+PRICE_DISPLAY_NA_VALUES = {'0', '0.0', '', 'NA', 'N/A', 'null', '-'}
+
+# Valeurs de prix supplémentaires exclues par le filtre prix
+PRICE_FILTER_NA_VALUES = ['0', '0.0', '-', 'null', 'None']
+
+
+class CatalogItem:
+    """Objet de la boutique, analysé une fois pour toutes."""
+
+    __slots__ = (
+        'index', 'row', 'nom_fr', 'nom_en', 'type', 'source',
+        'rarity', 'rarity_key', 'rarity_compact', 'rarity_display',
+        'price', 'price_display', 'validate_nok',
+        'lien_magique', 'lien_display', 'nom_display'
+    )
+
+    def __init__(self, index: int, row: Dict[str, str], columns: Dict[str, str],
+                 na_values: set):
+        """
+        Args:
+            index: Index de la ligne dans la feuille (0 = première ligne après l'en-tête)
+            row: Ligne brute du CSV
+            columns: Noms des colonnes (rareté, prix, validate)
+            na_values: Valeurs de prix considérées comme absentes par le filtre
+        """
+        self.index = index
+        self.row = row
+
+        self.nom_fr = (row.get("Nom de l'objet") or "").strip()
+        self.nom_en = (row.get("Nom en VO") or "").strip()
+        self.type = (row.get("Type") or "").strip()
+        self.source = (row.get("Source") or "").strip()
+        self.nom_display = self.nom_fr or self.nom_en or "Objet mystérieux"
+
+        # Rareté : clé de comparaison (minuscules) et libellé affiché
+        self.rarity = (row.get(columns['rarity'], "") or "").strip()
+        self.rarity_key = self.rarity.lower()
+        self.rarity_compact = self.rarity_key.replace(' ', '')
+        self.rarity_display = normalize_rarity_name(
+            self.rarity if columns['rarity'] in row else "Commun")
+
+        self.validate_nok = (row.get(columns['validate'], "") or "").strip().upper() == "NOK"
+
+        # Lien magique
+        lien_raw = (row.get("Lien", "Non") or "").strip()
+        if lien_raw.lower() in ('oui', 'yes', 'y'):
+            self.lien_display = "Oui"
+        elif lien_raw.lower() in ('non', 'no', 'n'):
+            self.lien_display = "Non"
+        else:
+            self.lien_display = lien_raw
+        self.lien_magique = self.lien_display == "Oui"
+
+        # Prix : valeur numérique (None si absente, invalide ou nulle) et affichage
+        price_raw = (row.get(columns['price'], "") or "").strip()
+        price_num = self._parse_price(price_raw)
+
+        self.price = None
+        if price_raw and price_raw not in na_values and price_num is not None and price_num > 0:
+            self.price = price_num
+
+        if price_raw in PRICE_DISPLAY_NA_VALUES:
+            self.price_display = "Prix non spécifié"
+        elif price_num is None:
+            # Si ce n'est pas un nombre, on garde tel quel
+            self.price_display = price_raw
+        elif price_num > 0:
+            self.price_display = f"{price_num:.0f} po"
+        else:
+            self.price_display = "Prix non spécifié"
+
+    @staticmethod
+    def _parse_price(price_raw: str) -> Optional[float]:
+        """Convertit un prix ('1 500 po', '1,500'...) en nombre, None si impossible."""
+        try:
+            return float(price_raw.replace(' po', '').replace('po', '').replace(',', '').strip())
+        except ValueError:
+            return None
+
+    @property
+    def has_price(self) -> bool:
+        """True si l'objet a un prix valide et non nul."""
+        return self.price is not None
+
+    def __repr__(self) -> str:
+        return f"CatalogItem({self.index}, {self.nom_display!r}, {self.rarity!r})"
+
+
+class ItemCatalog:
+    """Ensemble des objets d'une version de la feuille OM_PRICE."""
+
+    def __init__(self, rows: List[Dict[str, str]], version: int = 0,
+                 previous: Optional['ItemCatalog'] = None):
+        """
+        Args:
+            rows: Lignes brutes du CSV
+            version: Numéro de version du catalogue (incrémenté à chaque reconstruction)
+            previous: Catalogue précédent, dont les objets des lignes inchangées sont repris
+        """
+        config = get_config()
+        columns = {
+            'rarity': config['item_selection']['rarity_column'],
+            'price': config['filtering'].get('price_column', 'OM_PRICE'),
+            'validate': config['filtering'].get('validate_column', 'VALIDATE')
+        }
+        na_values = set(config['filtering']['na_values'] + PRICE_FILTER_NA_VALUES)
+
+        self.rows = rows
+        self.version = version
+        # Positions des objets nouveaux ou modifiés (None : tout le catalogue)
+        self.changed: Optional[List[int]] = None
+
+        if previous is None:
+            self.items = [CatalogItem(i, row, columns, na_values) for i, row in enumerate(rows)]
+            logger.info(f"Catalogue boutique construit (v{version}): {len(self.items)} objets")
+            return
+
+        known = {id(item.row): item for item in previous.items}
+        self.items = []
+        self.changed = []
+        for i, row in enumerate(rows):
+            item = known.get(id(row))
+            if item is None:
+                item = CatalogItem(i, row, columns, na_values)
+                self.changed.append(i)
+            elif item.index != i:
+                # Ligne déplacée : copie, l'ancien catalogue peut encore être affiché
+                item = copy.copy(item)
+                item.index = i
+            self.items.append(item)
+
+        logger.info(f"Catalogue boutique mis à jour (v{version}): {len(self.items)} objets, "
+                    f"{len(self.changed)} nouveau(x) ou modifié(s)")
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+# Catalogue courant (reconstruit quand les lignes changent)
+_catalog: Optional[ItemCatalog] = None
+
+
+def get_catalog(rows: List[Dict[str, str]]) -> ItemCatalog:
+    """
+    Retourne le catalogue des lignes `rows`, construit au premier appel.
+
+    Le cache des feuilles renvoie la même liste tant que la feuille n'a pas
+    changé : le catalogue n'est reconstruit que pour une nouvelle liste, en
+    reprenant les objets des lignes inchangées.
+    """
+    global _catalog
+    if _catalog is None or _catalog.rows is not rows:
+        version = _catalog.version + 1 if _catalog else 1
+        _catalog = ItemCatalog(rows, version, previous=_catalog)
+    return _catalog
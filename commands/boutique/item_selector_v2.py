@@ -5,8 +5,8 @@ Sélecteur d'objets adapté pour le fichier OM_PRICE.csv
 
 import random
 import logging
-from typing import List, Dict, Optional, Tuple
-from .config_v2 import get_config, normalize_rarity_name, normalize_lien_magique
+from typing import List, Dict
+from .item_catalog import CatalogItem
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +27,10 @@ class ItemSelectorV2:
         self.excluded_rarities_normalized = [
             self._normalize_rarity(rarity) for rarity in self.excluded_rarities
         ]
+        # Clés de comparaison (minuscules), calculées une fois
+        self.excluded_rarity_keys = {
+            rarity.strip().lower() for rarity in self.excluded_rarities
+        }
         
         # Log de debug
         logger.info(f"Raretés à exclure: {self.excluded_rarities}")
@@ -49,203 +53,113 @@ class ItemSelectorV2:
         normalized = rarity.upper().strip()
         return normalized
     
-    def _is_rarity_excluded(self, rarity: str) -> bool:
+    def _is_rarity_excluded(self, item: CatalogItem) -> bool:
         """
-        Vérifie si une rareté doit être exclue.
+        Vérifie si la rareté d'un objet doit être exclue.
         """
-        if not rarity:
-            return False
-        
-        cleaned_rarity = rarity.strip()
-        
-        for excluded in self.excluded_rarities:
-            if cleaned_rarity.lower() == excluded.strip().lower():
-                logger.debug(f"Rareté '{rarity}' EXCLUE")
-                return True
-        
-        logger.debug(f"Rareté '{rarity}' AUTORISÉE")
-        return False
+        return bool(item.rarity_key) and item.rarity_key in self.excluded_rarity_keys
     
-    def filter_items_by_rarity(self, items: List[Dict[str, str]], rarity_column: str) -> Tuple[List[Dict[str, str]], List[int]]:
+    def filter_items_by_rarity(self, items: List[CatalogItem]) -> List[CatalogItem]:
         """
         Filtre les objets en excluant les raretés configurées dans self.excluded_rarities.
 
         Args:
-            items: Liste des objets à filtrer
-            rarity_column: Nom de la colonne contenant la rareté
+            items: Objets du catalogue à filtrer
 
         Returns:
-            Tuple[List[Dict[str, str]], List[int]]: (Liste des objets filtrés, Liste des indices originaux)
+            List[CatalogItem]: Objets retenus (chacun garde son index de ligne)
         """
-        filtered_items = []
-        original_indices = []
-
-        for i, item in enumerate(items):
-            rarity = item.get(rarity_column, "").strip()
-            if not self._is_rarity_excluded(rarity):
-                filtered_items.append(item)
-                original_indices.append(i)
+        filtered_items = [item for item in items if not self._is_rarity_excluded(item)]
 
         logger.info(f"Filtrage par raretés exclues terminé: {len(filtered_items)}/{len(items)} objets retenus")
-        return filtered_items, original_indices
+        return filtered_items
 
-    def filter_items_by_specific_rarity(self, items: List[Dict[str, str]], rarity_column: str, target_rarity: str) -> Tuple[List[Dict[str, str]], List[int]]:
+    def filter_items_by_specific_rarity(self, items: List[CatalogItem], target_rarity: str) -> List[CatalogItem]:
         """
         Filtre les objets pour ne garder que ceux d'une rareté spécifique.
         
         Args:
-            items: Liste des objets à filtrer
-            rarity_column: Nom de la colonne contenant la rareté
+            items: Objets du catalogue à filtrer
             target_rarity: Rareté cible à conserver
             
         Returns:
-            Tuple[List[Dict[str, str]], List[int]]: (Liste des objets filtrés, Liste des indices originaux)
+            List[CatalogItem]: Objets retenus
         """
-        filtered_items = []
-        original_indices = []
-        
         target_rarity_lower = target_rarity.lower().strip()
+        target_rarity_compact = target_rarity_lower.replace(' ', '')
         
-        for i, item in enumerate(items):
-            rarity = item.get(rarity_column, "").lower().strip()
-            
-            # Comparaison exacte pour éviter que "rare" matche "très rare"
-            if (rarity == target_rarity_lower or
-                rarity.replace(' ', '') == target_rarity_lower.replace(' ', '')):
-                
-                filtered_items.append(item)
-                original_indices.append(i)
-                
-                item_name = item.get("Nom de l'objet") or item.get("Nom en VO", "Inconnu")
-                logger.debug(f"Objet inclus: {item_name} (Rareté: {rarity})")
+        # Comparaison exacte pour éviter que "rare" matche "très rare"
+        filtered_items = [
+            item for item in items
+            if item.rarity_key == target_rarity_lower or item.rarity_compact == target_rarity_compact
+        ]
         
         logger.info(f"Filtrage par rareté '{target_rarity}' terminé: {len(filtered_items)}/{len(items)} objets retenus")
-        return filtered_items, original_indices
+        return filtered_items
 
-    def filter_items_by_price(self, items_with_indices: Tuple[List[Dict[str, str]], List[int]], price_column: str = "OM_PRICE") -> Tuple[List[Dict[str, str]], List[int]]:
+    def filter_items_by_price(self, items: List[CatalogItem]) -> List[CatalogItem]:
         """
         Filtre les objets qui ont un prix valide et non nul.
-        PRÉSERVE les indices originaux de la base de données complète.
+        Le prix est analysé une fois à la construction du catalogue.
         
         Args:
-            items_with_indices: Tuple (liste des objets filtrés, liste des indices originaux)
-            price_column: Nom de la colonne contenant le prix
+            items: Objets du catalogue à filtrer
             
         Returns:
-            Tuple: (Liste des objets avec prix valide, Liste des indices originaux PRÉSERVÉS)
+            List[CatalogItem]: Objets avec prix valide
         """
-        items, original_indices = items_with_indices
-        
-        filtered_items = []
-        preserved_original_indices = []
-        
-        config = get_config()
-        na_values = config['filtering']['na_values'] + ['0', '0.0', '-', 'null', 'None']
-        
-        logger.info(f"Filtrage par prix sur la colonne '{price_column}' avec préservation des indices")
-        excluded_count = 0
-        
-        for i, item in enumerate(items):
-            price_raw = item.get(price_column, "").strip()
-            nom_objet = item.get('Nom de l\'objet', 'inconnu')
-            original_index = original_indices[i]  # Récupérer l'index original correspondant
-            
-            # Vérifier si le prix est vide ou NA
-            if not price_raw or price_raw in na_values:
-                logger.debug(f"Objet exclu (pas de prix): {nom_objet} - prix: '{price_raw}' (ligne {original_index + 2})")
-                excluded_count += 1
-                continue
-            
-            # Essayer de convertir en nombre pour vérifier que c'est > 0
-            try:
-                # Nettoyer le prix (enlever 'po', espaces, etc.)
-                clean_price = price_raw.replace(' po', '').replace('po', '').replace(',', '').strip()
-                price_num = float(clean_price)
-                
-                if price_num > 0:
-                    filtered_items.append(item)
-                    preserved_original_indices.append(original_index)  # PRÉSERVER l'index original
-                    logger.debug(f"Objet inclus: {nom_objet} - prix: {price_num} (ligne {original_index + 2})")
-                else:
-                    logger.debug(f"Objet exclu (prix = 0): {nom_objet} - prix: {price_num} (ligne {original_index + 2})")
-                    excluded_count += 1
-            except (ValueError, TypeError):
-                # Si on ne peut pas convertir en nombre, on considère que c'est invalide
-                logger.debug(f"Objet exclu (prix invalide): {nom_objet} - prix: '{price_raw}' (ligne {original_index + 2})")
-                excluded_count += 1
-                continue
+        filtered_items = [item for item in items if item.price is not None]
+        excluded_count = len(items) - len(filtered_items)
         
         logger.info(f"Filtrage prix terminé: {len(filtered_items)} objets gardés, {excluded_count} objets exclus")
-        logger.info(f"Indices originaux préservés: {preserved_original_indices[:5]}..." if len(preserved_original_indices) > 5 else f"Indices originaux préservés: {preserved_original_indices}")
-        
-        return filtered_items, preserved_original_indices
+        return filtered_items
     
     def filter_items_by_validate(
         self,
-        items_with_indices: Tuple[List[Dict[str, str]], List[int]],
-        rarity_column: str,
-        validate_column: str = "VALIDATE",
+        items: List[CatalogItem],
         rarities_requiring_validation: List[str] = None
-    ) -> Tuple[List[Dict[str, str]], List[int]]:
+    ) -> List[CatalogItem]:
         """
         Pour les raretés Rare et Très rare, exclut les objets dont la colonne VALIDATE vaut 'NOK'.
         Les objets d'autres raretés ne sont pas affectés par ce filtre.
 
         Args:
-            items_with_indices: Tuple (liste des objets, liste des indices originaux)
-            rarity_column: Nom de la colonne de rareté
-            validate_column: Nom de la colonne VALIDATE
+            items: Objets du catalogue à filtrer
             rarities_requiring_validation: Raretés concernées par le filtre (défaut: Rare, Très rare)
 
         Returns:
-            Tuple: (Liste des objets filtrés, Liste des indices originaux préservés)
+            List[CatalogItem]: Objets retenus
         """
         if rarities_requiring_validation is None:
             rarities_requiring_validation = ['Rare', 'Très rare']
 
-        rarities_lower = [r.lower().strip() for r in rarities_requiring_validation]
+        rarities_lower = {r.lower().strip() for r in rarities_requiring_validation}
 
-        items, original_indices = items_with_indices
-        filtered_items = []
-        preserved_indices = []
-        excluded_count = 0
-
-        for i, item in enumerate(items):
-            rarity = item.get(rarity_column, "").strip()
-            original_index = original_indices[i]
-
-            # Appliquer le filtre VALIDATE seulement pour les raretés concernées
-            if rarity.lower().strip() in rarities_lower:
-                validate_value = item.get(validate_column, "").strip().upper()
-                if validate_value == "NOK":
-                    nom = item.get("Nom de l'objet") or item.get("Nom en VO", "inconnu")
-                    logger.debug(f"Objet exclu (VALIDATE=NOK): {nom} [rareté: {rarity}] (ligne {original_index + 2})")
-                    excluded_count += 1
-                    continue
-
-            filtered_items.append(item)
-            preserved_indices.append(original_index)
+        # Appliquer le filtre VALIDATE seulement pour les raretés concernées
+        filtered_items = [
+            item for item in items
+            if not (item.validate_nok and item.rarity_key in rarities_lower)
+        ]
+        excluded_count = len(items) - len(filtered_items)
 
         logger.info(
             f"Filtrage VALIDATE terminé: {len(filtered_items)} objets gardés, "
             f"{excluded_count} objets NOK exclus (raretés: {', '.join(rarities_requiring_validation)})"
         )
-        return filtered_items, preserved_indices
+        return filtered_items
 
-    def select_random_items(self, items_with_indices: Tuple[List[Dict[str, str]], List[int]], min_count: int = 3, max_count: int = 8) -> Tuple[List[Dict[str, str]], List[int]]:
+    def select_random_items(self, items: List[CatalogItem], min_count: int = 3, max_count: int = 8) -> List[CatalogItem]:
         """
-        Sélectionne un nombre aléatoire d'objets avec leurs indices originaux.
+        Sélectionne un nombre aléatoire d'objets.
         
         Args:
-            items_with_indices: Tuple (liste des objets, liste des indices originaux)
+            items: Objets du catalogue disponibles
             min_count: Nombre minimum d'objets à sélectionner
             max_count: Nombre maximum d'objets à sélectionner
             
         Returns:
-            Tuple: (Liste des objets sélectionnés, Liste des indices originaux correspondants)
+            List[CatalogItem]: Objets sélectionnés (chacun garde son index de ligne)
         """
-        items, original_indices = items_with_indices
-        
         if not items:
             raise ValueError("Aucun objet disponible pour la sélection")
         
@@ -257,27 +171,19 @@ class ItemSelectorV2:
             logger.warning(f"Pas assez d'objets disponibles: {available_count} < {target_count}")
             target_count = available_count
         
-        # Créer une liste de tuples (objet, index_original)
-        items_with_original_indices = list(zip(items, original_indices))
-        
         # Sélection aléatoire sans remise
-        selected_items_with_indices = random.sample(items_with_original_indices, target_count)
-        
-        # Séparer les objets et les indices
-        selected_items = [item for item, _ in selected_items_with_indices]
-        selected_indices = [index for _, index in selected_items_with_indices]
+        selected_items = random.sample(items, target_count)
         
         logger.info(f"Sélection aléatoire: {len(selected_items)} objets choisis")
-        logger.info(f"Indices sélectionnés: {selected_indices}")
-        return selected_items, selected_indices
+        logger.info(f"Indices sélectionnés: {[item.index for item in selected_items]}")
+        return selected_items
     
-    def get_item_stats(self, items: List[Dict[str, str]], rarity_column: str = "RARETER") -> Dict[str, int]:
+    def get_item_stats(self, items: List[CatalogItem]) -> Dict[str, int]:
         """
         Retourne les statistiques sur les raretés des objets.
         
         Args:
-            items: Liste des objets
-            rarity_column: Nom de la colonne de rareté
+            items: Objets du catalogue
             
         Returns:
             Dict[str, int]: Statistiques par rareté
@@ -285,70 +191,7 @@ class ItemSelectorV2:
         stats = {}
         
         for item in items:
-            rarity = item.get(rarity_column, "0-COMMUN").strip()
-            if not rarity:
-                rarity = "0-COMMUN"
-            
-            # Convertir en format lisible
-            readable_rarity = normalize_rarity_name(rarity)
+            readable_rarity = item.rarity_display or "0-COMMUN"
             stats[readable_rarity] = stats.get(readable_rarity, 0) + 1
         
         return stats
-    
-    def validate_item_data(self, item: Dict[str, str]) -> Dict[str, str]:
-        """
-        Valide et nettoie les données d'un objet selon tes colonnes.
-        
-        Args:
-            item: Données brutes de l'objet
-            
-        Returns:
-            Dict[str, str]: Données nettoyées et validées
-        """
-        validated_item = {}
-        
-        # Copier toutes les données existantes
-        for key, value in item.items():
-            validated_item[key] = str(value).strip() if value else ""
-        
-        # Noms d'objets
-        nom_francais = validated_item.get("Nom de l'objet", "")
-        nom_anglais = validated_item.get("Nom en VO", "")
-        
-        if nom_francais:
-            validated_item["nom_display"] = nom_francais
-        elif nom_anglais:
-            validated_item["nom_display"] = nom_anglais
-        else:
-            validated_item["nom_display"] = "Objet mystérieux"
-        
-        # Rareté
-        rarity_raw = validated_item.get("Rareté", "Commun")
-        validated_item["rarity_display"] = normalize_rarity_name(rarity_raw)
-        
-        # Lien magique
-        lien_raw = validated_item.get("Lien", "Non")
-        if lien_raw.lower() in ['oui', 'yes', 'y']:
-            validated_item["lien_display"] = "Oui"
-        elif lien_raw.lower() in ['non', 'no', 'n']:
-            validated_item["lien_display"] = "Non"
-        else:
-            validated_item["lien_display"] = lien_raw
-        
-        # PRIX - Utiliser la bonne colonne OM_PRICE
-        price_om = validated_item.get("OM_PRICE", "").strip()
-        
-        if price_om and price_om not in ['0', '0.0', '', 'NA', 'N/A', 'null', '-']:
-            try:
-                price_num = float(price_om.replace(' po', '').replace('po', '').replace(',', '').strip())
-                if price_num > 0:
-                    validated_item["price_display"] = f"{price_num:.0f} po"
-                else:
-                    validated_item["price_display"] = "Prix non spécifié"
-            except ValueError:
-                # Si ce n'est pas un nombre, on garde tel quel
-                validated_item["price_display"] = f"{price_om}"
-        else:
-            validated_item["price_display"] = "Prix non spécifié"
-                
-        return validated_item
\ No newline at end of file
@@ -12,6 +12,7 @@ from typing import Optional, List
 from ..base import BaseCommand
 from .google_sheets_client import GoogleSheetsClient
 from .item_selector_v2 import ItemSelectorV2
+from .item_catalog import get_catalog
 from .response_builder_v2 import BoutiqueResponseBuilderV2
 from .config_v2 import get_config
 
@@ -51,6 +52,9 @@ class BoutiqueCommandV2(BaseCommand):
         self.sheets_client = GoogleSheetsClient(self.sheet_id)
         self.item_selector = ItemSelectorV2(self.excluded_rarities)
         self.response_builder = BoutiqueResponseBuilderV2()
+        
+        # Feuille rechargée en tâche de fond, catalogue reconstruit hors commande
+        self.sheets_client.register_prefetch(self.sheet_name, on_update=get_catalog)
     
     @property
     def name(self) -> str:
@@ -135,26 +139,20 @@ class BoutiqueCommandV2(BaseCommand):
                 await interaction.edit_original_response(embed=error_embed)
                 return
             
-            # Filtrage par rareté avec préservation des indices originaux
-            rarity_column = get_config()['item_selection']['rarity_column']
-            
+            # Catalogue typé (reconstruit seulement si la feuille a changé)
+            catalog = get_catalog(raw_items)
+
             if rarete:
                 # Filtrage pour une rareté spécifique
-                filtered_items, filtered_indices = self.item_selector.filter_items_by_specific_rarity(raw_items, rarity_column, rarete)
+                filtered_items = self.item_selector.filter_items_by_specific_rarity(catalog.items, rarete)
             else:
                 # Filtrage normal (exclut les raretés configurées)
-                filtered_items, filtered_indices = self.item_selector.filter_items_by_rarity(raw_items, rarity_column)
+                filtered_items = self.item_selector.filter_items_by_rarity(catalog.items)
             
             # Filtrage par prix pour ignorer les objets sans prix valide
             config = get_config()
             if config['filtering'].get('require_valid_price', False):
-                price_column = config['filtering'].get('price_column', 'Prix Achat')
-                
-                # Filtrage par prix en préservant les indices originaux
-                filtered_items, filtered_indices = self.item_selector.filter_items_by_price(
-                    (filtered_items, filtered_indices),
-                    price_column
-                )
+                filtered_items = self.item_selector.filter_items_by_price(filtered_items)
                 
                 if not filtered_items:
                     error_embed = self.response_builder.create_error_embed(
@@ -169,12 +167,9 @@ class BoutiqueCommandV2(BaseCommand):
             # Filtrage VALIDATE : exclut les objets NOK pour les raretés Rare et Très rare
             # Le flag luskan=True désactive ce filtre (affiche aussi les objets non validés)
             if luskan:
-                validate_column = config['filtering'].get('validate_column', 'VALIDATE')
                 rarities_requiring_validation = config['filtering'].get('rarities_requiring_validation', ['Rare', 'Très rare'])
-                filtered_items, filtered_indices = self.item_selector.filter_items_by_validate(
-                    (filtered_items, filtered_indices),
-                    rarity_column,
-                    validate_column,
+                filtered_items = self.item_selector.filter_items_by_validate(
+                    filtered_items,
                     rarities_requiring_validation
                 )
                 logger.info(f"Filtrage VALIDATE terminé: {len(filtered_items)} objets disponibles")
@@ -195,10 +190,10 @@ class BoutiqueCommandV2(BaseCommand):
                 await interaction.edit_original_response(embed=error_embed)
                 return
 
-            # Sélection aléatoire d'objets avec leurs indices
+            # Sélection aléatoire d'objets (chacun garde son index de ligne)
             try:
-                selected_items, selected_indices = self.item_selector.select_random_items(
-                    (filtered_items, filtered_indices), 
+                selected_items = self.item_selector.select_random_items(
+                    filtered_items, 
                     min_count=target_count, 
                     max_count=target_count
                 )
@@ -215,25 +210,18 @@ class BoutiqueCommandV2(BaseCommand):
                 await interaction.edit_original_response(embed=error_embed)
                 return
             
-            # Validation des objets sélectionnés
-            validated_items = [
-                self.item_selector.validate_item_data(item) 
-                for item in selected_items
-            ]
-            
             # Statistiques
             stats = {
                 'total_items': len(raw_items),
                 'filtered_items': len(filtered_items),
-                'selected_items': len(validated_items),
+                'selected_items': len(selected_items),
                 'target_count': target_count
             }
             
-            # Création de la réponse finale avec les indices pour les liens Google Sheets
+            # Création de la réponse finale (liens Google Sheets via l'index de ligne)
             boutique_embed = self.response_builder.create_boutique_embed(
-                validated_items, 
-                stats,
-                selected_indices
+                selected_items, 
+                stats
             )
             
             # Ajouter une indication du mode d'affichage dans le footer si c'est public
@@ -248,7 +236,7 @@ class BoutiqueCommandV2(BaseCommand):
             
             if format_copiable:
                 # Création du contenu markdown copiable
-                markdown_content = self.response_builder.create_markdown_output(validated_items, stats)
+                markdown_content = self.response_builder.create_markdown_output(selected_items, stats)
                 
                 # Vérifier si le contenu markdown est trop long pour Discord
                 if len(markdown_content) > 1900:  # Limite Discord avec marge de sécurité
@@ -272,7 +260,7 @@ class BoutiqueCommandV2(BaseCommand):
                     )
                     await interaction.followup.send(embed=markdown_embed, ephemeral=is_ephemeral)
             
-            logger.info(f"Boutique OM_PRICE générée avec succès: {len(validated_items)} objets affichés (public: {public}, copiable: {format_copiable}, rareté: {rarete or 'toutes'})")
+            logger.info(f"Boutique OM_PRICE générée avec succès: {len(selected_items)} objets affichés (public: {public}, copiable: {format_copiable}, rareté: {rarete or 'toutes'})")
             
         except Exception as e:
             logger.error(f"Erreur dans la commande boutique OM_PRICE: {e}", exc_info=True)
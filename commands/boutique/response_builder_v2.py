@@ -7,6 +7,7 @@ import discord
 import logging
 from typing import List, Dict, Optional
 from .config_v2 import get_config
+from .item_catalog import CatalogItem
 
 logger = logging.getLogger(__name__)
 
@@ -29,11 +30,11 @@ class BoutiqueResponseBuilderV2:
         })
         self.rarity_emojis = config.get('rarity_emojis', {})
     
-    def create_boutique_embed(self, items: List[Dict[str, str]], stats: Dict[str, any] = None, item_indices: List[int] = None) -> discord.Embed:
+    def create_boutique_embed(self, items: List[CatalogItem], stats: Dict[str, any] = None) -> discord.Embed:
         """
         Crée l'embed principal de la boutique pour OM_PRICE.
         """
-        logger.info(f"Création embed boutique - {len(items)} objets, indices: {item_indices}")
+        logger.info(f"Création embed boutique - {len(items)} objets, indices: {[item.index for item in items]}")
         
         colors = [0x3498db, 0xe74c3c, 0x2ecc71, 0xf39c12, 0x9b59b6, 0x1abc9c]
         embed_color = colors[hash(str(len(items))) % len(colors)]
@@ -48,14 +49,10 @@ class BoutiqueResponseBuilderV2:
         for i, item in enumerate(items, 1):
             name = self._get_item_name(item, i)
             
-            # Passer l'index de ligne si disponible
-            original_index = item_indices[i-1] if item_indices and len(item_indices) >= i else None
-            
             # Log pour debug
-            nom_objet = item.get("nom_display", "Inconnu")
-            logger.debug(f"Objet {i}: {nom_objet} - Index original: {original_index}")
+            logger.debug(f"Objet {i}: {item.nom_display} - Index original: {item.index}")
             
-            value = self._format_item_details(item, original_index)
+            value = self._format_item_details(item, item.index)
             
             # Vérifier la longueur du champ
             if len(value) > self.max_field_length:
@@ -73,12 +70,12 @@ class BoutiqueResponseBuilderV2:
         
         return embed
     
-    def _get_item_name(self, item: Dict[str, str], index: int) -> str:
+    def _get_item_name(self, item: CatalogItem, index: int) -> str:
         """
         Formate le nom d'un objet OM_PRICE.
         """
-        name = item.get("nom_display", f"Objet #{index}")
-        rarity = item.get("rarity_display", "")
+        name = item.nom_display or f"Objet #{index}"
+        rarity = item.rarity_display
         
         # Mapping direct des emojis par rareté
         emoji_map = {
@@ -94,38 +91,38 @@ class BoutiqueResponseBuilderV2:
         
         return f"{emoji} {name}"
     
-    def _format_item_details(self, item: Dict[str, str], original_index: int = None) -> str:
+    def _format_item_details(self, item: CatalogItem, original_index: int = None) -> str:
         """
         Formate les détails d'un objet OM_PRICE.
         """
         details = []
         
         # Rareté
-        rarity = item.get("rarity_display", "Inconnue")
+        rarity = item.rarity_display
         if rarity:
             details.append(f"**Rareté:** {rarity}")
         
         # Type
-        item_type = item.get("Type", "")
+        item_type = item.type
         if item_type:
             # Formatter le type (première lettre en majuscule, remplacer _ par espaces)
             formatted_type = item_type.replace("_", " ").title()
             details.append(f"**Type:** {formatted_type}")
         
         # Lien magique
-        lien_display = item.get("lien_display", "")
+        lien_display = item.lien_display
         if lien_display:
             lien_formatted = self._format_lien_magique(lien_display)
             if lien_formatted:
                 details.append(f"**Lien magique:** {lien_formatted}")
         
         # Prix
-        price = item.get("price_display", "")
+        price = item.price_display
         if price and price != "Prix non spécifié":
             details.append(f"**Prix:** {price}")
         
         # Source
-        source = item.get("Source", "")
+        source = item.source
         if source:
             details.append(f"**Source:** {source}")
         
@@ -152,7 +149,7 @@ class BoutiqueResponseBuilderV2:
         else:
             return f"{self.lien_emojis['default']} {lien_value}"
     
-    def _generate_sheets_link(self, item: Dict[str, str], original_index: int = None) -> str:
+    def _generate_sheets_link(self, item: CatalogItem, original_index: int = None) -> str:
         """
         Génère un lien direct vers Google Sheets pour OM_PRICE.
         """
@@ -162,7 +159,7 @@ class BoutiqueResponseBuilderV2:
             sheet_id = config['google_sheets']['sheet_id']
             sheet_gid = config['google_sheets'].get('sheet_gid', '0')
             
-            nom_objet = item.get("nom_display", "Objet inconnu")
+            nom_objet = item.nom_display if item else "Objet inconnu"
             
             if not sheet_id or not item:
                 logger.debug(f"Pas de lien généré pour {nom_objet}: sheet_id ou item manquant")
@@ -177,7 +174,7 @@ class BoutiqueResponseBuilderV2:
                 return url
             
             # Méthode 2: Utiliser le nom de l'objet pour la recherche
-            nom_objet_raw = item.get("nom_display", "")
+            nom_objet_raw = item.nom_display
             if nom_objet_raw:
                 from urllib.parse import quote
                 nom_encoded = quote(nom_objet_raw)
@@ -268,7 +265,7 @@ class BoutiqueResponseBuilderV2:
         
         return embed
 
-    def create_markdown_output(self, items: List[Dict[str, str]], stats: Dict[str, any] = None) -> str:
+    def create_markdown_output(self, items: List[CatalogItem], stats: Dict[str, any] = None) -> str:
         """
         Crée une version markdown copiable des objets de la boutique.
         
@@ -290,8 +287,8 @@ class BoutiqueResponseBuilderV2:
         # Liste des objets
         for i, item in enumerate(items, 1):
             # Nom avec emoji de rareté
-            nom = item.get("nom_display", f"Objet #{i}")
-            rarity = item.get("rarity_display", "")
+            nom = item.nom_display or f"Objet #{i}"
+            rarity = item.rarity_display
             
             # Emoji selon la rareté
             emoji_map = {
@@ -311,13 +308,13 @@ class BoutiqueResponseBuilderV2:
             if rarity:
                 markdown_lines.append(f"**Rareté :** {rarity}")
             
-            item_type = item.get("Type", "")
+            item_type = item.type
             if item_type:
                 formatted_type = item_type.replace("_", " ").title()
                 markdown_lines.append(f"**Type :** {formatted_type}")
             
             # Lien magique avec emojis
-            lien_display = item.get("lien_display", "")
+            lien_display = item.lien_display
             if lien_display:
                 lien_lower = lien_display.lower().strip()
                 if lien_lower == 'oui':
@@ -328,12 +325,12 @@ class BoutiqueResponseBuilderV2:
                     markdown_lines.append(f"**Lien magique :** 🔮 {lien_display}")
             
             # Prix
-            price = item.get("price_display", "")
+            price = item.price_display
             if price and price != "Prix non spécifié":
                 markdown_lines.append(f"**Prix :** {price}")
             
             # Source
-            source = item.get("Source", "")
+            source = item.source
             if source:
                 markdown_lines.append(f"**Source :** {source}")
             
@@ -6,14 +6,14 @@ Commande de recherche d'objets magiques avec recherche floue (fuzzy search).
 import discord
 from discord import app_commands
 import logging
-import re
-from typing import Optional, List, Dict, Tuple
-from difflib import SequenceMatcher
+from typing import Optional, List, Tuple
 
+from utils.prefix_index import MAX_CHOICES
 from ..base import BaseCommand
 from .google_sheets_client import GoogleSheetsClient
 from .config_v2 import get_config
-from .item_selector_v2 import ItemSelectorV2
+from .item_catalog import CatalogItem, ItemCatalog, get_catalog
+from .search_index import get_search_index, prepare_search_index
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +40,9 @@ class SearchCommand(BaseCommand):
 
         # Composants
         self.sheets_client = GoogleSheetsClient(self.sheet_id)
-        self.item_selector = ItemSelectorV2()
+        
+        # Feuille rechargée en tâche de fond, index de recherche mis à jour hors commande
+        self.sheets_client.register_prefetch(self.sheet_name, on_update=prepare_search_index)
 
         # Configuration de recherche
         self.min_similarity = 0.4  # Seuil de similarité minimum (40%)
@@ -73,6 +75,38 @@ class SearchCommand(BaseCommand):
         ):
             await self.callback(interaction, recherche, limite)
 
+        @search_command.autocomplete('recherche')
+        async def recherche_autocomplete(
+            interaction: discord.Interaction,
+            current: str
+        ) -> List[app_commands.Choice[str]]:
+            return self.autocomplete_item_names(current)
+
+    def autocomplete_item_names(self, current: str) -> List[app_commands.Choice[str]]:
+        """
+        Propose des noms d'objets pour la saisie en cours.
+        Répond depuis l'index en mémoire, sans appel réseau : tant que la
+        feuille n'a jamais été chargée, aucune suggestion n'est proposée.
+        
+        Args:
+            current: Saisie en cours dans le paramètre recherche
+            
+        Returns:
+            List[app_commands.Choice[str]]: Suggestions (25 au maximum)
+        """
+        try:
+            raw_items = self.sheets_client.peek_sheet_data(self.sheet_name)
+            if not raw_items:
+                return []
+
+            names = get_search_index(get_catalog(raw_items)).complete(current, MAX_CHOICES)
+            # Discord limite nom et valeur d'un choix à 100 caractères
+            return [app_commands.Choice(name=name[:100], value=name[:100]) for name in names]
+
+        except Exception as e:
+            logger.warning(f"Erreur autocomplétion recherche-objet: {e}")
+            return []
+
     async def callback(self, interaction: discord.Interaction, recherche: str, limite: Optional[int] = 5):
         """
         Traite la commande de recherche.
@@ -119,7 +153,7 @@ class SearchCommand(BaseCommand):
                 return
 
             # Recherche avec scoring
-            results = self._search_items(raw_items, search_term, limite)
+            results = await self._search_items(get_catalog(raw_items), search_term, limite)
 
             if not results:
                 no_result_embed = self._create_no_results_embed(search_term)
@@ -151,118 +185,20 @@ class SearchCommand(BaseCommand):
             except Exception as followup_error:
                 logger.error(f"Erreur lors de l'envoi du message d'erreur: {followup_error}")
 
-    def _search_items(self, items: List[Dict[str, str]], search_term: str, limit: int) -> List[Tuple[Dict[str, str], float, int]]:
+    async def _search_items(self, catalog: ItemCatalog, search_term: str, limit: int) -> List[Tuple[CatalogItem, float]]:
         """
-        Recherche des objets avec scoring de similarité.
+        Recherche des objets avec scoring de similarité, via l'index du catalogue.
+        Le score tourne hors de la boucle asyncio (pool de processus).
         
         Args:
-            items: Liste des objets de la base de données
+            catalog: Catalogue des objets
             search_term: Terme de recherche (déjà nettoyé)
             limit: Nombre maximum de résultats
             
         Returns:
-            List[Tuple[Dict, float, int]]: Liste des (objet, score, index_original) triée par score décroissant
+            List[Tuple[CatalogItem, float]]: Liste des (objet, score) triée par score décroissant
         """
-        results = []
-
-        for index, item in enumerate(items):
-            # Récupérer les champs à rechercher
-            nom_fr = item.get("Nom de l'objet", "").lower()
-            nom_en = item.get("Nom en VO", "").lower()
-            type_obj = item.get("Type", "").lower()
-            source = item.get("Source", "").lower()
-
-            # Calculer les scores de similarité pour chaque champ
-            scores = []
-
-            # Nom français (priorité haute)
-            if nom_fr:
-                score_nom_fr = self._calculate_similarity(search_term, nom_fr)
-                if score_nom_fr > 0:
-                    scores.append(score_nom_fr * 2.0)  # Poids double pour le nom français
-
-            # Nom anglais (priorité haute)
-            if nom_en:
-                score_nom_en = self._calculate_similarity(search_term, nom_en)
-                if score_nom_en > 0:
-                    scores.append(score_nom_en * 1.8)  # Poids élevé pour le nom anglais
-
-            # Type d'objet (priorité moyenne)
-            if type_obj:
-                score_type = self._calculate_similarity(search_term, type_obj)
-                if score_type > 0:
-                    scores.append(score_type * 1.2)
-
-            # Source (priorité faible)
-            if source:
-                score_source = self._calculate_similarity(search_term, source)
-                if score_source > 0:
-                    scores.append(score_source * 0.8)
-
-            # Prendre le meilleur score
-            if scores:
-                best_score = max(scores)
-
-                # Ne garder que les résultats au-dessus du seuil
-                if best_score >= self.min_similarity:
-                    results.append((item, best_score, index))
-
-        # Trier par score décroissant et limiter les résultats
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:limit]
-
-    def _calculate_similarity(self, search_term: str, text: str) -> float:
-        """
-        Calcule la similarité entre le terme de recherche et un texte.
-        
-        Args:
-            search_term: Terme de recherche
-            text: Texte à comparer
-            
-        Returns:
-            float: Score de similarité (0.0 à 1.0)
-        """
-        if not search_term or not text:
-            return 0.0
-
-        # Nettoyage des textes
-        search_clean = re.sub(r'[^\w\s]', '', search_term.lower()).strip()
-        text_clean = re.sub(r'[^\w\s]', '', text.lower()).strip()
-
-        if not search_clean or not text_clean:
-            return 0.0
-
-        # Correspondance exacte (score maximum)
-        if search_clean == text_clean:
-            return 1.0
-
-        # Correspondance de début de mot
-        if text_clean.startswith(search_clean):
-            return 0.9
-
-        # Correspondance contenue
-        if search_clean in text_clean:
-            return 0.8
-
-        # Similarité de séquence (fuzzy matching)
-        seq_similarity = SequenceMatcher(None, search_clean, text_clean).ratio()
-
-        # Bonus si les mots correspondent partiellement
-        search_words = search_clean.split()
-        text_words = text_clean.split()
-
-        word_matches = 0
-        for search_word in search_words:
-            for text_word in text_words:
-                if search_word in text_word or text_word in search_word:
-                    word_matches += 1
-                    break
-
-        if search_words:
-            word_score = word_matches / len(search_words) * 0.3
-            seq_similarity += word_score
-
-        return min(seq_similarity, 1.0)
+        return await get_search_index(catalog).search_async(search_term, limit, self.min_similarity)
 
     def _create_loading_embed(self, search_term: str) -> discord.Embed:
         """Crée un embed de chargement."""
@@ -288,13 +224,13 @@ class SearchCommand(BaseCommand):
         embed.set_footer(text="Les objets légendaires sont parfois difficiles à trouver...")
         return embed
 
-    def _create_results_embed(self, search_term: str, results: List[Tuple[Dict[str, str], float, int]]) -> discord.Embed:
+    def _create_results_embed(self, search_term: str, results: List[Tuple[CatalogItem, float]]) -> discord.Embed:
         """
         Crée l'embed avec les résultats de recherche.
         
         Args:
             search_term: Terme de recherche
-            results: Liste des (objet, score, index_original)
+            results: Liste des (objet, score)
         """
         embed = discord.Embed(
             title=f"🔍 Résultats de recherche : {search_term}",
@@ -302,12 +238,9 @@ class SearchCommand(BaseCommand):
             color=0x2ecc71  # Vert
         )
 
-        for i, (item, score, original_index) in enumerate(results, 1):
-            # Validation des données de l'objet
-            validated_item = self.item_selector.validate_item_data(item)
-
-            name = self._format_result_name(validated_item, i, score)
-            details = self._format_result_details(validated_item, original_index)
+        for i, (item, score) in enumerate(results, 1):
+            name = self._format_result_name(item, i, score)
+            details = self._format_result_details(item, item.index)
 
             # Limiter la taille du champ si nécessaire
             if len(details) > 1024:
@@ -322,10 +255,10 @@ class SearchCommand(BaseCommand):
         embed.set_footer(text=f"Recherche effectuée sur {search_term} • Objets triés par pertinence")
         return embed
 
-    def _format_result_name(self, item: Dict[str, str], rank: int, score: float) -> str:
+    def _format_result_name(self, item: CatalogItem, rank: int, score: float) -> str:
         """Formate le nom d'un résultat avec son rang."""
-        name = item.get("nom_display", "Objet mystérieux")
-        rarity = item.get("rarity_display", "")
+        name = item.nom_display
+        rarity = item.rarity_display
 
         # Emoji de rareté
         emoji_map = {
@@ -344,13 +277,13 @@ class SearchCommand(BaseCommand):
 
         return f"{relevance} {emoji} #{rank} • {name}"
 
-    def _format_result_details(self, item: Dict[str, str], original_index: int) -> str:
+    def _format_result_details(self, item: CatalogItem, original_index: int) -> str:
         """Formate les détails d'un résultat de recherche."""
         details = []
 
         # Noms (français et anglais si différents)
-        nom_fr = item.get("Nom de l'objet", "")
-        nom_en = item.get("Nom en VO", "")
+        nom_fr = item.nom_fr
+        nom_en = item.nom_en
 
         if nom_fr and nom_en and nom_fr.lower() != nom_en.lower():
             details.append(f"**Nom FR:** {nom_fr}")
@@ -361,28 +294,28 @@ class SearchCommand(BaseCommand):
             details.append(f"**Nom:** {nom_en}")
 
         # Rareté et type
-        rarity = item.get("rarity_display", "")
+        rarity = item.rarity_display
         if rarity:
             details.append(f"**Rareté:** {rarity}")
 
-        type_obj = item.get("Type", "")
+        type_obj = item.type
         if type_obj:
             formatted_type = type_obj.replace("_", " ").title()
             details.append(f"**Type:** {formatted_type}")
 
         # Lien magique
-        lien_display = item.get("lien_display", "")
+        lien_display = item.lien_display
         if lien_display:
             lien_emoji = "🔗" if lien_display.lower() == "oui" else "❌"
             details.append(f"**Lien magique:** {lien_emoji} {lien_display}")
 
         # Prix
-        price = item.get("price_display", "")
+        price = item.price_display
         if price and price != "Prix non spécifié":
             details.append(f"**Prix:** {price}")
 
         # Source
-        source = item.get("Source", "")
+        source = item.source
         if source:
             details.append(f"**Source:** {source}")
 
@@ -393,7 +326,7 @@ class SearchCommand(BaseCommand):
 
         return '\n'.join(details) if details else "Informations non disponibles"
 
-    def _generate_sheets_link(self, item: Dict[str, str], original_index: int = None) -> str:
+    def _generate_sheets_link(self, item: CatalogItem, original_index: int = None) -> str:
         """Génère un lien direct vers Google Sheets."""
         try:
             config = get_config()
@@ -0,0 +1,184 @@
+# commands/boutique/search_index.py
+"""
+Index de recherche des objets pour /recherche-objet.
+
+Construit une fois par version du catalogue : les noms FR/VO, le type et la
+source de chaque objet sont nettoyés une fois, et leurs mots et trigrammes
+(sans accents) pointent vers les objets qui les contiennent
+(utils/fuzzy_search.py).
+
+Une recherche ne parcourt plus toute la feuille : l'index désigne les
+objets qui partagent le plus de trigrammes avec le terme cherché, et seuls
+ces candidats reçoivent le score flou complet (mêmes règles et mêmes poids
+qu'avant : 2.0 nom FR, 1.8 nom VO, 1.2 type, 0.8 source).
+
+Si NumPy est installé, le score est vectorisé sur toutes les lignes
+(utils/batch_scorer.py) : même classement qu'un parcours complet, sans
+présélection par trigrammes.
+
+Le score complet tourne dans le pool de processus (utils/scoring_pool.py) ;
+si le pool ne répond pas à temps, la recherche se rabat sur les noms qui
+commencent par le terme cherché.
+
+L'index porte aussi les noms FR/VO triés pour l'autocomplétion du paramètre
+`recherche` (utils/prefix_index.py).
+
+Quand une nouvelle version du catalogue garde le même nombre d'objets et
+que peu de lignes ont changé, l'index de score précédent est mis à jour
+sur place pour ces seules lignes au lieu d'être reconstruit.
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from utils.batch_scorer import build_scorer
+from utils.fuzzy_search import FuzzyIndex, clean_text
+from utils.prefix_index import PrefixIndex, normalize_key
+from utils.scoring_pool import get_scoring_pool
+from .item_catalog import CatalogItem, ItemCatalog, get_catalog
+
+logger = logging.getLogger(__name__)
+
+# Champs recherchés et leur poids
+SEARCH_FIELDS = (('nom_fr', 2.0), ('nom_en', 1.8), ('type', 1.2), ('source', 0.8))
+SEARCH_WEIGHTS = tuple(weight for _, weight in SEARCH_FIELDS)
+
+# Part maximum de lignes modifiées pour une mise à jour sur place
+MAX_UPDATE_RATIO = 0.25
+
+
+class ItemSearchIndex:
+    """Index de recherche et d'autocomplétion d'une version du catalogue."""
+
+    def __init__(self, catalog: ItemCatalog, previous: Optional['ItemSearchIndex'] = None):
+        """
+        Args:
+            catalog: Catalogue indexé
+            previous: Index de la version précédente, mis à jour si possible
+        """
+        self.catalog = catalog
+        self.items = catalog.items
+
+        # Champs recherchés de chaque objet (copiés dans le pool de processus)
+        self.rows = [tuple(getattr(item, attribute) for attribute, _ in SEARCH_FIELDS)
+                     for item in self.items]
+
+        changes = self._changes(previous)
+        if changes is None:
+            self.scorer = build_scorer(self.rows, SEARCH_WEIGHTS)
+        else:
+            self.scorer = previous.scorer
+            self.scorer.update(changes)
+
+        # Noms FR et VO proposés par l'autocomplétion, et objets par nom
+        self.names = PrefixIndex(
+            name for item in self.items for name in (item.nom_fr, item.nom_en))
+        self._ids_by_name: Dict[str, List[int]] = {}
+        for item_id, item in enumerate(self.items):
+            for key in {normalize_key(item.nom_fr), normalize_key(item.nom_en)}:
+                if key:
+                    self._ids_by_name.setdefault(key, []).append(item_id)
+
+        if isinstance(self.scorer, FuzzyIndex):
+            details = (f"{len(self.scorer.trigram_postings)} trigrammes, "
+                       f"{len(self.scorer.token_postings)} mots")
+        else:
+            details = f"score vectorisé, {len(self.scorer.token_ids)} mots"
+        logger.info(
+            f"Index de recherche construit (catalogue v{catalog.version}): "
+            f"{len(self.items)} objets, {details}"
+        )
+
+    def _changes(self, previous: Optional['ItemSearchIndex']) -> Optional[Dict[int, tuple]]:
+        """Lignes modifiées depuis `previous`, ou None s'il faut tout reconstruire."""
+        if previous is None or len(previous.rows) != len(self.rows) or not self.rows:
+            return None
+        changes = {row_id: row for row_id, (row, old) in enumerate(zip(self.rows, previous.rows))
+                   if row != old}
+        if len(changes) > len(self.rows) * MAX_UPDATE_RATIO:
+            return None
+        return changes
+
+    def complete(self, text: str, limit: int) -> List[str]:
+        """Noms d'objets (FR ou VO) qui complètent la saisie `text`."""
+        return self.names.complete(text, limit)
+
+    def _to_items(self, scored: List[Tuple[int, float]]) -> List[Tuple[CatalogItem, float]]:
+        return [(self.items[item_id], score) for item_id, score in scored]
+
+    def search(self, search_term: str, limit: int,
+               min_similarity: float) -> List[Tuple[CatalogItem, float]]:
+        """
+        Recherche floue exécutée sur place (sans le pool de processus).
+
+        Returns:
+            List[Tuple[CatalogItem, float]]: Liste des (objet, score) triée par score décroissant
+        """
+        return self._to_items(self.scorer.search(search_term, limit, min_similarity))
+
+    def prefix_search(self, search_term: str, limit: int,
+                      min_similarity: float) -> List[Tuple[CatalogItem, float]]:
+        """
+        Recherche de repli : objets dont un nom commence par le terme (ou dont
+        un mot du nom commence par le terme), seuls ceux-là étant scorés.
+
+        Returns:
+            List[Tuple[CatalogItem, float]]: Liste des (objet, score) triée par score décroissant
+        """
+        item_ids = []
+        for name in self.names.complete(search_term, limit):
+            item_ids.extend(self._ids_by_name.get(normalize_key(name), []))
+        return self._to_items(self.scorer.rank(search_term, sorted(set(item_ids)),
+                                              limit, min_similarity))
+
+    async def search_async(self, search_term: str, limit: int,
+                           min_similarity: float) -> List[Tuple[CatalogItem, float]]:
+        """
+        Recherche floue dans le pool de processus, avec repli par préfixe si
+        le pool est indisponible ou hors délai (sur place s'il est désactivé).
+
+        Args:
+            search_term: Terme de recherche
+            limit: Nombre maximum de résultats
+            min_similarity: Score minimum (après pondération) pour garder un objet
+
+        Returns:
+            List[Tuple[CatalogItem, float]]: Liste des (objet, score) triée par score décroissant
+        """
+        if not clean_text(search_term):
+            return []
+
+        pool = get_scoring_pool()
+        if not pool.enabled:
+            return self.search(search_term, limit, min_similarity)
+
+        scored = await pool.search(
+            self.catalog.version, self.rows, SEARCH_WEIGHTS,
+            search_term, limit, min_similarity
+        )
+        if scored is None:
+            logger.info(f"Recherche '{search_term}' : repli sur les préfixes de noms")
+            return self.prefix_search(search_term, limit, min_similarity)
+        return self._to_items(scored)
+
+
+# Index courant (reconstruit avec le catalogue)
+_search_index: Optional[ItemSearchIndex] = None
+
+
+def get_search_index(catalog: ItemCatalog) -> ItemSearchIndex:
+    """Retourne l'index de recherche du catalogue, construit au premier appel."""
+    global _search_index
+    if _search_index is None or _search_index.catalog is not catalog:
+        _search_index = ItemSearchIndex(catalog, previous=_search_index)
+    return _search_index
+
+
+def prepare_search_index(rows: List[Dict[str, str]]) -> ItemSearchIndex:
+    """
+    Met à jour catalogue et index pour de nouvelles lignes, et recharge le
+    pool de processus (appelé par le préchargement des feuilles, hors commande).
+    """
+    index = get_search_index(get_catalog(rows))
+    get_scoring_pool().prepare(index.catalog.version, index.rows, SEARCH_WEIGHTS)
+    return index
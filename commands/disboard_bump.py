@@ -102,10 +102,9 @@ class DisboardBumpCommand(BaseCommand):
     def _register_disboard_listener(self):
         """Enregistre un listener sur les messages de Disboard."""
 
-        bot = self.bot
-
-        @bot.event
-        async def on_message(message: discord.Message):
+        # Ajouté à la liste des écouteurs du bot : un @bot.event remplacerait
+        # FaerunBot.on_message (commandes !sync_bot, indexation, ...)
+        async def on_disboard_message(message: discord.Message):
             # Ignorer les messages qui ne viennent pas de Disboard
             if message.author.id != DISBOARD_BOT_ID:
                 return
@@ -120,6 +119,8 @@ class DisboardBumpCommand(BaseCommand):
                             f"Bump Disboard détecté sur {message.guild.name}, cooldown réinitialisé."
                         )
 
+        self.bot.message_listeners.append(on_disboard_message)
+
     async def callback(self, interaction: discord.Interaction):
         guild_id = interaction.guild_id
         now = datetime.now(timezone.utc)
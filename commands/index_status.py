@@ -0,0 +1,132 @@
+"""
+Commande Discord : /etat-index (ADMIN SEULEMENT)
+
+DESCRIPTION:
+    Affiche l'état de l'index local des messages et la progression du
+    remplissage à rebours de l'historique
+    VISIBLE UNIQUEMENT pour les membres avec le rôle admin configuré
+
+FONCTIONNEMENT:
+    - Nombre total de messages indexés
+    - Pour chaque canal suivi du serveur : messages remplis, date la plus
+      ancienne atteinte, avancement et temps restant estimé
+
+UTILISATION:
+    /etat-index (Façonneurs seulement)
+"""
+
+import discord
+from discord import app_commands
+from .base import BaseCommand
+from utils.permissions import has_admin_role
+from utils.message_index import get_message_index
+from utils.history_backfill import get_history_backfill
+from utils.channels import ChannelHelper
+from config import Config
+
+
+def _format_duration(seconds: float) -> str:
+    """Formate une durée en jours/heures/minutes."""
+    minutes = int(seconds // 60)
+    days, minutes = divmod(minutes, 1440)
+    hours, minutes = divmod(minutes, 60)
+    if days:
+        return f"{days}j {hours}h"
+    if hours:
+        return f"{hours}h {minutes}min"
+    return f"{max(minutes, 1)}min"
+
+
+class IndexStatusCommand(BaseCommand):
+
+    @property
+    def name(self) -> str:
+        return "etat-index"
+
+    @property
+    def description(self) -> str:
+        return "Affiche l'état de l'index des messages (Façonneurs seulement)"
+
+    def register(self, tree: app_commands.CommandTree):
+        """Enregistrement avec restriction de permissions."""
+
+        @tree.command(name=self.name, description=self.description)
+        # RESTRICTION : Commande visible seulement pour les admin
+        @app_commands.check(self._is_admin)
+        async def index_status_command(interaction: discord.Interaction):
+            await self.callback(interaction)
+
+        # Gérer l'erreur de permission
+        @index_status_command.error
+        async def index_status_error(interaction: discord.Interaction,
+                                     error: app_commands.AppCommandError):
+            if isinstance(error, app_commands.CheckFailure):
+                await interaction.response.send_message(
+                    f"❌ Cette commande est réservée aux membres avec le rôle `{Config.ADMIN_ROLE_NAME}`.",
+                    ephemeral=True)
+
+    async def _is_admin(self, interaction: discord.Interaction) -> bool:
+        """Vérifie si l'utilisateur a les permissions admin."""
+        return has_admin_role(interaction.user)
+
+    async def callback(self, interaction: discord.Interaction):
+        # Double vérification des permissions (sécurité)
+        if not has_admin_role(interaction.user):
+            await interaction.response.send_message(
+                f"❌ Accès refusé. Rôle `{Config.ADMIN_ROLE_NAME}` requis.",
+                ephemeral=True)
+            return
+
+        index = get_message_index()
+        if not index:
+            await interaction.response.send_message(
+                "❌ Index des messages non initialisé.",
+                ephemeral=True)
+            return
+
+        backfill = get_history_backfill()
+        status = index.get_status()
+
+        embed = discord.Embed(
+            title="🗂️ État de l'index des messages",
+            description=(
+                f"**Messages indexés :** {status['total_messages']}\n"
+                f"**Canaux à jour :** {status['synced_channels']}\n"
+                f"**Remplissage :** "
+                f"{'🔄 En cours' if backfill and backfill.running else '⏸️ Inactif'}"
+            ),
+            color=0x3498db,
+            timestamp=discord.utils.utcnow()
+        )
+
+        for channel_key in (ChannelHelper.RECOMPENSES, ChannelHelper.QUETES):
+            channel = ChannelHelper.get_channel(interaction.guild, channel_key)
+            if not channel:
+                continue
+
+            progress = backfill.get_progress(channel) if backfill else None
+            if progress is None:
+                if index.is_channel_synced(channel.id):
+                    value = "✅ Historique complet"
+                else:
+                    value = "⏳ Rattrapage initial non effectué"
+            else:
+                oldest = (progress['oldest_date'].strftime('%d/%m/%Y')
+                          if progress['oldest_date'] else "—")
+                value = (
+                    f"**Messages remplis :** {progress['messages_indexed']}\n"
+                    f"**Plus ancien atteint :** {oldest}\n"
+                )
+                if progress['completed']:
+                    value += "✅ Historique complet"
+                else:
+                    eta = (_format_duration(progress['eta_seconds'])
+                           if progress['eta_seconds'] is not None else "inconnue")
+                    value += (f"**Avancement :** {progress['percent']:.1f}%\n"
+                              f"**Fin estimée dans :** {eta}")
+
+            embed.add_field(name=f"#{channel.name}", value=value, inline=False)
+
+        embed.set_footer(text=f"Consulté par {interaction.user.display_name} • {Config.ADMIN_ROLE_NAME}")
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -27,6 +27,8 @@ import logging
 from typing import Optional
 from .base import BaseCommand
 from utils.channels import ChannelHelper
+from utils.history_scan import get_history_scanner
+from utils.message_index import get_message_index
 
 logger = logging.getLogger(__name__)
 
@@ -115,7 +117,8 @@ class MentionListCommand(BaseCommand):
 
             # Récupérer les auteurs du canal actuel
             auteurs = {}
-            async for msg in interaction.channel.history(limit=1000):
+            scanner = get_history_scanner()
+            for msg in await scanner.fetch(interaction.channel, limit=1000):
                 if msg.author.bot:
                     continue
                 auteurs[msg.author.id] = msg.author
@@ -130,20 +133,26 @@ class MentionListCommand(BaseCommand):
                 return
 
             # --- Compter mentions dans #recompenses ---
-            mentions_count = {user_id: 0 for user_id in auteurs.keys()}
-            posts_mj_count = {user_id: 0 for user_id in auteurs.keys()}
-
-            async for msg in recompenses_channel.history(limit=1000, after=start_date):
-                for mentioned in msg.mentions:
-                    if mentioned.id in mentions_count:
-                        mentions_count[mentioned.id] += 1
-
-                if msg.author.id in posts_mj_count:
-                    mentions_uniques = set(
-                        u.id for u in msg.mentions if u.id != msg.author.id
-                    )
-                    if len(mentions_uniques) >= 2:
-                        posts_mj_count[msg.author.id] += 1
+            index = get_message_index()
+            if index and index.is_channel_synced(recompenses_channel.id, since=start_date):
+                # Lecture directe dans l'index local
+                mentions_count, posts_mj_count = index.get_activity_counts(
+                    recompenses_channel.id, list(auteurs.keys()), since=start_date)
+            else:
+                mentions_count = {user_id: 0 for user_id in auteurs.keys()}
+                posts_mj_count = {user_id: 0 for user_id in auteurs.keys()}
+
+                for msg in await scanner.fetch(recompenses_channel, limit=1000, after=start_date):
+                    for mentioned in msg.mentions:
+                        if mentioned.id in mentions_count:
+                            mentions_count[mentioned.id] += 1
+
+                    if msg.author.id in posts_mj_count:
+                        mentions_uniques = set(
+                            u.id for u in msg.mentions if u.id != msg.author.id
+                        )
+                        if len(mentions_uniques) >= 2:
+                            posts_mj_count[msg.author.id] += 1
 
             # --- Tri : joueurs oubliés d'abord, puis par mentions croissantes ---
             def sort_key(item):
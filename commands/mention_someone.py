@@ -22,6 +22,8 @@ from datetime import datetime, timezone, timedelta
 import logging
 from .base import BaseCommand
 from utils.channels import ChannelHelper
+from utils.history_scan import get_history_scanner
+from utils.message_index import get_message_index
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +47,34 @@ class MentionSomeoneCommand(BaseCommand):
                                    membre: discord.Member = None):
             await self.callback(interaction, membre)
 
+    def _build_mention(self, now: datetime, premiere_ligne: str,
+                       message_url: str, author_name: str,
+                       created_at: datetime) -> dict:
+        """Prépare l'entrée d'affichage d'une mention."""
+        # Prendre la première ligne du message pour l'aperçu
+        if not premiere_ligne:
+            premiere_ligne = "*[Message vide ou embed]*"
+
+        # Tronquer si trop long
+        apercu = premiere_ligne[:60] + ('...' if len(premiere_ligne) > 60 else '')
+
+        # Ajouter info sur la date relative
+        delta = now - created_at
+        if delta.days == 0:
+            when = "Aujourd'hui"
+        elif delta.days == 1:
+            when = "Hier"
+        else:
+            when = f"Il y a {delta.days} jours"
+
+        return {
+            'apercu': apercu,
+            'url': message_url,
+            'when': when,
+            'author': author_name,
+            'date': created_at
+        }
+
     async def callback(self,
                        interaction: discord.Interaction,
                        membre: discord.Member = None):
@@ -65,42 +95,34 @@ class MentionSomeoneCommand(BaseCommand):
 
         # Collecter tous les messages avec mentions
         mentions_trouvees = []
-        messages_parcourus = 0
-
-        async for message in channel.history(limit=1000,
-                                             after=thirty_days_ago):
-            messages_parcourus += 1
-            if cible in message.mentions:
-                # Créer le lien vers le message
-                message_url = f"https://discord.com/channels/{interaction.guild.id}/{channel.id}/{message.id}"
-
-                # Prendre la première ligne du message pour l'aperçu
-                premiere_ligne = message.content.split('\n', 1)[0].strip()
-                if not premiere_ligne:
-                    premiere_ligne = "*[Message vide ou embed]*"
-
-                # Tronquer si trop long
-                apercu = premiere_ligne[:60] + ('...' if len(premiere_ligne)
-                                                > 60 else '')
-
-                # Ajouter info sur la date relative
-                delta = now - message.created_at
-                if delta.days == 0:
-                    when = "Aujourd'hui"
-                elif delta.days == 1:
-                    when = "Hier"
-                elif delta.days <= 7:
-                    when = f"Il y a {delta.days} jours"
-                else:
-                    when = f"Il y a {delta.days} jours"
-
-                mentions_trouvees.append({
-                    'apercu': apercu,
-                    'url': message_url,
-                    'when': when,
-                    'author': message.author.display_name,
-                    'date': message.created_at
-                })
+
+        # Lire l'index local si le canal est synchronisé, sinon l'historique
+        index = get_message_index()
+        if index and index.is_channel_synced(channel.id, since=thirty_days_ago):
+            messages_parcourus = index.count_messages(channel.id,
+                                                      since=thirty_days_ago)
+            for row in index.get_mentions_of(channel.id,
+                                             cible.id,
+                                             since=thirty_days_ago):
+                mentions_trouvees.append(
+                    self._build_mention(now, row['first_line'],
+                                        row['jump_url'], row['author_name'],
+                                        row['created_at']))
+        else:
+            messages_parcourus = 0
+            scanner = get_history_scanner()
+            for message in await scanner.fetch(channel, limit=1000,
+                                               after=thirty_days_ago):
+                messages_parcourus += 1
+                if cible in message.mentions:
+                    # Créer le lien vers le message
+                    message_url = f"https://discord.com/channels/{interaction.guild.id}/{channel.id}/{message.id}"
+
+                    mentions_trouvees.append(
+                        self._build_mention(
+                            now, message.content.split('\n', 1)[0].strip(),
+                            message_url, message.author.display_name,
+                            message.created_at))
 
         # Trier par date (plus récent en premier)
         mentions_trouvees.sort(key=lambda x: x['date'], reverse=True)
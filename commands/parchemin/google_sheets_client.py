@@ -4,12 +4,13 @@ Client Google Sheets pour accéder aux données de sorts sans authentification.
 Utilise les noms de colonnes configurables depuis config_v2.py
 """
 
-import aiohttp
 import csv
 import io
 import logging
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from urllib.parse import quote
+from utils.sheet_cache import get_sheet_cache
+from utils.sheet_prefetcher import get_sheet_prefetcher
 from .config_v2 import get_config
 
 logger = logging.getLogger(__name__)
@@ -72,33 +73,53 @@ class GoogleSheetsClient:
         url = self._build_csv_url(sheet_name, gid)
         
         try:
-            async with aiohttp.ClientSession() as session:
-                logger.info(f"Récupération des sorts depuis: {url}")
-                
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        raise Exception(f"Erreur HTTP {response.status}: {await response.text()}")
-                    
-                    csv_content = await response.text()
-                    csv_reader = csv.DictReader(io.StringIO(csv_content))
-                    spells = []
-                    
-                    for row in csv_reader:
-                        # Nettoyer les clés (supprimer espaces)
-                        cleaned_row = {key.strip(): value.strip() for key, value in row.items()}
-                        
-                        # Validation et nettoyage spécifique aux sorts
-                        spell = self._clean_spell_data(cleaned_row)
-                        if spell:
-                            spells.append(spell)
-                    
-                    logger.info(f"Récupération réussie: {len(spells)} sorts")
-                    return spells
-                    
+            # Servi depuis le cache partagé (rechargé en fond après expiration)
+            return await get_sheet_cache().get(url, self._parse_csv)
+
         except Exception as e:
             logger.error(f"Erreur lors de la récupération des sorts: {e}")
             raise Exception(f"Impossible de récupérer les données des sorts: {e}")
     
+    def register_prefetch(self, sheet_name: str = None, gid: str = None,
+                          on_update: Optional[Callable[[List[Dict[str, str]]], None]] = None):
+        """
+        Déclare la feuille des sorts au préchargement en tâche de fond
+        (voir utils/sheet_prefetcher.py).
+        
+        Args:
+            sheet_name: Nom de la feuille (optionnel)
+            gid: GID de la feuille (optionnel, prioritaire)
+            on_update: Appelée avec les nouveaux sorts quand la feuille change
+        """
+        get_sheet_prefetcher().register(
+            f"sorts ({sheet_name or gid})", self._build_csv_url(sheet_name, gid),
+            self._parse_csv, on_update)
+    
+    def _parse_csv(self, csv_content: str) -> List[Dict[str, str]]:
+        """
+        Analyse le contenu CSV de la feuille des sorts.
+        
+        Args:
+            csv_content: Contenu CSV brut
+            
+        Returns:
+            List[Dict[str, str]]: Liste des sorts valides
+        """
+        csv_reader = csv.DictReader(io.StringIO(csv_content))
+        spells = []
+        
+        for row in csv_reader:
+            # Nettoyer les clés (supprimer espaces)
+            cleaned_row = {key.strip(): value.strip() for key, value in row.items()}
+            
+            # Validation et nettoyage spécifique aux sorts
+            spell = self._clean_spell_data(cleaned_row)
+            if spell:
+                spells.append(spell)
+        
+        logger.info(f"Récupération réussie: {len(spells)} sorts")
+        return spells
+    
     def _clean_spell_data(self, row: Dict[str, str]) -> Optional[Dict[str, str]]:
         """
         Nettoie et valide les données d'un sort.
@@ -173,6 +194,16 @@ class GoogleSheetsClient:
             logger.warning(f"Erreur lors du nettoyage des données de sort: {e}")
             return None
     
+    def invalidate_cache(self, sheet_name: str = None, gid: str = None):
+        """
+        Force le prochain appel à retélécharger la feuille.
+        
+        Args:
+            sheet_name: Nom de la feuille (optionnel)
+            gid: GID de la feuille (optionnel)
+        """
+        get_sheet_cache().invalidate(self._build_csv_url(sheet_name, gid))
+    
     async def test_connection(self, sheet_name: str = None, gid: str = None) -> bool:
         """
         Test la connexion au Google Sheets.
@@ -8,7 +8,7 @@ import discord
 from discord import app_commands
 import logging
 import random
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
 
 from ..base import BaseCommand
 from .google_sheets_client import GoogleSheetsClient
@@ -60,6 +60,10 @@ class ParcheminCommandV2(BaseCommand):
         # Cache des sorts (équivalent du cache d'items dans boutique)
         self._spells_cache = None
         self._cache_loaded = False
+        
+        # Sorts rechargés en tâche de fond, index reconstruits hors commande
+        self.sheets_client.register_prefetch(self.sheet_name, self.sheet_gid,
+                                             on_update=self._on_spells_update)
     
     @property
     def name(self) -> str:
@@ -167,9 +171,9 @@ class ParcheminCommandV2(BaseCommand):
             loading_embed = self.response_builder.create_loading_embed()
             await interaction.response.send_message(embed=loading_embed, ephemeral=is_ephemeral)
             
-            # Charger les sorts si nécessaire (équivalent du cache d'items)
-            if not self._cache_loaded:
-                await self._load_spells_cache()
+            # Charger les sorts (servis depuis le cache partagé, rechargé en fond
+            # après expiration : les modifications de la feuille sont prises en compte)
+            await self._load_spells_cache()
             
             if not self._spells_cache:
                 error_embed = self.response_builder.create_error_embed(
@@ -179,27 +183,14 @@ class ParcheminCommandV2(BaseCommand):
                 await interaction.edit_original_response(embed=error_embed)
                 return
             
-            # Filtrage par niveaux exclus
-            filtered_spells, filtered_indices = self.spell_selector.filter_spells_by_excluded_levels(self._spells_cache)
-            
-            # Appliquer les filtres spécifiques
-            if level_range:
-                filtered_spells, filtered_indices = self.spell_selector.filter_spells_by_level_range(filtered_spells, level_range)
-            
-            if ecole:
-                filtered_spells, filtered_indices = self.spell_selector.filter_spells_by_school(
-                    (filtered_spells, filtered_indices), ecole
-                )
-            
-            if classe:
-                filtered_spells, filtered_indices = self.spell_selector.filter_spells_by_class(
-                    (filtered_spells, filtered_indices), classe
-                )
-            
-            if rituel is not None:
-                filtered_spells, filtered_indices = self.spell_selector.filter_spells_by_ritual(
-                    (filtered_spells, filtered_indices), rituel
-                )
+            # Filtrage : niveaux exclus + filtres demandés (index précalculés)
+            filtered_spells, filtered_indices = self.spell_selector.filter_spells(
+                self._spells_cache,
+                level_range=level_range,
+                school=ecole,
+                character_class=classe,
+                is_ritual=rituel
+            )
             
             # Vérifier qu'il reste des sorts après filtrage
             if not filtered_spells:
@@ -328,8 +319,8 @@ class ParcheminCommandV2(BaseCommand):
     
     async def _load_spells_cache(self):
         """
-        Charge les sorts dans le cache depuis Google Sheets.
-        Équivalent du chargement du cache d'items dans boutique.
+        Charge les sorts depuis le cache partagé des feuilles Google Sheets.
+        En cas d'échec, les sorts déjà chargés restent utilisés.
         """
         try:
             logger.info("Chargement des sorts depuis Google Sheets...")
@@ -346,8 +337,18 @@ class ParcheminCommandV2(BaseCommand):
             
         except Exception as e:
             logger.error(f"Erreur lors du chargement du cache des sorts: {e}")
-            self._spells_cache = []
-            self._cache_loaded = False
+            if not self._spells_cache:
+                self._spells_cache = []
+                self._cache_loaded = False
+    
+    def _on_spells_update(self, spells: List[Dict]):
+        """
+        Nouvelle version de la feuille des sorts (préchargement) : remplace
+        le cache et construit les index avant la prochaine commande.
+        """
+        self._spells_cache = spells
+        self._cache_loaded = True
+        self.spell_selector.prepare_indexes(spells)
     
     def _parse_level_range(self, niveau_str: Optional[str]) -> Optional[Tuple[int, int]]:
         """
@@ -386,6 +387,7 @@ class ParcheminCommandV2(BaseCommand):
         Même fonction que dans boutique.
         """
         self._cache_loaded = False
+        self.sheets_client.invalidate_cache(self.sheet_name, self.sheet_gid)
         await self._load_spells_cache()
     
     def get_cache_stats(self) -> dict:
@@ -0,0 +1,96 @@
+# commands/parchemin/spell_index.py
+"""
+Index des sorts par attribut pour les filtres de /parchemin.
+
+Pour chaque valeur de niveau, d'école, de classe et pour le statut rituel,
+un entier Python sert d'ensemble de bits : le bit i est levé si le sort i de
+la liste (ordre de la feuille) a cette valeur. Les index sont construits une
+fois par version de la liste des sorts ; toute combinaison de filtres
+devient une intersection de bits, et les indices retournés restent ceux de
+la liste complète.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def bits_to_indices(bits: int) -> List[int]:
+    """Indices des bits levés, dans l'ordre croissant."""
+    return [i for i, bit in enumerate(reversed(bin(bits)[2:])) if bit == '1']
+
+
+class SpellFilterIndex:
+    """Ensembles de bits par niveau, école, classe et statut rituel."""
+
+    def __init__(self, spells: List[Dict]):
+        self.spells = spells
+        self.all_bits = (1 << len(spells)) - 1
+        self.level_bits: Dict[int, int] = {}
+        self.school_bits: Dict[str, int] = {}
+        self.class_bits: Dict[str, int] = {}
+        self.ritual_bits = 0
+
+        for i, spell in enumerate(spells):
+            bit = 1 << i
+
+            level = spell.get('level', 0)
+            self.level_bits[level] = self.level_bits.get(level, 0) | bit
+
+            school = spell.get('school', '').lower().strip()
+            self.school_bits[school] = self.school_bits.get(school, 0) | bit
+
+            for cls in {cls.lower().strip() for cls in spell.get('classes', [])}:
+                self.class_bits[cls] = self.class_bits.get(cls, 0) | bit
+
+            if spell.get('ritual', False):
+                self.ritual_bits |= bit
+
+        logger.info(
+            f"Index des sorts construit: {len(spells)} sorts, "
+            f"{len(self.school_bits)} écoles, {len(self.class_bits)} classes"
+        )
+
+    def _levels(self, levels: Iterable[int]) -> int:
+        """Union des sorts des niveaux donnés."""
+        bits = 0
+        for level in levels:
+            bits |= self.level_bits.get(level, 0)
+        return bits
+
+    def select(self, excluded_levels: Iterable[int] = (),
+               level_range: Optional[Tuple[int, int]] = None,
+               school: Optional[str] = None,
+               character_class: Optional[str] = None,
+               is_ritual: Optional[bool] = None) -> List[int]:
+        """
+        Indices des sorts qui passent tous les filtres donnés.
+
+        Args:
+            excluded_levels: Niveaux à exclure
+            level_range: Tuple (niveau_min, niveau_max) inclusive
+            school: École de magie
+            character_class: Classe de personnage
+            is_ritual: True pour rituels uniquement, False pour non-rituels
+
+        Returns:
+            List[int]: Indices dans la liste complète des sorts, ordre croissant
+        """
+        bits = self.all_bits & ~self._levels(excluded_levels)
+
+        if level_range:
+            min_level, max_level = level_range
+            bits &= self._levels(level for level in self.level_bits
+                                 if min_level <= level <= max_level)
+
+        if school:
+            bits &= self.school_bits.get(school.lower().strip(), 0)
+
+        if character_class:
+            bits &= self.class_bits.get(character_class.lower().strip(), 0)
+
+        if is_ritual is not None:
+            bits &= self.ritual_bits if is_ritual else ~self.ritual_bits
+
+        return bits_to_indices(bits)
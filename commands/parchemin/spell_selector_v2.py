@@ -8,6 +8,8 @@ import random
 import logging
 from typing import List, Dict, Optional, Tuple
 from difflib import SequenceMatcher
+from utils.prefix_index import PrefixIndex, MAX_CHOICES
+from .spell_index import SpellFilterIndex
 
 logger = logging.getLogger(__name__)
 
@@ -34,186 +36,48 @@ class SpellSelectorV2:
             except ValueError:
                 logger.warning(f"Niveau exclu invalide: {level}")
         
+        # Index des filtres et des noms (reconstruits si la liste change)
+        self._filter_index = None
+        self._name_index_spells = None
+        self._name_index = None
+        
         # Log de debug (comme boutique)
         logger.info(f"Niveaux à exclure: {self.excluded_levels}")
         logger.info(f"Niveaux exclus normalisés: {self.excluded_levels_int}")
     
-    def _is_level_excluded(self, level: int) -> bool:
-        """
-        Vérifie si un niveau doit être exclu.
-        Équivalent de _is_rarity_excluded dans boutique.
-        
-        Args:
-            level: Niveau du sort à vérifier
-            
-        Returns:
-            bool: True si le niveau doit être exclu
+    def filter_spells(self, spells: List[Dict], level_range: Optional[Tuple[int, int]] = None,
+                      school: Optional[str] = None, character_class: Optional[str] = None,
+                      is_ritual: Optional[bool] = None) -> Tuple[List[Dict], List[int]]:
         """
-        if level in self.excluded_levels_int:
-            logger.debug(f"Niveau {level} EXCLU")
-            return True
+        Filtre les sorts en une fois : niveaux exclus configurés, puis les
+        filtres demandés (plage de niveaux, école, classe, rituel).
         
-        logger.debug(f"Niveau {level} AUTORISÉ")
-        return False
-    
-    def filter_spells_by_level_range(self, spells: List[Dict], level_range: Tuple[int, int]) -> Tuple[List[Dict], List[int]]:
-        """
-        Filtre les sorts par plage de niveaux.
-        Équivalent de filter_items_by_specific_rarity mais pour les niveaux.
+        Les filtres sont des intersections d'ensembles de bits précalculés
+        (voir spell_index.py), construits une fois par version de la liste.
         
         Args:
-            spells: Liste des sorts à filtrer
-            level_range: Tuple (niveau_min, niveau_max) inclusive
+            spells: Liste complète des sorts (celle du cache des feuilles)
+            level_range: Tuple (niveau_min, niveau_max) inclusive (optionnel)
+            school: École de magie (optionnel)
+            character_class: Classe de personnage (optionnel)
+            is_ritual: True pour rituels uniquement, False pour non-rituels (optionnel)
             
         Returns:
-            Tuple[List[Dict], List[int]]: (Sorts filtrés, indices originaux)
+            Tuple[List[Dict], List[int]]: (Sorts filtrés, indices dans la liste complète)
         """
-        filtered_spells = []
-        original_indices = []
-        
-        min_level, max_level = level_range
-        
-        for i, spell in enumerate(spells):
-            spell_level = spell.get('level', 0)
-            
-            if min_level <= spell_level <= max_level:
-                filtered_spells.append(spell)
-                original_indices.append(i)
-                
-                spell_name = spell.get('name', 'Sort inconnu')
-                logger.debug(f"Sort inclus: {spell_name} (Niveau: {spell_level})")
-        
-        logger.info(f"Filtrage par niveau {min_level}-{max_level} terminé: {len(filtered_spells)}/{len(spells)} sorts retenus")
-        return filtered_spells, original_indices
-    
-    def filter_spells_by_school(self, spells_with_indices: Tuple[List[Dict], List[int]], school: str) -> Tuple[List[Dict], List[int]]:
-        """
-        Filtre les sorts par école de magie.
-        Équivalent de filter_items_by_price mais pour l'école.
-        
-        Args:
-            spells_with_indices: Tuple (sorts, indices originaux)
-            school: École de magie à filtrer
-            
-        Returns:
-            Tuple[List[Dict], List[int]]: (Sorts filtrés, indices originaux préservés)
-        """
-        spells, original_indices = spells_with_indices
-        filtered_spells = []
-        preserved_original_indices = []
-        excluded_count = 0
-        
-        school_lower = school.lower().strip()
-        
-        for spell, original_index in zip(spells, original_indices):
-            spell_name = spell.get('name', 'Sort inconnu')
-            spell_school = spell.get('school', '').lower().strip()
-            
-            if spell_school == school_lower:
-                filtered_spells.append(spell)
-                preserved_original_indices.append(original_index)  # PRÉSERVER l'index original
-                logger.debug(f"Sort inclus: {spell_name} - école: {spell_school}")
-            else:
-                logger.debug(f"Sort exclu (école différente): {spell_name} - école: {spell_school}")
-                excluded_count += 1
-        
-        logger.info(f"Filtrage école '{school}' terminé: {len(filtered_spells)} sorts gardés, {excluded_count} sorts exclus")
-        return filtered_spells, preserved_original_indices
-    
-    def filter_spells_by_class(self, spells_with_indices: Tuple[List[Dict], List[int]], character_class: str) -> Tuple[List[Dict], List[int]]:
-        """
-        Filtre les sorts par classe de personnage.
-        Adaptation du filtrage de boutique pour les classes.
-        
-        Args:
-            spells_with_indices: Tuple (sorts, indices originaux)
-            character_class: Classe de personnage à filtrer
-            
-        Returns:
-            Tuple[List[Dict], List[int]]: (Sorts filtrés, indices originaux préservés)
-        """
-        spells, original_indices = spells_with_indices
-        filtered_spells = []
-        preserved_original_indices = []
-        excluded_count = 0
-        
-        class_lower = character_class.lower().strip()
-        
-        for spell, original_index in zip(spells, original_indices):
-            spell_name = spell.get('name', 'Sort inconnu')
-            spell_classes = [cls.lower().strip() for cls in spell.get('classes', [])]
-            
-            if class_lower in spell_classes:
-                filtered_spells.append(spell)
-                preserved_original_indices.append(original_index)  # PRÉSERVER l'index original
-                logger.debug(f"Sort inclus: {spell_name} - classes: {spell_classes}")
-            else:
-                logger.debug(f"Sort exclu (classe non trouvée): {spell_name} - classes: {spell_classes}")
-                excluded_count += 1
-        
-        logger.info(f"Filtrage classe '{character_class}' terminé: {len(filtered_spells)} sorts gardés, {excluded_count} sorts exclus")
-        return filtered_spells, preserved_original_indices
-    
-    def filter_spells_by_ritual(self, spells_with_indices: Tuple[List[Dict], List[int]], is_ritual: bool) -> Tuple[List[Dict], List[int]]:
-        """
-        Filtre les sorts par statut rituel.
-        Nouveau filtre spécifique aux sorts.
-        
-        Args:
-            spells_with_indices: Tuple (sorts, indices originaux)
-            is_ritual: True pour rituels uniquement, False pour non-rituels
-            
-        Returns:
-            Tuple[List[Dict], List[int]]: (Sorts filtrés, indices originaux préservés)
-        """
-        spells, original_indices = spells_with_indices
-        filtered_spells = []
-        preserved_original_indices = []
-        excluded_count = 0
-        
-        for spell, original_index in zip(spells, original_indices):
-            spell_name = spell.get('name', 'Sort inconnu')
-            spell_ritual = spell.get('ritual', False)
-            
-            if spell_ritual == is_ritual:
-                filtered_spells.append(spell)
-                preserved_original_indices.append(original_index)  # PRÉSERVER l'index original
-                logger.debug(f"Sort inclus: {spell_name} - rituel: {spell_ritual}")
-            else:
-                logger.debug(f"Sort exclu (rituel différent): {spell_name} - rituel: {spell_ritual}")
-                excluded_count += 1
-        
-        ritual_text = "rituels" if is_ritual else "non-rituels"
-        logger.info(f"Filtrage sorts {ritual_text} terminé: {len(filtered_spells)} sorts gardés, {excluded_count} sorts exclus")
-        return filtered_spells, preserved_original_indices
-    
-    def filter_spells_by_excluded_levels(self, spells: List[Dict]) -> Tuple[List[Dict], List[int]]:
-        """
-        Filtre les sorts en excluant les niveaux configurés.
-        Équivalent de filter_items_by_rarity dans boutique.
-        
-        Args:
-            spells: Liste des sorts à filtrer
-            
-        Returns:
-            Tuple[List[Dict], List[int]]: (Sorts filtrés, indices originaux)
-        """
-        filtered_spells = []
-        original_indices = []
-        
-        for i, spell in enumerate(spells):
-            spell_level = spell.get('level', 0)
-            spell_name = spell.get('name', 'Sort inconnu')
-            
-            if not self._is_level_excluded(spell_level):
-                filtered_spells.append(spell)
-                original_indices.append(i)
-                logger.debug(f"Sort inclus: {spell_name} (Niveau: {spell_level})")
-            else:
-                logger.debug(f"Sort exclu (niveau banni): {spell_name} (Niveau: {spell_level})")
-        
-        logger.info(f"Filtrage niveaux exclus terminé: {len(filtered_spells)}/{len(spells)} sorts retenus")
-        return filtered_spells, original_indices
+        self._get_filter_index(spells)
+        
+        indices = self._filter_index.select(
+            self.excluded_levels_int, level_range, school, character_class, is_ritual
+        )
+        filtered_spells = [spells[i] for i in indices]
+        
+        logger.info(
+            f"Filtrage terminé: {len(filtered_spells)}/{len(spells)} sorts retenus "
+            f"(niveaux: {level_range or 'tous'}, école: {school or 'toutes'}, "
+            f"classe: {character_class or 'toutes'}, rituel: {'indifférent' if is_ritual is None else is_ritual})"
+        )
+        return filtered_spells, indices
     
     def select_random_spells(self, spells_with_indices: Tuple[List[Dict], List[int]], min_count: int = 1, max_count: int = 15) -> Tuple[List[Dict], List[int]]:
         """
@@ -339,6 +203,52 @@ class SpellSelectorV2:
         best_results = results[:max_results]
         return [result['spell'] for result in best_results]
     
+    def complete_spell_names(self, spells: List[Dict], text: str, limit: int = MAX_CHOICES) -> List[str]:
+        """
+        Noms de sorts (VO ou VF) qui complètent la saisie `text`, pour
+        l'autocomplétion. Répond depuis un index trié en mémoire (bisect),
+        construit une fois par version de la liste des sorts.
+        
+        Args:
+            spells: Liste des sorts (celle du cache des feuilles)
+            text: Saisie en cours
+            limit: Nombre maximum de noms
+            
+        Returns:
+            List[str]: Noms proposés
+        """
+        if not spells:
+            return []
+        
+        return self._get_name_index(spells).complete(text, limit)
+    
+    def _get_filter_index(self, spells: List[Dict]) -> SpellFilterIndex:
+        """Index de filtrage de la liste `spells`, construit au premier appel."""
+        if self._filter_index is None or self._filter_index.spells is not spells:
+            self._filter_index = SpellFilterIndex(spells)
+        return self._filter_index
+    
+    def _get_name_index(self, spells: List[Dict]) -> PrefixIndex:
+        """Index des noms de la liste `spells`, construit au premier appel."""
+        if self._name_index is None or self._name_index_spells is not spells:
+            self._name_index = PrefixIndex(
+                name for spell in spells for name in (spell.get('name'), spell.get('name_vf')))
+            self._name_index_spells = spells
+            logger.info(f"Index des noms de sorts construit: {len(self._name_index)} noms")
+        return self._name_index
+    
+    def prepare_indexes(self, spells: List[Dict]):
+        """
+        Construit à l'avance les index d'une nouvelle liste de sorts
+        (appelé par le préchargement des feuilles, hors commande).
+        
+        Args:
+            spells: Liste complète des sorts (celle du cache des feuilles)
+        """
+        if spells:
+            self._get_filter_index(spells)
+            self._get_name_index(spells)
+    
     def validate_spell_data(self, spell: Dict) -> Dict:
         """
         Valide et nettoie les données d'un sort.
@@ -1,17 +1,28 @@
-"""Commande /pj_dispo — Affiche les PJ disponibles dans une range de niveau."""
+"""
+Commande /pj_dispo — Affiche les PJ disponibles dans une range de niveau.
+
+Seules les quatre colonnes lues (nom, joueur, niveau, dernière MAJ) sont
+demandées à Google (requête gviz `tq=select ...`), via le cache partagé
+des feuilles. Le registre est analysé une fois par version de la feuille :
+PJ triés par niveau puis par nom, dates de dernière MAJ déjà converties.
+Une range de niveau et un seuil d'inactivité se résolvent par bisection.
+"""
 
 import discord
 from discord import app_commands
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 import logging
-import aiohttp
+import copy
 import csv
 import io
 import os
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
 from urllib.parse import quote
 
 from .base import BaseCommand
+from utils.sheet_cache import get_sheet_cache
+from utils.sheet_prefetcher import get_sheet_prefetcher
 
 logger = logging.getLogger(__name__)
 
@@ -34,10 +45,164 @@ COL_JOUEUR = int(os.getenv('PJ_DISPO_COL_JOUEUR', '2'))
 COL_NIVEAU = int(os.getenv('PJ_DISPO_COL_NIVEAU', '14'))
 COL_DERNIERE_MAJ = int(os.getenv('PJ_DISPO_COL_DERNIERE_MAJ', '17'))
 
+# Colonnes demandées à Google, dans cet ordre
+PROJECTED_COLUMNS = (COL_NOM_PJ, COL_JOUEUR, COL_NIVEAU, COL_DERNIERE_MAJ)
+
+
+def column_letter(index: int) -> str:
+    """Lettre de colonne d'un index 0-based (0 = A, 25 = Z, 26 = AA...)."""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def build_roster_url() -> str:
+    """URL d'export CSV du registre, limitée aux colonnes lues."""
+    query = "select " + ", ".join(column_letter(col) for col in PROJECTED_COLUMNS)
+    base = (f"https://docs.google.com/spreadsheets/d/{SHEET_ID}/gviz/tq"
+            f"?tqx=out:csv&tq={quote(query)}")
+    if SHEET_NAME:
+        return f"{base}&sheet={quote(SHEET_NAME)}"
+    return f"{base}&gid={SHEET_GID}"
+
+
+def parse_roster_csv(text: str) -> List[List[str]]:
+    """
+    Analyse l'export CSV projeté (nom, joueur, niveau, dernière MAJ).
+
+    Returns:
+        List[List[str]]: [nom, joueur, niveau, date] par ligne de la feuille
+        après l'en-tête (liste vide si colonnes insuffisantes), chaînes
+        nettoyées. Le numéro de ligne se déduit de la position : il n'entre
+        pas dans l'empreinte des lignes, une insertion ne modifie pas les suivantes.
+    """
+    reader = csv.reader(io.StringIO(text))
+    next(reader, None)  # en-tête
+    rows = [[value.strip() for value in row[:len(PROJECTED_COLUMNS)]]
+            if len(row) >= len(PROJECTED_COLUMNS) else []
+            for row in reader]
+    logger.info(f"Registre des PJ récupéré: {len(rows)} lignes")
+    return rows
+
+
+class PjRecord:
+    """PJ du registre, avec sa date de dernière MAJ déjà convertie."""
+
+    __slots__ = ('ligne', 'nom', 'joueur', 'niveau', 'date', 'derniere_maj', 'date_invalide')
+
+    def __init__(self, ligne: int, nom: str, joueur: str, niveau: int, date_str: str):
+        self.ligne = ligne
+        self.nom = nom
+        self.joueur = joueur
+        self.niveau = niveau
+        self.date = date_str or "—"
+        # None si absente ou invalide
+        self.derniere_maj: Optional[datetime] = None
+        if date_str:
+            try:
+                self.derniere_maj = datetime.strptime(date_str, "%d/%m/%Y")
+            except ValueError:
+                pass
+        self.date_invalide = bool(date_str) and self.derniere_maj is None
+
+
+class PjRoster:
+    """PJ triés par niveau, et par date de dernière MAJ pour chaque niveau."""
+
+    def __init__(self, rows: List[List[str]], previous: Optional['PjRoster'] = None):
+        """
+        Args:
+            rows: Lignes analysées du registre
+            previous: Registre précédent : les lignes inchangées (même objet,
+                voir SheetCache._diff_rows) reprennent leur PJ déjà analysé
+        """
+        self.rows = rows
+        known = previous.by_row if previous else {}
+        # PJ par ligne analysée (identité de l'objet ligne)
+        self.by_row: Dict[int, PjRecord] = {}
+        records = []
+        for ligne, row in enumerate(rows, start=2):  # 1-based row num, après l'en-tête
+            pj = known.get(id(row))
+            if pj is None:
+                # Colonnes suffisantes ?
+                if not row:
+                    continue
+                nom_pj, joueur, niveau_str, date_str = row
+                if not nom_pj:
+                    continue
+                try:
+                    niveau = int(niveau_str)
+                except ValueError:
+                    continue
+                pj = PjRecord(ligne, nom_pj, joueur, niveau, date_str)
+            elif pj.ligne != ligne:
+                # Ligne déplacée : copie, l'ancien registre peut encore servir
+                pj = copy.copy(pj)
+                pj.ligne = ligne
+            self.by_row[id(row)] = pj
+            records.append(pj)
+
+        # Ordre d'affichage : niveau puis nom (ordre de la feuille à égalité)
+        self.records = sorted(records, key=lambda pj: (pj.niveau, pj.nom))
+        self.levels = [pj.niveau for pj in self.records]
+
+        # Par niveau : PJ datés triés par date, et dates correspondantes
+        self.by_date: Dict[int, Tuple[List[datetime], List[PjRecord]]] = {}
+        for pj in sorted((pj for pj in records if pj.derniere_maj),
+                         key=lambda pj: pj.derniere_maj):
+            dates, level_records = self.by_date.setdefault(pj.niveau, ([], []))
+            dates.append(pj.derniere_maj)
+            level_records.append(pj)
+
+        # PJ dont la date est renseignée mais invalide (ordre de la feuille)
+        self.invalid_dates = [pj for pj in records if pj.date_invalide]
+
+    def in_range(self, lvl_min: int, lvl_max: int) -> List[PjRecord]:
+        """PJ de niveau lvl_min à lvl_max, triés par niveau puis par nom."""
+        return self.records[bisect_left(self.levels, lvl_min):bisect_right(self.levels, lvl_max)]
+
+    def inactive(self, lvl_min: int, lvl_max: int, cutoff: datetime) -> List[PjRecord]:
+        """PJ de la range dont la dernière MAJ est antérieure à `cutoff`, même tri."""
+        results = []
+        for niveau in range(lvl_min, lvl_max + 1):
+            if niveau not in self.by_date:
+                continue
+            dates, level_records = self.by_date[niveau]
+            inactive = level_records[:bisect_left(dates, cutoff)]
+            results.extend(sorted(inactive, key=lambda pj: (pj.nom, pj.ligne)))
+        return results
+
+    def date_errors(self, lvl_min: int, lvl_max: int) -> List[str]:
+        """Lignes de la range ignorées pour date invalide."""
+        return [f"Ligne {pj.ligne} — date invalide: `{pj.date}`"
+                for pj in self.invalid_dates if lvl_min <= pj.niveau <= lvl_max]
+
+
+# Registre courant (reconstruit quand le cache fournit de nouvelles lignes)
+_roster: Optional[PjRoster] = None
+
+
+def get_roster(rows: List[List[str]]) -> PjRoster:
+    """Retourne le registre des lignes `rows`, construit au premier appel."""
+    global _roster
+    if _roster is None or _roster.rows is not rows:
+        _roster = PjRoster(rows, previous=_roster)
+        logger.info(f"Registre des PJ indexé: {len(_roster.records)} PJ")
+    return _roster
+
 
 class PjDispoCommand(BaseCommand):
     """Commande pour lister les PJ disponibles selon leur niveau et inactivité."""
 
+    def __init__(self, bot):
+        super().__init__(bot)
+        # Registre rechargé en tâche de fond, indexé hors commande
+        get_sheet_prefetcher().register("registre des PJ", build_roster_url(),
+                                        parse_roster_csv, on_update=get_roster)
+
     @property
     def name(self) -> str:
         return "pj_dispo"
@@ -87,17 +252,8 @@ class PjDispoCommand(BaseCommand):
             return
 
         # --- Récupération du Google Sheet ---
-        base = f"https://docs.google.com/spreadsheets/d/{SHEET_ID}/gviz/tq?tqx=out:csv"
-        if SHEET_NAME:
-            url = f"{base}&sheet={quote(SHEET_NAME)}"
-        else:
-            url = f"{base}&gid={SHEET_GID}"
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as resp:
-                    if resp.status != 200:
-                        raise ConnectionError(f"HTTP {resp.status}")
-                    text = await resp.text()
+            rows = await get_sheet_cache().get(build_roster_url(), parse_roster_csv)
         except Exception as e:
             logger.error(f"Erreur accès Google Sheet pj_dispo: {e}")
             await interaction.followup.send(
@@ -106,53 +262,15 @@ class PjDispoCommand(BaseCommand):
             )
             return
 
-        # --- Parsing et filtrage ---
-        cutoff = datetime.now() - timedelta(days=jours) if jours else None
-        results = []
+        # --- Filtrage ---
+        roster = get_roster(rows)
         errors = []
-
-        reader = csv.reader(io.StringIO(text))
-        rows = list(reader)
-
-        for i, row in enumerate(rows[1:], start=2):  # skip header, 1-based row num
-            # Colonnes suffisantes ?
-            if len(row) <= COL_DERNIERE_MAJ:
-                continue
-
-            nom_pj = row[COL_NOM_PJ].strip()
-            joueur = row[COL_JOUEUR].strip()
-
-            if not nom_pj:
-                continue
-
-            # Niveau
-            try:
-                niveau = int(row[COL_NIVEAU].strip())
-            except (ValueError, IndexError):
-                continue
-
-            if not (lvl_min <= niveau <= lvl_max):
-                continue
-
-            # Filtre par jours d'inactivité
-            date_str = row[COL_DERNIERE_MAJ].strip()
-            if cutoff:
-                if not date_str:
-                    continue  # pas de date = on ignore
-                try:
-                    derniere_maj = datetime.strptime(date_str, "%d/%m/%Y")
-                    if derniere_maj >= cutoff:
-                        continue  # a joué récemment
-                except ValueError:
-                    errors.append(f"Ligne {i} — date invalide: `{date_str}`")
-                    continue
-
-            results.append({
-                "nom": nom_pj,
-                "joueur": joueur,
-                "niveau": niveau,
-                "date": date_str or "—"
-            })
+        if jours:
+            cutoff = datetime.now() - timedelta(days=jours)
+            results = roster.inactive(lvl_min, lvl_max, cutoff)
+            errors = roster.date_errors(lvl_min, lvl_max)
+        else:
+            results = roster.in_range(lvl_min, lvl_max)
 
         # --- Construction de la réponse ---
         titre = f"PJ disponibles — Niveaux {lvl_min} à {lvl_max}"
@@ -168,14 +286,11 @@ class PjDispoCommand(BaseCommand):
             await interaction.followup.send(embed=embed, ephemeral=True)
             return
 
-        # Trier par niveau puis par nom
-        results.sort(key=lambda x: (x["niveau"], x["nom"]))
-
         if afficher:
             lines = []
             for pj in results:
                 lines.append(
-                    f"**{pj['nom']}** (_{pj['joueur']}_) — Niv. **{pj['niveau']}** | Dernière MAJ : {pj['date']}"
+                    f"**{pj.nom}** (_{pj.joueur}_) — Niv. **{pj.niveau}** | Dernière MAJ : {pj.date}"
                 )
             description = "\n".join(lines)
             # Discord limite les embeds à 4096 chars
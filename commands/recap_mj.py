@@ -21,6 +21,9 @@ from discord import app_commands
 from datetime import datetime, timezone, timedelta
 from .base import BaseCommand
 from utils.channels import ChannelHelper
+from utils.history_scan import get_history_scanner
+from utils.message_index import get_message_index
+from utils.user_resolver import get_user_resolver
 
 
 class RecapMjCommand(BaseCommand):
@@ -44,6 +47,39 @@ class RecapMjCommand(BaseCommand):
                                    membre: discord.Member = None):
             await self.callback(interaction, membre)
 
+    def _build_post(self, now: datetime, premiere_ligne: str, message_url: str,
+                    created_at: datetime, nb_mentions: int,
+                    mentions_noms: list) -> dict:
+        """Prépare l'entrée d'affichage d'un post multi-mentions."""
+        # Prendre la première ligne du message pour l'aperçu
+        if not premiere_ligne:
+            premiere_ligne = "*[Message vide ou embed]*"
+
+        # Tronquer si trop long
+        apercu = premiere_ligne[:50] + ('...' if len(premiere_ligne) > 50 else '')
+
+        # Info sur la date relative
+        delta = now - created_at
+        if delta.days == 0:
+            when = "Aujourd'hui"
+        elif delta.days == 1:
+            when = "Hier"
+        else:
+            when = f"Il y a {delta.days} jours"
+
+        mentions_str = ", ".join(mentions_noms[:5])  # Max 5 noms affichés
+        if len(mentions_noms) > 5:
+            mentions_str += f" +{len(mentions_noms) - 5} autres"
+
+        return {
+            'apercu': apercu,
+            'url': message_url,
+            'when': when,
+            'nb_mentions': nb_mentions,
+            'mentions_str': mentions_str,
+            'date': created_at
+        }
+
     async def callback(self,
                        interaction: discord.Interaction,
                        membre: discord.Member = None):
@@ -65,68 +101,63 @@ class RecapMjCommand(BaseCommand):
 
         # Collecter tous les messages multi-mentions du MJ
         posts_multi_mentions = []
-        messages_parcourus = 0
         total_mentions_uniques = 0
 
-        async for message in channel.history(limit=1000,
-                                             after=thirty_days_ago):
-            messages_parcourus += 1
-
-            if message.author.id == cible.id:
-                # Compter les mentions uniques (en excluant l'auteur)
-                mentions_uniques = set(user.id for user in message.mentions
-                                       if user.id != cible.id)
-
-                if len(mentions_uniques) >= 2:
-                    # Créer le lien vers le message
-                    message_url = f"https://discord.com/channels/{interaction.guild.id}/{channel.id}/{message.id}"
-
-                    # Prendre la première ligne du message pour l'aperçu
-                    premiere_ligne = message.content.split('\n', 1)[0].strip()
-                    if not premiere_ligne:
-                        premiere_ligne = "*[Message vide ou embed]*"
-
-                    # Tronquer si trop long
-                    apercu = premiere_ligne[:50] + (
-                        '...' if len(premiere_ligne) > 50 else '')
-
-                    # Info sur la date relative
-                    delta = now - message.created_at
-                    if delta.days == 0:
-                        when = "Aujourd'hui"
-                    elif delta.days == 1:
-                        when = "Hier"
-                    elif delta.days <= 7:
-                        when = f"Il y a {delta.days} jours"
-                    else:
-                        when = f"Il y a {delta.days} jours"
-
-                    # Récupérer les noms des personnes mentionnées
-                    mentions_noms = [
-                        user.display_name for user in message.mentions
-                        if user.id != cible.id
-                    ]
-                    mentions_str = ", ".join(
-                        mentions_noms[:5])  # Max 5 noms affichés
-                    if len(mentions_noms) > 5:
-                        mentions_str += f" +{len(mentions_noms) - 5} autres"
-
-                    posts_multi_mentions.append({
-                        'apercu':
-                        apercu,
-                        'url':
-                        message_url,
-                        'when':
-                        when,
-                        'nb_mentions':
-                        len(mentions_uniques),
-                        'mentions_str':
-                        mentions_str,
-                        'date':
-                        message.created_at
-                    })
-
-                    total_mentions_uniques += len(mentions_uniques)
+        # Lire l'index local si le canal est synchronisé, sinon l'historique
+        index = get_message_index()
+        if index and index.is_channel_synced(channel.id, since=thirty_days_ago):
+            messages_parcourus = index.count_messages(channel.id,
+                                                      since=thirty_days_ago)
+            rows = index.get_author_posts(channel.id,
+                                          cible.id,
+                                          since=thirty_days_ago,
+                                          min_unique_mentions=2)
+
+            # Résoudre tous les noms mentionnés en une seule passe
+            user_names = await get_user_resolver().resolve_names(
+                interaction.guild,
+                [uid for row in rows for uid in row['mention_ids']])
+
+            for row in rows:
+                mentions_ids = [
+                    uid for uid in row['mention_ids'] if uid != cible.id
+                ]
+                mentions_noms = [user_names[uid] for uid in mentions_ids]
+                posts_multi_mentions.append(
+                    self._build_post(now, row['first_line'], row['jump_url'],
+                                     row['created_at'], len(mentions_ids),
+                                     mentions_noms))
+                total_mentions_uniques += len(mentions_ids)
+        else:
+            messages_parcourus = 0
+            scanner = get_history_scanner()
+            for message in await scanner.fetch(channel, limit=1000,
+                                               after=thirty_days_ago):
+                messages_parcourus += 1
+
+                if message.author.id == cible.id:
+                    # Compter les mentions uniques (en excluant l'auteur)
+                    mentions_uniques = set(user.id for user in message.mentions
+                                           if user.id != cible.id)
+
+                    if len(mentions_uniques) >= 2:
+                        # Créer le lien vers le message
+                        message_url = f"https://discord.com/channels/{interaction.guild.id}/{channel.id}/{message.id}"
+
+                        # Récupérer les noms des personnes mentionnées
+                        mentions_noms = [
+                            user.display_name for user in message.mentions
+                            if user.id != cible.id
+                        ]
+
+                        posts_multi_mentions.append(
+                            self._build_post(
+                                now,
+                                message.content.split('\n', 1)[0].strip(),
+                                message_url, message.created_at,
+                                len(mentions_uniques), mentions_noms))
+
+                        total_mentions_uniques += len(mentions_uniques)
 
         # Trier par date (plus récent en premier)
         posts_multi_mentions.sort(key=lambda x: x['date'], reverse=True)
@@ -0,0 +1,189 @@
+"""
+Commande Discord : /search-logs (ADMIN SEULEMENT)
+
+DESCRIPTION:
+    Recherche dans les logs quotidiens, archives compressées comprises
+    VISIBLE UNIQUEMENT pour les membres avec le rôle admin configuré
+
+FONCTIONNEMENT:
+    - Filtre par utilisateur, commande, statut et période
+    - Parcourt les fichiers du plus récent au plus ancien, au fil de la
+      décompression, et s'arrête au nombre de résultats demandé
+      (utils/log_archive.search_logs)
+    - La lecture se fait hors de la boucle asyncio
+
+UTILISATION:
+    /search-logs utilisateur:@membre statut:Erreurs
+    /search-logs commande:boutique debut:01-09-2025 fin:07-09-2025 limite:50
+"""
+
+import asyncio
+import discord
+from discord import app_commands
+from datetime import datetime, timedelta
+from typing import List, Optional
+from .base import BaseCommand
+from utils.permissions import has_admin_role
+from utils.file_logger import get_daily_logger
+from utils.log_archive import search_logs
+from config import Config
+
+# Période cherchée par défaut (jours)
+DEFAULT_DAYS = 7
+
+# Nombre maximum de résultats affichés
+MAX_RESULTS = 50
+
+STATUS_EMOJIS = {'SUCCESS': '✅', 'ERROR': '❌', 'ADMIN': '🔧'}
+
+
+def format_event(event: dict) -> str:
+    """Une ligne de résultat : date, statut, commande, utilisateur, erreur."""
+    try:
+        when = datetime.fromisoformat(event['timestamp']).astimezone().strftime('%d/%m %H:%M')
+    except (KeyError, TypeError, ValueError):
+        when = "??/?? ??:??"
+
+    status = event.get('status', '?')
+    command = event.get('command') or '?'
+    name = f"🔧 {command}" if status == 'ADMIN' else f"/{command}"
+    line = f"`{when}` {STATUS_EMOJIS.get(status, '▫️')} **{name}**"
+    if event.get('user_id'):
+        line += f" <@{event['user_id']}>"
+    if event.get('error'):
+        line += f" — {event['error'][:80]}"
+    return line
+
+
+class SearchLogsCommand(BaseCommand):
+
+    @property
+    def name(self) -> str:
+        return "search-logs"
+
+    @property
+    def description(self) -> str:
+        return "Recherche dans les logs et leurs archives (Façonneurs seulement)"
+
+    def register(self, tree: app_commands.CommandTree):
+        """Enregistrement avec restriction de permissions."""
+
+        @tree.command(name=self.name, description=self.description)
+        @app_commands.describe(
+            utilisateur="Utilisateur recherché",
+            commande="Nom de la commande (sans /) ou de l'action admin",
+            statut="Statut des lignes recherchées",
+            debut=f"Premier jour, au format JJ-MM-AAAA (défaut: il y a {DEFAULT_DAYS} jours)",
+            fin="Dernier jour, au format JJ-MM-AAAA (défaut: aujourd'hui)",
+            limite=f"Nombre maximum de résultats (défaut: 20, max: {MAX_RESULTS})"
+        )
+        @app_commands.choices(statut=[
+            app_commands.Choice(name="✅ Réussies", value="SUCCESS"),
+            app_commands.Choice(name="❌ Erreurs", value="ERROR"),
+            app_commands.Choice(name="🔧 Actions admin", value="ADMIN"),
+        ])
+        # RESTRICTION : Commande visible seulement pour les admin
+        @app_commands.check(self._is_admin)
+        async def search_logs_command(interaction: discord.Interaction,
+                                      utilisateur: Optional[discord.User] = None,
+                                      commande: Optional[str] = None,
+                                      statut: Optional[str] = None,
+                                      debut: Optional[str] = None,
+                                      fin: Optional[str] = None,
+                                      limite: Optional[int] = 20):
+            await self.callback(interaction, utilisateur, commande, statut, debut, fin, limite)
+
+        # Gérer l'erreur de permission
+        @search_logs_command.error
+        async def search_logs_error(interaction: discord.Interaction,
+                                    error: app_commands.AppCommandError):
+            if isinstance(error, app_commands.CheckFailure):
+                await interaction.response.send_message(
+                    f"❌ Cette commande est réservée aux membres avec le rôle `{Config.ADMIN_ROLE_NAME}`.",
+                    ephemeral=True)
+
+    async def _is_admin(self, interaction: discord.Interaction) -> bool:
+        """Vérifie si l'utilisateur a les permissions admin."""
+        return has_admin_role(interaction.user)
+
+    async def callback(self, interaction: discord.Interaction,
+                       utilisateur: Optional[discord.User] = None,
+                       commande: Optional[str] = None,
+                       statut: Optional[str] = None,
+                       debut: Optional[str] = None,
+                       fin: Optional[str] = None,
+                       limite: int = 20):
+        # Double vérification des permissions (sécurité)
+        if not has_admin_role(interaction.user):
+            await interaction.response.send_message(
+                f"❌ Accès refusé. Rôle `{Config.ADMIN_ROLE_NAME}` requis.",
+                ephemeral=True)
+            return
+
+        daily_logger = get_daily_logger()
+        if not daily_logger:
+            await interaction.response.send_message(
+                "❌ Système de logs quotidiens non initialisé.",
+                ephemeral=True)
+            return
+
+        try:
+            end = datetime.strptime(fin, "%d-%m-%Y").date() if fin else datetime.now().date()
+            start = (datetime.strptime(debut, "%d-%m-%Y").date() if debut
+                     else end - timedelta(days=DEFAULT_DAYS - 1))
+        except ValueError:
+            await interaction.response.send_message(
+                "❌ Format de date invalide. Utilisez JJ-MM-AAAA (ex: 15-02-2025)",
+                ephemeral=True)
+            return
+
+        limite = max(1, min(limite or 20, MAX_RESULTS))
+        commande = commande.strip().lstrip('/') if commande else None
+
+        await interaction.response.defer(ephemeral=True)
+
+        # Lecture et décompression dans un thread : la boucle reste libre
+        def run_search() -> List[dict]:
+            return list(search_logs(daily_logger.logs_dir, start, end,
+                                    user_id=utilisateur.id if utilisateur else None,
+                                    command=commande or None,
+                                    status=statut, limit=limite))
+
+        events = await asyncio.to_thread(run_search)
+
+        filters = []
+        if utilisateur:
+            filters.append(f"👤 {utilisateur.mention}")
+        if commande:
+            filters.append(f"📝 `{commande}`")
+        if statut:
+            filters.append(f"{STATUS_EMOJIS[statut]} {statut}")
+        filters_text = " • ".join(filters) if filters else "Aucun filtre"
+
+        embed = discord.Embed(
+            title="🔎 Recherche dans les Logs",
+            description=f"**Du {start:%d/%m/%Y} au {end:%d/%m/%Y}** • {filters_text}\n\n",
+            color=0x3498db,
+            timestamp=discord.utils.utcnow()
+        )
+
+        if events:
+            lines = []
+            length = len(embed.description)
+            for event in events:
+                line = format_event(event)
+                if length + len(line) + 1 > 4000:
+                    lines.append(f"*… {len(events) - len(lines)} résultat(s) non affiché(s)*")
+                    break
+                lines.append(line)
+                length += len(line) + 1
+            embed.description += "\n".join(lines)
+        else:
+            embed.description += "*Aucune ligne ne correspond à ces filtres*"
+
+        embed.set_footer(
+            text=f"{len(events)} résultat(s), du plus récent au plus ancien • "
+                 f"Consulté par {interaction.user.display_name}"
+        )
+
+        await interaction.followup.send(embed=embed)
@@ -8,7 +8,7 @@ DESCRIPTION:
 FONCTIONNEMENT:
     - Commande invisible pour les utilisateurs normaux
     - Visible seulement pour les Façonneurs (ou rôle admin configuré)
-    - Lit les fichiers de logs du jour et affiche les statistiques
+    - Lit les compteurs du jour tenus par le logger (sans relire le fichier)
     - Montre les commandes les plus utilisées, les erreurs, etc.
 
 UTILISATION:
@@ -77,10 +77,9 @@ class StatsLogsCommand(BaseCommand):
                 ephemeral=True)
             return
 
-        # Defer car peut prendre un moment à analyser les logs
         await interaction.response.defer(ephemeral=True)
         
-        # CORRECTION : Analyser les logs du jour avec la bonne méthode
+        # Compteurs du jour, tenus en mémoire par le thread d'écriture
         stats = daily_logger.get_today_stats()
         file_info = daily_logger.get_file_info()  # NOUVEAU : Utilise la méthode du logger
         today_str = datetime.now().strftime('%d/%m/%Y')
@@ -102,6 +101,8 @@ class StatsLogsCommand(BaseCommand):
                 f"**❌ Échouées :** {stats['failed_commands']}\n"
                 f"**📊 Taux de succès :** {success_rate:.1f}%"
             )
+            if stats['average_latency_ms'] is not None:
+                commands_text += f"\n**⏱️ Latence moyenne :** {stats['average_latency_ms']:.0f} ms"
             
             # Couleur selon le taux de succès
             if success_rate >= 95:
@@ -196,6 +197,22 @@ class StatsLogsCommand(BaseCommand):
             inline=True
         )
 
+        # === FILE D'ÉCRITURE ===
+        queue_status = daily_logger.get_queue_status()
+        queue_text = (
+            f"**En attente :** {queue_status['queued']}/{queue_status['capacity']}\n"
+            f"**Écrites :** {queue_status['written']} ({queue_status['batches']} lots)\n"
+            f"**Abandonnées :** {queue_status['dropped']}"
+        )
+        if not queue_status['writer_alive']:
+            queue_text += "\n⚠️ *Thread d'écriture arrêté*"
+
+        embed.add_field(
+            name="📥 File d'écriture",
+            value=queue_text,
+            inline=True
+        )
+
         # === STATUT DISCORD LOGGER ===
         # NOUVEAU : Affiche le statut du Discord Logger
         if discord_logger:
@@ -206,7 +223,9 @@ class StatsLogsCommand(BaseCommand):
                 discord_text += f"Erreurs: {discord_status['error_count']}/{discord_status['max_errors']}"
             elif discord_status['ready']:
                 discord_text = "✅ **Opérationnel**\n"
-                discord_text += f"Cache: {discord_status['cache_size']} entrées"
+                discord_text += (f"File: {discord_status['queued']}/{discord_status['queue_capacity']}\n"
+                                 f"Envoyés: {discord_status['embeds_sent']} logs en "
+                                 f"{discord_status['messages_sent']} messages")
             else:
                 discord_text = "⚠️ **En attente**\n"
                 discord_text += f"Cache: {discord_status['cache_size']} logs en attente"
@@ -233,6 +252,12 @@ class StatsLogsCommand(BaseCommand):
         if not file_info['exists']:
             recommendations.append("📝 Fichier de logs non créé - première utilisation")
 
+        if discord_logger and discord_logger.get_status()['dropped'] > 0:
+            recommendations.append("📢 Logs Discord abandonnés (file pleine) - augmenter DISCORD_LOG_QUEUE_SIZE")
+
+        if queue_status['dropped'] > 0:
+            recommendations.append("📥 Lignes de logs abandonnées - augmenter LOG_QUEUE_SIZE")
+
         if recommendations:
             embed.add_field(
                 name="💡 Recommandations",
@@ -244,6 +269,8 @@ class StatsLogsCommand(BaseCommand):
         embed.add_field(
             name="🛠️ Commandes Utiles",
             value=(
+                "• `/stats-usage` - Utilisation sur 7/30/90 jours\n"
+                "• `/search-logs` - Rechercher dans les logs archivés\n"
                 "• `/test-logs` - Tester le système de logs\n"
                 "• `/config-channels action:test` - Vérifier la config\n"
                 "• `!debug_bot` - Informations de débogage"
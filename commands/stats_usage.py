@@ -0,0 +1,222 @@
+"""
+Commande Discord : /stats-usage (ADMIN SEULEMENT)
+
+DESCRIPTION:
+    Affiche l'utilisation du bot sur plusieurs jours (7, 30, 90 jours ou
+    une période libre)
+    VISIBLE UNIQUEMENT pour les membres avec le rôle admin configuré
+
+FONCTIONNEMENT:
+    - Additionne les résumés quotidiens écrits par le logger à minuit
+      (rollup-DDMMYYYY.json), plus les compteurs en mémoire du jour
+    - Aucun fichier de logs n'est relu, quelle que soit la période
+    - Montre les commandes les plus utilisées, les classes d'erreurs,
+      les heures d'activité et l'activité jour par jour
+
+UTILISATION:
+    /stats-usage periode:30                        → 30 derniers jours
+    /stats-usage debut:01-09-2025 fin:15-09-2025   → période libre
+"""
+
+import discord
+from discord import app_commands
+from datetime import datetime, timedelta
+from typing import List, Optional
+from .base import BaseCommand
+from utils.permissions import has_admin_role
+from utils.file_logger import get_daily_logger
+from config import Config
+
+# Périodes proposées (jours)
+PERIODES = {"7": "📅 7 derniers jours", "30": "📆 30 derniers jours", "90": "🗓️ 90 derniers jours"}
+
+# Durée maximum d'une période libre (jours)
+MAX_RANGE_DAYS = 366
+
+# Barres de l'histogramme horaire
+HISTOGRAM_BARS = "▁▂▃▄▅▆▇█"
+
+
+def histogram(values: List[int]) -> str:
+    """Une barre par valeur, à l'échelle de la plus grande."""
+    peak = max(values, default=0)
+    if not peak:
+        return HISTOGRAM_BARS[0] * len(values)
+    return "".join(HISTOGRAM_BARS[round(value / peak * (len(HISTOGRAM_BARS) - 1))]
+                   for value in values)
+
+
+class StatsUsageCommand(BaseCommand):
+
+    @property
+    def name(self) -> str:
+        return "stats-usage"
+
+    @property
+    def description(self) -> str:
+        return "Affiche l'utilisation du bot sur plusieurs jours (Façonneurs seulement)"
+
+    def register(self, tree: app_commands.CommandTree):
+        """Enregistrement avec restriction de permissions."""
+
+        @tree.command(name=self.name, description=self.description)
+        @app_commands.describe(
+            periode="Période analysée (défaut: 7 derniers jours)",
+            debut="Début d'une période libre, au format JJ-MM-AAAA",
+            fin="Fin d'une période libre, au format JJ-MM-AAAA (défaut: aujourd'hui)"
+        )
+        @app_commands.choices(periode=[
+            app_commands.Choice(name=label, value=value)
+            for value, label in PERIODES.items()
+        ])
+        # RESTRICTION : Commande visible seulement pour les admin
+        @app_commands.check(self._is_admin)
+        async def stats_usage_command(interaction: discord.Interaction,
+                                      periode: Optional[str] = "7",
+                                      debut: Optional[str] = None,
+                                      fin: Optional[str] = None):
+            await self.callback(interaction, periode, debut, fin)
+
+        # Gérer l'erreur de permission
+        @stats_usage_command.error
+        async def stats_usage_error(interaction: discord.Interaction,
+                                    error: app_commands.AppCommandError):
+            if isinstance(error, app_commands.CheckFailure):
+                await interaction.response.send_message(
+                    f"❌ Cette commande est réservée aux membres avec le rôle `{Config.ADMIN_ROLE_NAME}`.",
+                    ephemeral=True)
+
+    async def _is_admin(self, interaction: discord.Interaction) -> bool:
+        """Vérifie si l'utilisateur a les permissions admin."""
+        return has_admin_role(interaction.user)
+
+    async def callback(self, interaction: discord.Interaction, periode: str = "7",
+                       debut: Optional[str] = None, fin: Optional[str] = None):
+        # Double vérification des permissions (sécurité)
+        if not has_admin_role(interaction.user):
+            await interaction.response.send_message(
+                f"❌ Accès refusé. Rôle `{Config.ADMIN_ROLE_NAME}` requis.",
+                ephemeral=True)
+            return
+
+        daily_logger = get_daily_logger()
+        if not daily_logger:
+            await interaction.response.send_message(
+                "❌ Système de logs quotidiens non initialisé.",
+                ephemeral=True)
+            return
+
+        today = datetime.now().date()
+        try:
+            end = datetime.strptime(fin, "%d-%m-%Y").date() if fin else today
+            if debut:
+                start = datetime.strptime(debut, "%d-%m-%Y").date()
+            else:
+                start = end - timedelta(days=int(periode or "7") - 1)
+        except ValueError:
+            await interaction.response.send_message(
+                "❌ Format de date invalide. Utilisez JJ-MM-AAAA (ex: 15-02-2025)",
+                ephemeral=True)
+            return
+
+        if start > end:
+            await interaction.response.send_message(
+                "❌ La date de début doit précéder la date de fin.", ephemeral=True)
+            return
+        if (end - start).days >= MAX_RANGE_DAYS:
+            await interaction.response.send_message(
+                f"❌ Période trop longue (maximum {MAX_RANGE_DAYS} jours).", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+
+        stats = daily_logger.get_range_stats(start, end)
+        days = (end - start).days + 1
+
+        embed = discord.Embed(
+            title="📈 Utilisation du Bot",
+            description=(f"**Du {start:%d/%m/%Y} au {end:%d/%m/%Y}** ({days} jours)\n"
+                         f"*{stats['days_with_data']} jour(s) avec des données*"),
+            color=0x3498db,
+            timestamp=discord.utils.utcnow()
+        )
+
+        # === COMMANDES ===
+        if stats['total_commands'] > 0:
+            success_rate = (stats['successful_commands'] / stats['total_commands']) * 100
+            commands_text = (
+                f"**Total :** {stats['total_commands']}\n"
+                f"**✅ Réussies :** {stats['successful_commands']}\n"
+                f"**❌ Échouées :** {stats['failed_commands']}\n"
+                f"**📊 Taux de succès :** {success_rate:.1f}%\n"
+                f"**📅 Moyenne :** {stats['total_commands'] / days:.1f} / jour"
+            )
+            if stats['average_latency_ms'] is not None:
+                commands_text += f"\n**⏱️ Latence moyenne :** {stats['average_latency_ms']:.0f} ms"
+        else:
+            commands_text = "*Aucune commande enregistrée sur la période*"
+
+        embed.add_field(name="📝 Commandes Exécutées", value=commands_text, inline=True)
+
+        # === UTILISATEURS ===
+        users_text = f"**👥 Utilisateurs uniques :** {stats['unique_users']}"
+        if stats['admin_actions'] > 0:
+            users_text += f"\n**🔧 Actions admin :** {stats['admin_actions']}"
+        if stats['top_users']:
+            top_user_id, top_count = next(iter(stats['top_users'].items()))
+            users_text += f"\n**🏅 Plus actif :** <@{top_user_id}> ({top_count})"
+
+        embed.add_field(name="👤 Activité Utilisateurs", value=users_text, inline=True)
+
+        # === TOP COMMANDES ===
+        if stats['most_used_commands']:
+            top_commands = sorted(stats['most_used_commands'].items(),
+                                  key=lambda x: x[1], reverse=True)[:10]
+            commands_list = []
+            for cmd, count in top_commands:
+                display_name = f"🔧 {cmd[6:]}" if cmd.startswith('ADMIN_') else f"/{cmd}"
+                failures = stats['failures_by_command'].get(cmd, 0)
+                suffix = f" ({failures} ❌)" if failures else ""
+                commands_list.append(f"▫️ **{display_name}** : {count}{suffix}")
+
+            embed.add_field(name="🏆 Commandes Populaires",
+                            value="\n".join(commands_list), inline=False)
+
+        # === ERREURS ===
+        if stats['error_classes']:
+            error_list = [f"▫️ `{name}` : {count}" for name, count in
+                          sorted(stats['error_classes'].items(), key=lambda x: x[1], reverse=True)[:6]]
+            embed.add_field(name="🐞 Classes d'Erreurs", value="\n".join(error_list), inline=True)
+
+        # === HEURES D'ACTIVITÉ ===
+        hourly = stats['hourly']
+        if any(hourly):
+            peak_hour = max(range(24), key=lambda hour: hourly[hour])
+            embed.add_field(
+                name="🕐 Heures d'Activité",
+                value=f"`0h {histogram(hourly)} 23h`\n**Pic :** {peak_hour}h ({hourly[peak_hour]})",
+                inline=True
+            )
+
+        # === ACTIVITÉ PAR JOUR ===
+        if stats['daily_totals']:
+            daily = [stats['daily_totals'].get(start + timedelta(days=i), 0) for i in range(days)]
+            busiest = max(stats['daily_totals'].items(), key=lambda x: x[1])
+            # Une barre par jour (regroupés par semaine au-delà de 31 jours)
+            if days > 31:
+                daily = [sum(daily[i:i + 7]) for i in range(0, days, 7)]
+                legend = "par semaine"
+            else:
+                legend = "par jour"
+            embed.add_field(
+                name="📅 Activité",
+                value=(f"`{histogram(daily)}` ({legend})\n"
+                       f"**Jour le plus actif :** {busiest[0]:%d/%m/%Y} ({busiest[1]})"),
+                inline=False
+            )
+
+        embed.set_footer(
+            text=f"Consulté par {interaction.user.display_name} • {Config.ADMIN_ROLE_NAME} • Résumés quotidiens"
+        )
+
+        await interaction.followup.send(embed=embed)
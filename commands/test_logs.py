@@ -193,7 +193,8 @@ class TestLogsCommand(BaseCommand):
             diagnostic_text.append("**Cooldown :** ✅ Inactif")
             
         diagnostic_text.append(f"**Cache :** {discord_status['cache_size']} logs en attente")
-        diagnostic_text.append(f"**Anti-doublons :** {discord_status['sent_messages_cache']} entrées")
+        diagnostic_text.append(f"**Anti-doublons :** {discord_status['sent_messages_cache']} entrées, "
+                               f"{discord_status['suppressed']} doublons regroupés")
 
         embed.add_field(
             name="🔍 Diagnostic Discord Logger",
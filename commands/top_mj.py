@@ -5,10 +5,12 @@ Compte les posts dans le canal récompenses avec au moins 2 mentions
 
 import discord
 from discord import app_commands
-from collections import defaultdict
 from typing import Optional
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 from .base import BaseCommand
+from utils.message_stats import MjPostTally
+from utils.user_resolver import get_user_resolver
+from utils.message_index import get_message_index, periode_to_date, PERIODES
 
 
 class TopMjCommand(BaseCommand):
@@ -27,22 +29,37 @@ class TopMjCommand(BaseCommand):
         @app_commands.command(name=self.name, description=self.description)
         @app_commands.describe(
             nombre="Nombre de MJ à afficher (entre 5 et 50, défaut: 10)",
-            periode="Filtrer sur les 30 derniers jours uniquement (défaut: Non)"
+            periode="Période analysée (défaut: tout l'historique)"
         )
+        @app_commands.choices(periode=[
+            app_commands.Choice(name=label, value=value)
+            for value, (label, _) in PERIODES.items()
+        ])
         async def top_mj_cmd(
             interaction: discord.Interaction, 
             nombre: Optional[int] = 10,
-            periode: Optional[bool] = False
+            periode: Optional[str] = "tout"
         ):
             await self.callback(interaction, nombre, periode)
         
         tree.add_command(top_mj_cmd)
 
+    async def _count_mj_posts_from_history(self, channel: discord.TextChannel,
+                                           date_limite: Optional[datetime]):
+        """Compte les posts MJ en parcourant l'historique Discord (index indisponible)."""
+        # Chaque message est compté à la volée puis libéré (tout l'historique si
+        # aucune date limite)
+        tally = MjPostTally()
+        async for message in channel.history(limit=None, after=date_limite):
+            tally.add(message)
+
+        return tally.mj_stats, tally.total_messages
+
     async def callback(
         self, 
         interaction: discord.Interaction,
         nombre: int = 10,
-        periode: bool = False
+        periode: str = "tout"
     ):
         """Analyse les posts dans le canal récompenses et affiche le classement des MJ."""
         
@@ -78,10 +95,10 @@ class TopMjCommand(BaseCommand):
                 return
 
             # Calculer la période
-            periode_text = "30 derniers jours" if periode else "tout l'historique"
-            date_limite = None
-            if periode:
-                date_limite = datetime.now(timezone.utc) - timedelta(days=30)
+            if periode not in PERIODES:
+                periode = "tout"
+            periode_text = PERIODES[periode][0]
+            date_limite = periode_to_date(periode)
 
             # Message de progression (ephemeral)
             await interaction.followup.send(
@@ -91,32 +108,15 @@ class TopMjCommand(BaseCommand):
                 ephemeral=True
             )
 
-            # Collecter tous les messages
-            all_messages = []
-            if periode and date_limite:
-                # Filtrer sur les 30 derniers jours
-                async for message in recompense_channel.history(limit=None, after=date_limite):
-                    all_messages.append(message)
-                    
-                    # Limite de sécurité (10000 messages max)
-                    if len(all_messages) >= 10000:
-                        break
+            # Lire l'index local si le canal est synchronisé, sinon l'historique
+            index = get_message_index()
+            if index and index.is_channel_synced(recompense_channel.id, since=date_limite):
+                # Somme des compteurs journaliers (au plus quelques centaines de jours)
+                mj_stats = index.get_mj_totals(interaction.guild.id, since=date_limite)
+                total_messages = index.count_messages(recompense_channel.id, since=date_limite)
             else:
-                # Tout l'historique
-                async for message in recompense_channel.history(limit=None):
-                    all_messages.append(message)
-                    
-                    # Limite de sécurité (10000 messages max)
-                    if len(all_messages) >= 10000:
-                        break
-
-            # Compter les posts valides par auteur
-            mj_stats = defaultdict(int)
-
-            for message in all_messages:
-                # Vérifier si le message a au moins 2 mentions
-                if len(message.mentions) >= 2:
-                    mj_stats[message.author.id] += 1
+                mj_stats, total_messages = await self._count_mj_posts_from_history(
+                    recompense_channel, date_limite)
 
             # Trier et prendre le top X (selon l'argument)
             sorted_mj = sorted(
@@ -144,12 +144,10 @@ class TopMjCommand(BaseCommand):
             
             # Construire le classement
             ranking_text = ""
+            user_names = await get_user_resolver().resolve_names(
+                interaction.guild, [user_id for user_id, _ in sorted_mj])
             for i, (user_id, count) in enumerate(sorted_mj):
-                try:
-                    user = await self.bot.fetch_user(user_id)
-                    user_name = f"{user.display_name}"
-                except:
-                    user_name = f"Utilisateur inconnu"
+                user_name = user_names[user_id]
                 
                 # Icône pour le classement
                 if i < 3:
@@ -172,7 +170,7 @@ class TopMjCommand(BaseCommand):
             
             stats_text = (
                 f"**Total sessions (top {nombre}) :** {total_sessions}\n"
-                f"**Messages analysés :** {len(all_messages)}\n"
+                f"**Messages analysés :** {total_messages}\n"
                 f"**MJ actifs (total) :** {total_mj}"
             )
             
@@ -1,14 +1,17 @@
 """
 Commande Top Joueurs - Classe les joueurs les plus mentionnés
-Compte les mentions dans le canal récompenses sur les 30 derniers jours
+Compte les mentions dans le canal récompenses sur une période au choix
+(30 derniers jours par défaut)
 """
 
 import discord
 from discord import app_commands
-from collections import defaultdict
 from typing import Optional
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 from .base import BaseCommand
+from utils.message_stats import MentionTally
+from utils.user_resolver import get_user_resolver
+from utils.message_index import get_message_index, periode_to_date, PERIODES
 
 
 class TopJoueurs(BaseCommand):
@@ -20,23 +23,41 @@ class TopJoueurs(BaseCommand):
 
     @property
     def description(self) -> str:
-        return "Affiche le classement des joueurs les plus mentionnés sur les 30 derniers jours"
+        return "Affiche le classement des joueurs les plus mentionnés"
     
     def register(self, tree: app_commands.CommandTree):
         """Enregistre la commande avec ses paramètres."""
         @app_commands.command(name=self.name, description=self.description)
         @app_commands.describe(
-            limite="Nombre de joueurs à afficher (entre 5 et 25, défaut: 10)"
+            limite="Nombre de joueurs à afficher (entre 5 et 25, défaut: 10)",
+            periode="Période analysée (défaut: 30 derniers jours)"
         )
-        async def topjoueurs_cmd(interaction: discord.Interaction, limite: Optional[int] = 10):
-            await self.callback(interaction, limite)
+        @app_commands.choices(periode=[
+            app_commands.Choice(name=label, value=value)
+            for value, (label, _) in PERIODES.items()
+        ])
+        async def topjoueurs_cmd(interaction: discord.Interaction,
+                                 limite: Optional[int] = 10,
+                                 periode: Optional[str] = "30j"):
+            await self.callback(interaction, limite, periode)
         
         tree.add_command(topjoueurs_cmd)
 
+    async def _count_mentions_from_history(self, channel: discord.TextChannel,
+                                           date_limite: Optional[datetime]):
+        """Compte les mentions en parcourant l'historique Discord (index indisponible)."""
+        # Chaque message est compté à la volée puis libéré
+        tally = MentionTally()
+        async for message in channel.history(limit=None, after=date_limite):
+            tally.add(message)
+
+        return tally.mention_counts, tally.total_messages, tally.messages_with_mentions
+
     async def callback(
         self, 
         interaction: discord.Interaction,
-        limite: int = 10
+        limite: int = 10,
+        periode: str = "30j"
     ):
         """Analyse les mentions dans le canal récompenses et affiche le classement des joueurs."""
         
@@ -55,6 +76,10 @@ class TopJoueurs(BaseCommand):
         if limite_original != limite:
             adjusted_warning = f"⚠️ Nombre ajusté de {limite_original} à {limite} (limites: 5-25)\n\n"
 
+        if periode not in PERIODES:
+            periode = "30j"
+        periode_text = PERIODES[periode][0]
+
         try:
             # Chercher le canal récompenses (plusieurs variantes possibles)
             recompense_channel = None
@@ -75,46 +100,24 @@ class TopJoueurs(BaseCommand):
             await interaction.followup.send(
                 f"{adjusted_warning}📊 Analyse des mentions en cours...\n"
                 f"Canal : #{recompense_channel.name}\n"
-                f"Période : 30 derniers jours",
+                f"Période : {periode_text}",
                 ephemeral=True
             )
 
-            # Calculer la date limite (30 jours en arrière)
-            date_limite = datetime.now(timezone.utc) - timedelta(days=30)
-
-            # Collecter les messages des 30 derniers jours
-            all_messages = []
-            async for message in recompense_channel.history(limit=None, after=date_limite):
-                all_messages.append(message)
-                
-                # Limite de sécurité (10000 messages max)
-                if len(all_messages) >= 10000:
-                    break
-
-            # Compter les mentions par utilisateur
-            mention_counts = defaultdict(int)
-            total_messages = 0
-            messages_with_mentions = 0
-
-            for message in all_messages:
-                total_messages += 1
-                
-                # Ignorer les messages de bots
-                if message.author.bot:
-                    continue
-
-                # Récupérer les mentions uniques dans ce message
-                mentioned_users = set()
-                for mention in message.mentions:
-                    # Ignorer les auto-mentions
-                    if mention.id != message.author.id:
-                        mentioned_users.add(mention.id)
-
-                # Compter les mentions
-                if mentioned_users:
-                    messages_with_mentions += 1
-                    for user_id in mentioned_users:
-                        mention_counts[user_id] += 1
+            # Calculer la date limite (None = tout l'historique)
+            date_limite = periode_to_date(periode)
+
+            # Lire l'index local si le canal est synchronisé, sinon l'historique
+            index = get_message_index()
+            if index and index.is_channel_synced(recompense_channel.id, since=date_limite):
+                # Somme des compteurs journaliers (au plus quelques centaines de jours)
+                mention_counts = index.get_mention_totals(interaction.guild.id, since=date_limite)
+                messages_with_mentions = index.count_messages_with_mentions(
+                    recompense_channel.id, since=date_limite)
+                total_messages = index.count_messages(recompense_channel.id, since=date_limite)
+            else:
+                mention_counts, total_messages, messages_with_mentions = \
+                    await self._count_mentions_from_history(recompense_channel, date_limite)
 
             # Trier par nombre de mentions (décroissant)
             sorted_players = sorted(
@@ -125,14 +128,14 @@ class TopJoueurs(BaseCommand):
 
             if not sorted_players:
                 await interaction.edit_original_response(
-                    content="📊 Aucune mention trouvée dans le canal récompense sur les 30 derniers jours."
+                    content=f"📊 Aucune mention trouvée dans le canal récompense sur {periode_text}."
                 )
                 return
 
             # Créer l'embed (sera ephemeral automatiquement)
             embed = discord.Embed(
                 title=f"🏆 Top {len(sorted_players)} des Joueurs",
-                description=f"Classement basé sur les mentions dans #{recompense_channel.name}\n📅 Période : 30 derniers jours",
+                description=f"Classement basé sur les mentions dans #{recompense_channel.name}\n📅 Période : {periode_text}",
                 color=discord.Color.gold(),
                 timestamp=discord.utils.utcnow()
             )
@@ -142,12 +145,10 @@ class TopJoueurs(BaseCommand):
             
             # Construire le classement
             ranking_text = ""
+            user_names = await get_user_resolver().resolve_names(
+                interaction.guild, [user_id for user_id, _ in sorted_players])
             for i, (user_id, count) in enumerate(sorted_players):
-                try:
-                    user = await self.bot.fetch_user(user_id)
-                    user_name = f"{user.display_name}"
-                except:
-                    user_name = f"Utilisateur inconnu"
+                user_name = user_names[user_id]
                 
                 # Icône pour le classement
                 if i < 3:
@@ -37,6 +37,41 @@ class Config:
     # Configuration du rôle admin
     ADMIN_ROLE_NAME = os.getenv('ADMIN_ROLE_NAME', 'Façonneur')
 
+    # Durée pendant laquelle une feuille Google Sheets en mémoire est
+    # considérée fraîche (secondes) ; au-delà elle est rechargée en fond
+    SHEET_CACHE_TTL = int(os.getenv('SHEET_CACHE_TTL', 300))
+
+    # Préchargement des feuilles en tâche de fond (secondes, 0 = désactivé) ;
+    # inférieur au TTL pour que les commandes trouvent toujours une feuille fraîche
+    SHEET_PREFETCH_INTERVAL = int(os.getenv('SHEET_PREFETCH_INTERVAL', 240))
+
+    # Recherche floue : processus dédiés (0 = désactivé) et délai maximum
+    # d'une recherche (secondes) avant de répondre par préfixe
+    SEARCH_POOL_WORKERS = int(os.getenv('SEARCH_POOL_WORKERS', 2))
+    SEARCH_DEADLINE = float(os.getenv('SEARCH_DEADLINE', 1.5))
+
+    # Logs quotidiens : taille maximum de la file d'écriture (au-delà, les
+    # lignes sont abandonnées et comptées)
+    LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+
+    # Logs quotidiens : délai entre deux enregistrements des compteurs du jour
+    # (stats-DDMMYYYY.json, relus au redémarrage)
+    LOG_STATS_PERSIST_INTERVAL = float(os.getenv('LOG_STATS_PERSIST_INTERVAL', 30))
+
+    # Logs quotidiens : nombre de jours conservés (compressés en .gz une fois
+    # le jour terminé ; 0 = aucune suppression)
+    LOG_RETENTION_DAYS = int(os.getenv('LOG_RETENTION_DAYS', 30))
+
+    # Logs Discord (canal admin) : taille de la file d'envoi, fenêtre de
+    # regroupement des embeds et délai minimum entre deux messages (secondes)
+    DISCORD_LOG_QUEUE_SIZE = int(os.getenv('DISCORD_LOG_QUEUE_SIZE', 200))
+    DISCORD_LOG_BATCH_WINDOW = float(os.getenv('DISCORD_LOG_BATCH_WINDOW', 1.0))
+    DISCORD_LOG_MIN_INTERVAL = float(os.getenv('DISCORD_LOG_MIN_INTERVAL', 1.0))
+
+    # Logs Discord : fenêtre pendant laquelle les logs identiques sont
+    # regroupés en un seul embed avec leur nombre de répétitions (secondes)
+    DISCORD_LOG_DEDUP_WINDOW = float(os.getenv('DISCORD_LOG_DEDUP_WINDOW', 300))
+
     # Configuration générique des canaux
     CHANNELS_CONFIG = {}
 
@@ -9,6 +9,14 @@ from commands import ALL_COMMANDS
 from utils.permissions import has_admin_role, send_permission_denied
 from utils.discord_logger import init_discord_logger, get_discord_logger
 from utils.file_logger import init_daily_logger, get_daily_logger
+from utils.message_index import init_message_index
+from utils.history_backfill import init_history_backfill
+from utils.http_client import init_http_client
+from utils.scoring_pool import init_scoring_pool
+from utils.sheet_cache import get_sheet_cache
+from utils.sheet_prefetcher import init_sheet_prefetcher
+from utils.user_resolver import init_user_resolver
+from utils.channels import ChannelHelper
 
 # Configuration du niveau de log global
 LOG_LEVEL = logging.INFO
@@ -33,6 +41,11 @@ class FaerunBot(discord.Client):
         self.tree = app_commands.CommandTree(self)
         self.synced = False
         self.command_instances = []
+        self._index_sync_running = False
+        # Écouteurs on_message ajoutés par les commandes (ex: détection Disboard)
+        self.message_listeners = []
+        # Canaux indexés par serveur : {guild_id: {channel_id: channel_key}}
+        self._indexed_channels = {}
 
         # CORRECTION : Initialiser les systèmes de logs avec gestion d'erreurs
         try:
@@ -49,14 +62,65 @@ class FaerunBot(discord.Client):
             logger.error(f"❌ Erreur initialisation Daily Logger: {e}")
             self.daily_logger = None
 
+        # Résolution des noms partagée par les classements
+        self.user_resolver = init_user_resolver(self)
+
+        # Session HTTP partagée par les commandes Google Sheets
+        self.http_client = init_http_client()
+
+        # Processus dédiés au score des recherches floues
+        self.scoring_pool = init_scoring_pool()
+
+        # Rechargement des feuilles en tâche de fond (déclarées par les commandes)
+        self.sheet_prefetcher = init_sheet_prefetcher()
+
+        try:
+            self.message_index = init_message_index()
+            logger.info("✅ Index des messages initialisé")
+        except Exception as e:
+            logger.error(f"❌ Erreur initialisation Index des messages: {e}")
+            self.message_index = None
+
+        # Remplissage à rebours de l'historique des canaux indexés
+        self.history_backfill = (init_history_backfill(self, self.message_index)
+                                 if self.message_index else None)
+
     async def setup_hook(self):
         """Méthode appelée lors du démarrage du bot pour configurer les commandes."""
+        # Feuilles Google Sheets du dernier lancement : servies dès la première commande
+        try:
+            get_sheet_cache().load_snapshots()
+        except Exception as e:
+            logger.error(f"❌ Erreur chargement des instantanés Google Sheets: {e}")
+
         logger.info("Chargement des commandes...")
         await self.load_commands()
         logger.info(f"{len(self.tree.get_commands())} commandes prêtes")
 
+        # Les commandes ont déclaré leurs feuilles : les précharger dès maintenant
+        self.sheet_prefetcher.start()
+
+    async def close(self):
+        """Arrête le bot et libère les ressources partagées."""
+        if self.history_backfill:
+            self.history_backfill.stop()
+        self.sheet_prefetcher.stop()
+        if self.discord_logger:
+            self.discord_logger.stop()
+        self.scoring_pool.close()
+        if self.daily_logger:
+            self.daily_logger.close()
+        try:
+            await self.http_client.close()
+        except Exception as e:
+            logger.warning(f"Erreur fermeture de la session HTTP: {e}")
+        await super().close()
+
     async def load_commands(self):
         """Charge toutes les commandes depuis le module commands."""
+        self.message_listeners = []
+        # Les commandes recréées déclarent à nouveau leurs réindexations
+        self.sheet_prefetcher.clear_callbacks()
         for command_class in ALL_COMMANDS:
             try:
                 command_instance = command_class(self)
@@ -120,6 +184,36 @@ class FaerunBot(discord.Client):
             await self.sync_commands()
             self.synced = True
 
+        # Rattraper l'index local des messages. Relancé à chaque reconnexion
+        # pour combler les événements manqués pendant une coupure du gateway.
+        if self.message_index:
+            self.message_index.reset_caught_up()
+        if self.message_index and not self._index_sync_running:
+            self._index_sync_running = True
+            asyncio.create_task(self.sync_message_index())
+
+    async def sync_message_index(self):
+        """Rattrape l'index local des canaux récompenses et quêtes de chaque serveur."""
+        try:
+            for guild in self.guilds:
+                for channel_key in (ChannelHelper.RECOMPENSES, ChannelHelper.QUETES):
+                    channel = ChannelHelper.get_channel(guild, channel_key)
+                    if not channel:
+                        continue
+
+                    try:
+                        await self.message_index.sync_channel(channel, channel_key)
+                    except discord.Forbidden:
+                        logger.warning(f"Accès refusé à #{channel.name} sur {guild.name} (index non rattrapé)")
+                    except Exception as e:
+                        logger.error(f"❌ Erreur rattrapage de l'index #{channel.name} sur {guild.name}: {e}")
+
+            # L'historique plus ancien est rempli en tâche de fond
+            if self.history_backfill:
+                self.history_backfill.start()
+        finally:
+            self._index_sync_running = False
+
     async def sync_commands(self):
         """Synchronise les commandes slash."""
         try:
@@ -228,7 +322,7 @@ class FaerunBot(discord.Client):
         # Log dans Discord seulement pour les commandes admin
         if command.name in [
                 'config-channels', 'sync_bot', 'debug_bot', 'reload_commands',
-                'test-logs', 'stats-logs'  # AJOUT : Nouvelles commandes admin
+                'test-logs', 'stats-logs', 'stats-usage', 'search-logs'  # AJOUT : Nouvelles commandes admin
         ]:
             if self.discord_logger:
                 try:
@@ -262,7 +356,73 @@ class FaerunBot(discord.Client):
             except Exception as e:
                 logger.warning(f"Impossible de logger la suppression de serveur: {e}")
 
+    def _get_indexed_channel_key(self, guild: discord.Guild, channel_id: int):
+        """Retourne la clé du canal s'il est suivi par l'index, sinon None."""
+        if guild.id not in self._indexed_channels:
+            channels = {}
+            for channel_key in (ChannelHelper.RECOMPENSES, ChannelHelper.QUETES):
+                channel = ChannelHelper.get_channel(guild, channel_key)
+                if channel:
+                    channels[channel.id] = channel_key
+            self._indexed_channels[guild.id] = channels
+
+        return self._indexed_channels[guild.id].get(channel_id)
+
+    async def on_guild_channel_create(self, channel):
+        self._indexed_channels.pop(channel.guild.id, None)
+
+    async def on_guild_channel_update(self, before, after):
+        self._indexed_channels.pop(after.guild.id, None)
+
+    async def on_guild_channel_delete(self, channel):
+        self._indexed_channels.pop(channel.guild.id, None)
+
+    def _index_message(self, message: discord.Message):
+        """Enregistre un message dans l'index s'il provient d'un canal suivi."""
+        if not self.message_index or not message.guild:
+            return
+
+        channel_key = self._get_indexed_channel_key(message.guild, message.channel.id)
+        if not channel_key:
+            return
+
+        try:
+            self.message_index.upsert_message(message, channel_key)
+        except Exception as e:
+            logger.error(f"❌ Erreur indexation du message {message.id}: {e}")
+
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        """Met à jour l'index quand un message suivi est modifié."""
+        if payload.guild_id is None:
+            return
+        self._index_message(payload.message)
+
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        """Retire de l'index un message supprimé."""
+        if self.message_index and payload.guild_id is not None:
+            try:
+                self.message_index.delete_message(payload.message_id)
+            except Exception as e:
+                logger.error(f"❌ Erreur suppression du message {payload.message_id} de l'index: {e}")
+
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        """Retire de l'index les messages supprimés en masse."""
+        if self.message_index and payload.guild_id is not None:
+            try:
+                self.message_index.delete_messages(payload.message_ids)
+            except Exception as e:
+                logger.error(f"❌ Erreur suppression en masse dans l'index: {e}")
+
     async def on_message(self, message: discord.Message):
+        # Index local : on garde aussi les messages de bots (filtrés à la lecture)
+        self._index_message(message)
+
+        for listener in self.message_listeners:
+            try:
+                await listener(message)
+            except Exception as e:
+                logger.error(f"❌ Erreur dans un écouteur de messages: {e}")
+
         if message.author.bot or not message.guild:
             return
 
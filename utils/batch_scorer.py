@@ -0,0 +1,288 @@
+"""
+Score flou vectorisé (NumPy) sur toutes les lignes d'un index.
+
+Les champs nettoyés sont encodés une fois en tableaux : textes, longueurs,
+mots (identifiants dans un vocabulaire commun) et nombre d'occurrences de
+chaque caractère. Une recherche calcule alors pour toutes les lignes, en
+quelques opérations sur ces tableaux, les signaux de utils.fuzzy_search
+.similarity : égalité, début de texte, sous-chaîne et mots en commun.
+
+Seul le score de séquence (SequenceMatcher) reste en Python. Il est borné
+par les caractères en commun (2 * communs / longueurs, comme quick_ratio) :
+les lignes sont scorées par borne décroissante et le parcours s'arrête dès
+que la borne ne peut plus entrer dans les meilleurs résultats. Le classement
+est identique à celui de FuzzyIndex.rank sur les mêmes lignes.
+
+NumPy est optionnel : sans lui, NUMPY_AVAILABLE vaut False et FuzzyIndex
+garde son score ligne par ligne.
+"""
+
+import heapq
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.fuzzy_search import FuzzyIndex, clean_text, similarity
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+def _substrings(word: str) -> set:
+    """Toutes les sous-chaînes non vides d'un mot."""
+    return {word[i:j] for i in range(len(word)) for j in range(i + 1, len(word) + 1)}
+
+
+class BatchScorer:
+    """Champs pondérés encodés en tableaux pour un score vectorisé."""
+
+    def __init__(self, rows: Sequence[Sequence[str]], weights: Sequence[float]):
+        """
+        Args:
+            rows: Lignes, chacune une suite de champs (dans l'ordre des poids)
+            weights: Poids de chaque champ
+        """
+        self.size = len(rows)
+        self.weights = [float(weight) for weight in weights]
+
+        columns = self._clean_columns(rows)
+
+        # Caractères et mots présents dans le catalogue
+        alphabet = sorted({char for column in columns for text in column for char in text})
+        self.char_ids: Dict[str, int] = {char: i for i, char in enumerate(alphabet)}
+        self.token_ids: Dict[str, int] = {}
+
+        # Par champ : textes, longueurs, occurrences des caractères (lignes x alphabet)
+        # et mots à plat (identifiant du mot, ligne qui le contient)
+        self.texts = []
+        self.lengths = []
+        self.char_counts = []
+        self.tokens = []
+        self.token_rows = []
+
+        for column in columns:
+            tokens = []
+            token_rows = []
+            char_rows = []
+            chars = []
+            for row_id, text in enumerate(column):
+                for char in text:
+                    chars.append(self.char_ids[char])
+                    char_rows.append(row_id)
+                for token in set(text.split()):
+                    tokens.append(self.token_ids.setdefault(token, len(self.token_ids)))
+                    token_rows.append(row_id)
+
+            flat = np.array(char_rows, dtype=np.int64) * len(alphabet) + np.array(chars, dtype=np.int64)
+            counts = np.bincount(flat, minlength=self.size * len(alphabet))
+            counts = np.minimum(counts, 255).astype(np.uint8).reshape(self.size, len(alphabet))
+
+            self.texts.append(np.array(column, dtype=str))
+            self.lengths.append(np.fromiter((len(text) for text in column),
+                                            dtype=np.int32, count=self.size))
+            self.char_counts.append(counts)
+            self.tokens.append(np.array(tokens, dtype=np.int32))
+            self.token_rows.append(np.array(token_rows, dtype=np.int32))
+
+    def _clean_columns(self, rows: Sequence[Sequence[str]]) -> List[List[str]]:
+        """Textes nettoyés des lignes, colonne par colonne."""
+        return [[clean_text(row[field] or '') if field < len(row) else ''
+                 for row in rows] for field in range(len(self.weights))]
+
+    def update(self, changes: Dict[int, Sequence[str]]):
+        """
+        Remplace des lignes sur place (même nombre de lignes) : seules les
+        lignes modifiées sont réencodées, les tableaux sont mis à jour par
+        affectation.
+
+        Args:
+            changes: {ligne: nouveaux champs}
+        """
+        row_ids = list(changes)
+        positions = np.array(row_ids, dtype=np.int64)
+        columns = self._clean_columns(list(changes.values()))
+
+        # Nouveaux caractères : une colonne de plus dans chaque matrice
+        new_chars = sorted({char for column in columns for text in column for char in text}
+                           - self.char_ids.keys())
+        if new_chars:
+            for char in new_chars:
+                self.char_ids[char] = len(self.char_ids)
+            padding = np.zeros((self.size, len(new_chars)), dtype=np.uint8)
+            self.char_counts = [np.hstack([counts, padding]) for counts in self.char_counts]
+
+        for field, column in enumerate(columns):
+            texts = self.texts[field]
+            width = max((len(text) for text in column), default=0)
+            if width > texts.dtype.itemsize // 4:
+                texts = self.texts[field] = texts.astype(f'<U{width}')
+            texts[positions] = column
+            self.lengths[field][positions] = [len(text) for text in column]
+
+            counts = self.char_counts[field]
+            counts[positions] = 0
+            tokens = []
+            token_rows = []
+            for row_id, text in zip(row_ids, column):
+                for char in set(text):
+                    counts[row_id, self.char_ids[char]] = min(text.count(char), 255)
+                for token in set(text.split()):
+                    tokens.append(self.token_ids.setdefault(token, len(self.token_ids)))
+                    token_rows.append(row_id)
+
+            kept = ~np.isin(self.token_rows[field], positions)
+            self.tokens[field] = np.concatenate(
+                [self.tokens[field][kept], np.array(tokens, dtype=np.int32)])
+            self.token_rows[field] = np.concatenate(
+                [self.token_rows[field][kept], np.array(token_rows, dtype=np.int32)])
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _field_scores(self, field: int, search_clean: str, search_words: List[str],
+                      query_counts: Dict[int, int],
+                      word_substring_ids: List['np.ndarray']) -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        Scores d'un champ pour toutes les lignes.
+
+        Returns:
+            Tuple (score connu, borne haute) : le score est exact là où le
+            terme est égal, au début ou contenu dans le texte ; ailleurs seule
+            la borne (score de séquence maximal + mots en commun) est connue.
+        """
+        texts = self.texts[field]
+        lengths = self.lengths[field]
+        valid = lengths > 0
+
+        known = np.zeros(self.size)
+        contains = np.char.find(texts, search_clean) >= 0
+        known[contains] = 0.8
+        known[np.char.startswith(texts, search_clean)] = 0.9
+        known[texts == search_clean] = 1.0
+        known[~valid] = 0.0
+
+        # Mots du terme contenus dans un mot du texte, ou l'inverse
+        word_matches = np.zeros(self.size, dtype=np.int32)
+        for search_word, substring_ids in zip(search_words, word_substring_ids):
+            matched = np.char.find(texts, search_word) >= 0
+            if len(substring_ids):
+                hits = np.isin(self.tokens[field], substring_ids)
+                matched[self.token_rows[field][hits]] = True
+            word_matches += matched
+        word_score = word_matches / len(search_words) * 0.3
+
+        # Caractères communs : majorent les correspondances de SequenceMatcher
+        common = np.zeros(self.size, dtype=np.int32)
+        counts = self.char_counts[field]
+        for char_id, count in query_counts.items():
+            common += np.minimum(counts[:, char_id], count)
+        total = lengths + len(search_clean)
+        seq_bound = np.divide(2.0 * common, total, out=np.zeros(self.size), where=valid)
+
+        bound = np.minimum(seq_bound + word_score, 1.0)
+        bound[~valid] = 0.0
+        bound[known > 0] = known[known > 0]
+        return known, bound
+
+    def _exact(self, row_id: int, search_clean: str, search_words: List[str],
+               known: List['np.ndarray']) -> float:
+        """Score exact d'une ligne dont au moins un champ passe par SequenceMatcher."""
+        best_score = 0.0
+        for field, weight in enumerate(self.weights):
+            text_clean = str(self.texts[field][row_id])
+            if not text_clean:
+                continue
+            score = float(known[field][row_id])
+            if not score:
+                score = similarity(search_clean, search_words, text_clean, text_clean.split())
+            if score > 0:
+                best_score = max(best_score, score * weight)
+        return best_score
+
+    def rank(self, search_term: str, row_ids: Optional[Sequence[int]], limit: int,
+             min_similarity: float) -> List[Tuple[int, float]]:
+        """
+        Score les lignes `row_ids` (toutes si None) et garde les meilleures.
+
+        Args:
+            search_term: Terme de recherche
+            row_ids: Lignes à scorer, en ordre croissant (None : toutes)
+            limit: Nombre maximum de résultats
+            min_similarity: Score minimum (après pondération) pour garder une ligne
+
+        Returns:
+            List[Tuple[int, float]]: (ligne, score) triés par score décroissant
+        """
+        search_clean = clean_text(search_term)
+        if not search_clean or not self.size or limit <= 0:
+            return []
+        search_words = search_clean.split()
+
+        query_counts: Dict[int, int] = {}
+        for char in search_clean:
+            char_id = self.char_ids.get(char)
+            if char_id is not None:
+                query_counts[char_id] = min(query_counts.get(char_id, 0) + 1, 255)
+
+        # Mots du catalogue contenus dans chaque mot du terme
+        word_substring_ids = [
+            np.array([self.token_ids[sub] for sub in _substrings(word) if sub in self.token_ids],
+                     dtype=np.int32)
+            for word in search_words
+        ]
+
+        known_by_field = []
+        row_known = np.zeros(self.size)
+        row_bound = np.zeros(self.size)
+        for field, weight in enumerate(self.weights):
+            known, bound = self._field_scores(field, search_clean, search_words,
+                                              query_counts, word_substring_ids)
+            known_by_field.append(known)
+            row_known = np.maximum(row_known, known * weight)
+            row_bound = np.maximum(row_bound, bound * weight)
+
+        selected = np.zeros(self.size, dtype=bool)
+        if row_ids is None:
+            selected[:] = True
+        else:
+            selected[np.asarray(row_ids, dtype=np.int64)] = True
+
+        # Lignes dont le score est déjà exact, et lignes à finir en Python
+        settled = selected & (row_bound <= row_known) & (row_known >= min_similarity) & (row_known > 0)
+        pending = np.flatnonzero(selected & (row_bound > row_known) & (row_bound >= min_similarity))
+
+        results = [(int(row_id), float(row_known[row_id])) for row_id in np.flatnonzero(settled)]
+        top = heapq.nlargest(limit, (score for _, score in results))
+        heapq.heapify(top)
+
+        # Parcours par borne décroissante, arrêté quand la borne ne peut plus entrer
+        order = pending[np.argsort(-row_bound[pending], kind='stable')]
+        for row_id in order:
+            bound = row_bound[row_id]
+            if bound < min_similarity or (len(top) == limit and bound < top[0]):
+                break
+            score = self._exact(int(row_id), search_clean, search_words, known_by_field)
+            if score and score >= min_similarity:
+                results.append((int(row_id), score))
+                if len(top) < limit:
+                    heapq.heappush(top, score)
+                elif score > top[0]:
+                    heapq.heapreplace(top, score)
+
+        # Même ordre que FuzzyIndex.rank : score décroissant, puis ordre des lignes
+        results.sort(key=lambda x: (-x[1], x[0]))
+        return results[:limit]
+
+    def search(self, search_term: str, limit: int,
+               min_similarity: float) -> List[Tuple[int, float]]:
+        """Recherche floue sur toutes les lignes (même interface que FuzzyIndex.search)."""
+        return self.rank(search_term, None, limit, min_similarity)
+
+
+def build_scorer(rows: Sequence[Sequence[str]], weights: Sequence[float]):
+    """Index de score des lignes : vectorisé si NumPy est installé, sinon FuzzyIndex."""
+    if NUMPY_AVAILABLE:
+        return BatchScorer(rows, weights)
+    return FuzzyIndex(rows, weights)
@@ -4,6 +4,18 @@ Système de logging Discord pour le Bot Faerûn.
 Ce module permet d'envoyer les logs importantes dans un canal Discord
 configuré (généralement bot-admin) en plus des logs système classiques.
 
+Les logs sont déposés dans une file bornée, vidée par une seule tâche :
+elle regroupe jusqu'à 10 embeds par message (envoyés quand le lot est
+plein ou après DISCORD_LOG_BATCH_WINDOW secondes) et espace les messages
+d'au moins DISCORD_LOG_MIN_INTERVAL secondes pour rester sous la limite
+de débit du canal. Un afflux d'erreurs donne un message par seconde au
+lieu d'une tâche par log ; si la file est pleine, les logs sont comptés.
+
+Les logs identiques (niveau, message, utilisateur) sont regroupés sur
+DISCORD_LOG_DEDUP_WINDOW secondes : le premier est envoyé, les suivants
+sont comptés puis résumés dans un seul embed « ×N dans les M dernières
+minutes » à la fin de la fenêtre.
+
 VERSION CORRIGÉE - Résout les problèmes de boucles infinies et améliore la gestion d'erreurs.
 """
 
@@ -11,13 +23,123 @@ import discord
 import logging
 import traceback
 import asyncio
+import hashlib
+import math
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Optional, Set
+from typing import List, Optional
 from utils.channels import ChannelHelper
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+# Limites Discord d'un message : nombre d'embeds et caractères cumulés
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+# Nombre maximum de logs distincts suivis par l'anti-doublons
+DEDUP_MAX_ENTRIES = 500
+
+# Intervalle de vérification des fenêtres d'anti-doublons terminées (secondes)
+DEDUP_SWEEP_SECONDS = 30
+
+
+class _DedupWindow:
+    """Fenêtre en cours d'un log : début, répétitions non envoyées, log d'origine."""
+
+    __slots__ = ('started', 'suppressed', 'log_entry')
+
+    def __init__(self, started: float, log_entry: dict):
+        self.started = started
+        self.suppressed = 0
+        self.log_entry = log_entry
+
+
+class LogDeduplicator:
+    """
+    Anti-doublons à fenêtre de temps, du plus ancien au plus récent (LRU).
+
+    Le premier log d'une fenêtre est envoyé ; les logs identiques qui
+    suivent dans la fenêtre sont seulement comptés. À la fin de la fenêtre
+    (ou si le log est évincé), un résumé part avec le nombre de répétitions.
+    """
+
+    def __init__(self, window: float = Config.DISCORD_LOG_DEDUP_WINDOW,
+                 max_entries: int = DEDUP_MAX_ENTRIES):
+        """
+        Args:
+            window: Durée d'une fenêtre de regroupement (secondes)
+            max_entries: Nombre maximum de logs distincts suivis
+        """
+        self.window = window
+        self.max_entries = max_entries
+        self._windows: 'OrderedDict[bytes, _DedupWindow]' = OrderedDict()
+        self.suppressed_total = 0
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    @staticmethod
+    def key(log_entry: dict) -> bytes:
+        """Empreinte (niveau, message, utilisateur) d'un log."""
+        content = f"{log_entry.get('level')}\0{log_entry.get('message')}\0{log_entry.get('user', '')}"
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+
+    def _summary(self, window: _DedupWindow, now: float) -> dict:
+        """Log d'origine annoté du nombre d'occurrences de la fenêtre (premier envoi compris)."""
+        # Durée de la fenêtre elle-même, même si elle est résumée après sa fin
+        span = min(now, window.started + self.window) - window.started
+        minutes = max(1, math.ceil(span / 60))
+        return {**window.log_entry,
+                'repeat': f"×{window.suppressed + 1} dans les {minutes} dernières minutes"}
+
+    def check(self, log_entry: dict, now: Optional[float] = None) -> List[dict]:
+        """
+        Enregistre un log et retourne ceux à envoyer : lui-même s'il ouvre
+        une fenêtre (précédé du résumé de la fenêtre précédente si elle n'a
+        pas encore été résumée), rien s'il est un doublon, plus le résumé
+        d'un log évincé.
+        """
+        now = time.monotonic() if now is None else now
+        key = self.key(log_entry)
+        to_send = []
+
+        window = self._windows.get(key)
+        if window is not None and now - window.started < self.window:
+            window.suppressed += 1
+            self.suppressed_total += 1
+            self._windows.move_to_end(key)
+            return to_send
+
+        if window is not None and window.suppressed:
+            # Fenêtre terminée mais pas encore résumée : le résumé la clôt,
+            # le nouveau log ouvre la suivante
+            to_send.append(self._summary(window, now))
+        to_send.append(log_entry)
+        self._windows[key] = _DedupWindow(now, log_entry)
+        self._windows.move_to_end(key)
+
+        while len(self._windows) > self.max_entries:
+            _, evicted = self._windows.popitem(last=False)
+            if evicted.suppressed:
+                to_send.append(self._summary(evicted, now))
+        return to_send
+
+    def expire(self, now: Optional[float] = None) -> List[dict]:
+        """Termine les fenêtres écoulées et retourne les résumés à envoyer."""
+        now = time.monotonic() if now is None else now
+        summaries = []
+        for key, window in list(self._windows.items()):
+            if now - window.started >= self.window:
+                del self._windows[key]
+                if window.suppressed:
+                    summaries.append(self._summary(window, now))
+        return summaries
+
+    def clear(self):
+        self._windows.clear()
+
 
 class DiscordLogger:
     """Gestionnaire de logs Discord pour le bot."""
@@ -26,8 +148,17 @@ class DiscordLogger:
         self.bot = bot
         self._log_cache = []  # Cache pour les logs avant que le bot soit prêt
         self._bot_ready = False
-        self._sending_logs = False  # Flag pour éviter les boucles
-        self._sent_messages = set()  # Cache des messages déjà envoyés
+        self._sending_logs = False  # Un lot est en cours d'envoi
+        self._dedup = LogDeduplicator()  # Logs identiques regroupés par fenêtre
+
+        # File d'envoi vidée par une seule tâche (lots d'embeds, débit limité)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=Config.DISCORD_LOG_QUEUE_SIZE)
+        self._consumer: Optional[asyncio.Task] = None
+        self._sweeper: Optional[asyncio.Task] = None
+        self._next_send_at = 0.0  # Heure (loop.time) du prochain envoi autorisé
+        self._dropped = 0
+        self._messages_sent = 0
+        self._embeds_sent = 0
         
         # NOUVEAU : Gestion d'erreurs avancée
         self._error_count = 0  # Compteur d'erreurs pour éviter le spam
@@ -36,14 +167,39 @@ class DiscordLogger:
         self._cooldown_duration = 300  # 5 minutes de cooldown après trop d'erreurs
 
     def set_ready(self):
-        """Marque le bot comme prêt et vide le cache de logs."""
+        """Marque le bot comme prêt, lance la tâche d'envoi et vide le cache de logs."""
         self._bot_ready = True
+        self.start()
         if self._log_cache:
             logger.info(f"Envoi de {len(self._log_cache)} logs en cache...")
             for log_entry in self._log_cache:
                 self._send_log_async(log_entry)
             self._log_cache.clear()
 
+    @property
+    def running(self) -> bool:
+        return self._consumer is not None and not self._consumer.done()
+
+    def start(self):
+        """Lance les tâches d'envoi et de résumé des doublons si elles ne tournent pas déjà."""
+        if not self.running:
+            self._consumer = asyncio.create_task(self._run())
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_duplicates())
+
+    def stop(self):
+        """Interrompt les tâches (à l'arrêt du bot)."""
+        for task in (self._consumer, self._sweeper):
+            if task is not None and not task.done():
+                task.cancel()
+
+    async def _sweep_duplicates(self):
+        """Envoie régulièrement le résumé des fenêtres d'anti-doublons terminées."""
+        while True:
+            await asyncio.sleep(DEDUP_SWEEP_SECONDS)
+            for summary in self._dedup.expire():
+                self._enqueue(summary)
+
     def _is_in_cooldown(self) -> bool:
         """NOUVEAU : Vérifie si on est en période de cooldown après trop d'erreurs."""
         if self._error_count < self._max_errors:
@@ -143,6 +299,11 @@ class DiscordLogger:
                             value=f"```\n{error_text}\n```",
                             inline=False)
 
+        if 'repeat' in kwargs and kwargs['repeat']:
+            embed.add_field(name="🔁 Répétitions",
+                            value=str(kwargs['repeat'])[:100],
+                            inline=False)
+
         if 'traceback' in kwargs and kwargs['traceback']:
             tb_text = str(kwargs['traceback'])[:800]  # Limiter la taille
             embed.add_field(name="📚 Traceback",
@@ -152,78 +313,114 @@ class DiscordLogger:
         embed.set_footer(text=f"Bot Faerûn • {Config.ADMIN_ROLE_NAME}")
         return embed
 
-    def _create_message_hash(self, log_entry: dict) -> str:
-        """Crée un hash unique pour éviter les doublons."""
-        import hashlib
-        content = f"{log_entry.get('level')}-{log_entry.get('message')}-{log_entry.get('user', '')}"
-        return hashlib.md5(content.encode()).hexdigest()[:8]
-
     def _send_log_async(self, log_entry: dict):
-        """Envoie un log de manière asynchrone."""
-        if self.bot.loop and not self.bot.loop.is_closed() and not self._is_in_cooldown():
-            # Éviter les doublons avec un hash
-            message_hash = self._create_message_hash(log_entry)
-            if message_hash not in self._sent_messages:
-                self._sent_messages.add(message_hash)
-                # CORRECTION : Nettoyer le cache périodiquement (garder seulement les 50 derniers)
-                if len(self._sent_messages) > 50:
-                    old_messages = list(self._sent_messages)[:25]
-                    for old_hash in old_messages:
-                        self._sent_messages.discard(old_hash)
-
-                asyncio.create_task(self._send_log_to_discord(log_entry))
-
-    async def _send_log_to_discord(self, log_entry: dict):
-        """Envoie effectivement le log dans Discord."""
-        # CORRECTION : Vérifications multiples pour éviter les boucles
-        if not self._bot_ready or self._sending_logs or self._is_in_cooldown():
-            return
-
-        self._sending_logs = True  # Flag pour éviter les boucles
+        """Dépose un log dans la file d'envoi, sauf doublon récent."""
+        if not self._is_in_cooldown():
+            for entry in self._dedup.check(log_entry):
+                self._enqueue(entry)
 
+    def _enqueue(self, log_entry: dict):
+        """Dépose un log dans la file d'envoi (compté s'il n'y a plus de place)."""
         try:
-            # CORRECTION : Envoyer seulement dans le serveur principal ou configuré
-            target_guild = None
-
-            # Si Config.GUILD_ID est défini, utiliser ce serveur
-            if Config.GUILD_ID:
-                target_guild = self.bot.get_guild(Config.GUILD_ID)
-
-            # Sinon, prendre le premier serveur qui a un canal admin (limité à 3 max)
-            if not target_guild:
-                for guild in self.bot.guilds[:3]:  # CORRECTION : Limiter à 3 serveurs max
-                    admin_channel = self._get_admin_channel(guild)
-                    if admin_channel:
-                        target_guild = guild
-                        break
-
-            # Envoyer seulement dans le serveur cible
-            if target_guild:
-                admin_channel = self._get_admin_channel(target_guild)
+            self._queue.put_nowait(log_entry)
+        except asyncio.QueueFull:
+            self._dropped += 1
+
+    async def _run(self):
+        """
+        Vide la file : un message part quand il atteint 10 embeds (ou 6000
+        caractères) ou quand la fenêtre de regroupement est écoulée, puis
+        attend son créneau d'envoi.
+        """
+        loop = asyncio.get_running_loop()
+        carry: Optional[discord.Embed] = None  # Embed qui ne tenait plus dans le message précédent
+        while True:
+            if carry is None:
+                carry = self._create_log_embed(**await self._queue.get())
+            embeds, carry = [carry], None
+            size = len(embeds[0])
+            flush_at = loop.time() + Config.DISCORD_LOG_BATCH_WINDOW
+            while len(embeds) < MAX_EMBEDS_PER_MESSAGE:
+                remaining = flush_at - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    log_entry = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                embed = self._create_log_embed(**log_entry)
+                if size + len(embed) > MAX_EMBED_CHARS_PER_MESSAGE:
+                    carry = embed
+                    break
+                embeds.append(embed)
+                size += len(embed)
+
+            try:
+                await self._send_embeds(embeds)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Erreur critique dans l'envoi des logs Discord: {e}")
+                self._increment_error_count()
+
+    def _get_target_channel(self) -> Optional[discord.TextChannel]:
+        """Canal admin du serveur principal ou configuré."""
+        # CORRECTION : Envoyer seulement dans le serveur principal ou configuré
+        target_guild = None
+
+        # Si Config.GUILD_ID est défini, utiliser ce serveur
+        if Config.GUILD_ID:
+            target_guild = self.bot.get_guild(Config.GUILD_ID)
+
+        # Sinon, prendre le premier serveur qui a un canal admin (limité à 3 max)
+        if not target_guild:
+            for guild in self.bot.guilds[:3]:  # CORRECTION : Limiter à 3 serveurs max
+                admin_channel = self._get_admin_channel(guild)
                 if admin_channel:
-                    try:
-                        embed = self._create_log_embed(**log_entry)
-                        await admin_channel.send(embed=embed)
-                        # NOUVEAU : Reset du compteur d'erreurs si succès
-                        if self._error_count > 0:
-                            self._error_count = max(0, self._error_count - 1)
-                    except discord.Forbidden:
-                        logger.warning(
-                            f"Pas de permission pour envoyer dans {admin_channel.name}"
-                        )
-                        self._increment_error_count()
-                    except discord.HTTPException as e:
-                        logger.warning(f"Erreur HTTP envoi log: {e}")
-                        self._increment_error_count()
-                    except Exception as e:
-                        logger.error(f"Erreur inattendue envoi log: {e}")
-                        self._increment_error_count()
+                    target_guild = guild
+                    break
+
+        return self._get_admin_channel(target_guild) if target_guild else None
 
+    async def _send_embeds(self, embeds: List[discord.Embed]):
+        """Envoie un message d'embeds dans le canal admin, au rythme autorisé."""
+        if not self._bot_ready or self._is_in_cooldown():
+            return
+
+        admin_channel = self._get_target_channel()
+        if not admin_channel:
+            return
+
+        loop = asyncio.get_running_loop()
+        delay = self._next_send_at - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self._next_send_at = loop.time() + Config.DISCORD_LOG_MIN_INTERVAL
+
+        self._sending_logs = True
+        try:
+            await admin_channel.send(embeds=embeds)
+            self._messages_sent += 1
+            self._embeds_sent += len(embeds)
+            # NOUVEAU : Reset du compteur d'erreurs si succès
+            if self._error_count > 0:
+                self._error_count = max(0, self._error_count - 1)
+        except discord.Forbidden:
+            logger.warning(
+                f"Pas de permission pour envoyer dans {admin_channel.name}"
+            )
+            self._increment_error_count()
+        except discord.HTTPException as e:
+            logger.warning(f"Erreur HTTP envoi log: {e}")
+            self._increment_error_count()
+            # Limite de débit dépassée : attendre le délai indiqué par Discord
+            retry_after = getattr(e, 'retry_after', None)
+            if e.status == 429 and retry_after:
+                self._next_send_at = loop.time() + float(retry_after)
         except Exception as e:
-            logger.error(f"Erreur critique dans _send_log_to_discord: {e}")
+            logger.error(f"Erreur inattendue envoi log: {e}")
             self._increment_error_count()
         finally:
-            # CORRECTION CRITIQUE : Toujours libérer le flag, même en cas d'exception
             self._sending_logs = False
 
     def log(self, level: str, message: str, **kwargs):
@@ -231,8 +428,8 @@ class DiscordLogger:
         Envoie un log dans Discord.
         """
         # CORRECTION : Filtrer certains logs pour éviter le spam
-        if self._sending_logs or self._is_in_cooldown():
-            return  # Eviter les boucles et respecter le cooldown
+        if self._is_in_cooldown():
+            return  # Respecter le cooldown
 
         # NOUVEAU : Validation et nettoyage des paramètres
         safe_message = str(message) if message else "Message vide"
@@ -276,8 +473,8 @@ class DiscordLogger:
         """Log l'utilisation d'une commande - FILTRE pour éviter le spam."""
         # CORRECTION : Logger seulement les commandes importantes pour éviter le spam
         important_commands = [
-            'config-channels', 'test-logs', 'stats-logs', 'sync_bot', 
-            'reload_commands', 'debug_bot'
+            'config-channels', 'test-logs', 'stats-logs', 'stats-usage',
+            'search-logs', 'sync_bot', 'reload_commands', 'debug_bot'
         ]
 
         if command_name not in important_commands:
@@ -409,7 +606,14 @@ class DiscordLogger:
             'max_errors': self._max_errors,
             'in_cooldown': self._is_in_cooldown(),
             'cache_size': len(self._log_cache),
-            'sent_messages_cache': len(self._sent_messages),
+            'sent_messages_cache': len(self._dedup),
+            'suppressed': self._dedup.suppressed_total,
+            'queued': self._queue.qsize(),
+            'queue_capacity': self._queue.maxsize,
+            'dropped': self._dropped,
+            'messages_sent': self._messages_sent,
+            'embeds_sent': self._embeds_sent,
+            'running': self.running,
             'last_error': self._last_error_time.isoformat() if self._last_error_time else None
         }
 
@@ -421,8 +625,8 @@ class DiscordLogger:
 
     def clear_cache(self):
         """Nettoie le cache de messages pour libérer la mémoire."""
-        cache_size = len(self._sent_messages)
-        self._sent_messages.clear()
+        cache_size = len(self._dedup)
+        self._dedup.clear()
         self._log_cache.clear()
         logger.info(f"Cache de logs nettoyé ({cache_size} messages supprimés)")
 
@@ -4,23 +4,469 @@ Système de logs quotidiens pour le Bot Faerûn.
 Ce module génère des fichiers de logs quotidiens au format DDMMYYYY
 pour tracer l'utilisation des commandes et les événements du bot.
 
-VERSION CORRIGÉE - Résout les problèmes de nommage des fichiers.
+Chaque ligne est un objet JSON (timestamp, status, command, user_id,
+guild_id, channel_id, latency_ms, error) : les noms d'utilisateurs ou de
+salons ne peuvent plus casser le format.
+
+Les écritures ne se font jamais dans la boucle asyncio : les commandes
+déposent leurs lignes dans une file bornée, et un thread dédié les écrit
+par lots (une écriture disque et un flush par lot) dans le fichier du jour
+de chaque ligne. Si la file est pleine, la ligne est abandonnée et comptée.
+
+Le thread d'écriture tient aussi les compteurs du jour (par commande, par
+utilisateur, succès/échecs) et les enregistre régulièrement dans
+stats-DDMMYYYY.json avec la position atteinte dans le fichier de logs : au
+redémarrage, seules les lignes écrites après cette position sont relues.
+/stats-logs lit les compteurs en mémoire sans relire le fichier.
+
+Au changement de jour, les compteurs du jour écoulé (commandes, utilisateurs,
+classes d'erreurs, histogramme horaire) sont figés dans rollup-DDMMYYYY.json.
+/stats-usage additionne ces résumés sur une période sans rouvrir les logs.
+Le fichier du jour écoulé est ensuite compressé (utils/log_archive.py).
 """
 
+import json
 import logging
 import os
-from datetime import datetime, timezone
-from logging.handlers import TimedRotatingFileHandler
+import queue
+import re
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from logging.handlers import QueueHandler
 import discord
-from typing import Optional
+from typing import IO, Dict, List, Optional, Tuple
+
+from config import Config
+from utils.log_archive import LogArchiver, enforce_retention
+
+# Nombre maximum de lignes écrites par lot
+WRITE_BATCH_SIZE = 200
+
+# Attente maximum du thread d'écriture entre deux vérifications d'arrêt (secondes)
+WRITER_POLL_SECONDS = 0.5
+
+# Statuts comptés comme des commandes
+COMMAND_STATUSES = ('SUCCESS', 'ERROR', 'ADMIN')
+
+# Nom d'exception dans un message d'erreur ("... raised an exception: KeyError: ...")
+ERROR_CLASS_PATTERN = re.compile(r'\b([A-Z]\w*(?:Error|Exception|Forbidden|NotFound))\b')
+
+
+def _clean(text, max_length: int) -> str:
+    """Texte sur une ligne, tronqué."""
+    return str(text).replace('\n', ' ').replace('\r', '')[:max_length]
+
+
+def rollup_filename(logs_dir: str, day: str) -> str:
+    """Résumé figé d'un jour écoulé (DDMMYYYY)."""
+    return os.path.join(logs_dir, f"rollup-{day}.json")
+
+
+def error_class(error: Optional[str]) -> str:
+    """Classe d'une erreur (nom de l'exception quand le message le contient)."""
+    if not error:
+        return 'Inconnue'
+    match = ERROR_CLASS_PATTERN.search(error)
+    return match.group(1) if match else 'Autre'
+
+
+def _local_hour(timestamp: Optional[str]) -> Optional[int]:
+    """Heure locale (0-23) d'un timestamp ISO du log."""
+    try:
+        return datetime.fromisoformat(timestamp).astimezone().hour
+    except (TypeError, ValueError):
+        return None
+
+
+def _latency_ms(interaction: discord.Interaction) -> Optional[int]:
+    """Délai entre la création de l'interaction et maintenant (ms)."""
+    created_at = getattr(interaction, 'created_at', None)
+    if created_at is None:
+        return None
+    return max(0, round((datetime.now(timezone.utc) - created_at).total_seconds() * 1000))
+
+
+class CommandStats:
+    """Compteurs d'une journée, tenus à jour à chaque ligne écrite."""
+
+    def __init__(self, day: str):
+        """
+        Args:
+            day: Jour compté (DDMMYYYY)
+        """
+        self.day = day
+        self.offset = 0  # Octets du fichier du jour déjà comptés
+        self.statuses = Counter()  # SUCCESS / ERROR / ADMIN
+        self.commands = Counter()  # Commande (ou ADMIN_action) -> utilisations
+        self.failures = Counter()  # Commande -> échecs
+        self.users = Counter()  # Identifiant utilisateur -> utilisations
+        self.error_classes = Counter()  # Classe d'erreur -> échecs
+        self.hours = Counter()  # Heure locale ("0" à "23") -> utilisations
+        self.latency_total = 0  # Somme des latences mesurées (ms)
+        self.latency_count = 0
+
+    def add(self, event: dict):
+        """Compte une ligne du log (les lignes hors commandes sont ignorées)."""
+        status = event.get('status')
+        if status not in COMMAND_STATUSES:
+            return
+
+        self.statuses[status] += 1
+        command = event.get('command') or '?'
+        if status == 'ADMIN':
+            command = f"ADMIN_{command}"
+        self.commands[command] += 1
+        if status == 'ERROR':
+            self.failures[command] += 1
+            self.error_classes[error_class(event.get('error'))] += 1
+
+        hour = _local_hour(event.get('timestamp'))
+        if hour is not None:
+            self.hours[str(hour)] += 1
+
+        # Les actions système (utilisateur 0) ne comptent pas comme utilisateur
+        if event.get('user_id'):
+            self.users[str(event['user_id'])] += 1
+
+        latency = event.get('latency_ms')
+        if latency is not None:
+            self.latency_total += latency
+            self.latency_count += 1
+
+    def merge(self, other: 'CommandStats'):
+        """Ajoute les compteurs d'un autre jour (agrégation d'une période)."""
+        self.statuses.update(other.statuses)
+        self.commands.update(other.commands)
+        self.failures.update(other.failures)
+        self.users.update(other.users)
+        self.error_classes.update(other.error_classes)
+        self.hours.update(other.hours)
+        self.latency_total += other.latency_total
+        self.latency_count += other.latency_count
+
+    def copy(self) -> 'CommandStats':
+        return CommandStats.from_dict(self.to_dict())
+
+    def summary(self) -> dict:
+        """Statistiques au format attendu par /stats-logs."""
+        return {
+            'total_commands': sum(self.statuses.values()),
+            'successful_commands': self.statuses['SUCCESS'],
+            'failed_commands': self.statuses['ERROR'],
+            'admin_actions': self.statuses['ADMIN'],
+            'unique_users': len(self.users),
+            'most_used_commands': dict(self.commands),
+            'failures_by_command': dict(self.failures),
+            'error_classes': dict(self.error_classes),
+            'top_users': dict(self.users.most_common(10)),
+            'hourly': [self.hours[str(hour)] for hour in range(24)],
+            'average_latency_ms': (self.latency_total / self.latency_count
+                                   if self.latency_count else None)
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            'day': self.day,
+            'offset': self.offset,
+            'statuses': self.statuses,
+            'commands': self.commands,
+            'failures': self.failures,
+            'users': self.users,
+            'error_classes': self.error_classes,
+            'hours': self.hours,
+            'latency_total': self.latency_total,
+            'latency_count': self.latency_count
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CommandStats':
+        stats = cls(data['day'])
+        stats.offset = data.get('offset', 0)
+        stats.statuses.update(data.get('statuses', {}))
+        stats.commands.update(data.get('commands', {}))
+        stats.failures.update(data.get('failures', {}))
+        stats.users.update(data.get('users', {}))
+        stats.error_classes.update(data.get('error_classes', {}))
+        stats.hours.update(data.get('hours', {}))
+        stats.latency_total = data.get('latency_total', 0)
+        stats.latency_count = data.get('latency_count', 0)
+        return stats
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Dépose les lignes dans la file sans jamais attendre ; compte les abandons."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.writer: Optional['LogWriterThread'] = None
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # L'événement JSON est formaté par le thread d'écriture
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogWriterThread(threading.Thread):
+    """Thread qui vide la file par lots dans le fichier du jour et tient les compteurs."""
+
+    def __init__(self, log_queue: queue.Queue, logs_dir: str,
+                 persist_interval: float = Config.LOG_STATS_PERSIST_INTERVAL,
+                 archiver: Optional[LogArchiver] = None):
+        """
+        Args:
+            log_queue: File remplie par BoundedQueueHandler
+            logs_dir: Répertoire des fichiers logs-DDMMYYYY.log et stats-DDMMYYYY.json
+            persist_interval: Délai minimum entre deux enregistrements des compteurs (secondes)
+            archiver: Thread qui compresse les jours terminés, une fois résumés
+        """
+        super().__init__(name="daily-log-writer", daemon=True)
+        self.queue = log_queue
+        self.logs_dir = logs_dir
+        self.archiver = archiver
+        self.persist_interval = persist_interval
+        self.written = 0
+        self.batches = 0
+        self.lock = threading.Lock()
+        self.stats = self._load_stats(datetime.now().strftime('%d%m%Y'))
+        self._stream: Optional[IO[bytes]] = None
+        self._day = datetime.strptime(self.stats.day, '%d%m%Y').date()  # Jour du fichier courant
+        self._dirty = False
+        self._persisted_at = time.monotonic()
+        self._stopping = threading.Event()
+
+    def log_path(self, day: str) -> str:
+        return os.path.join(self.logs_dir, f"logs-{day}.log")
+
+    def stats_path(self, day: str) -> str:
+        return os.path.join(self.logs_dir, f"stats-{day}.json")
+
+    def _write_json(self, path: str, data: dict):
+        """Écriture atomique d'un fichier JSON (fichier temporaire puis remplacement)."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _load_stats(self, day: str) -> CommandStats:
+        """
+        Compteurs d'un jour : dernier enregistrement, puis lignes écrites
+        depuis (les lignes qui ne sont pas du JSON sont ignorées).
+        """
+        stats = CommandStats(day)
+        try:
+            with open(self.stats_path(day), 'r', encoding='utf-8') as f:
+                stats = CommandStats.from_dict(json.load(f))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️ Compteurs de logs illisibles ({day}), recomptage : {e}")
+            stats = CommandStats(day)
+
+        try:
+            with open(self.log_path(day), 'rb') as f:
+                if stats.offset > os.fstat(f.fileno()).st_size:
+                    stats = CommandStats(day)  # Fichier remplacé : tout recompter
+                f.seek(stats.offset)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # Ligne interrompue par un arrêt brutal
+                    stats.offset += len(line)
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(event, dict):
+                        stats.add(event)
+        except FileNotFoundError:
+            pass
+        return stats
+
+    def _persist(self):
+        """Enregistre les compteurs du jour (écriture atomique)."""
+        with self.lock:
+            data = self.stats.to_dict()
+        try:
+            self._write_json(self.stats_path(data['day']), data)
+            self._dirty = False
+        except OSError as e:
+            print(f"⚠️ Erreur enregistrement des compteurs de logs : {e}")
+        self._persisted_at = time.monotonic()
+
+    def _write_rollup(self, stats: CommandStats):
+        """
+        Fige les compteurs d'un jour écoulé dans son résumé, qui remplace
+        le fichier de compteurs de ce jour.
+        """
+        data = stats.to_dict()
+        del data['offset']
+        try:
+            self._write_json(rollup_filename(self.logs_dir, stats.day), data)
+            if os.path.exists(self.stats_path(stats.day)):
+                os.remove(self.stats_path(stats.day))
+        except OSError as e:
+            print(f"⚠️ Erreur écriture du résumé {stats.day} : {e}")
+
+    def _rollup_missing(self):
+        """
+        Résume les jours écoulés sans résumé (bot arrêté à minuit) : seul
+        leur fichier de logs est relu, une fois.
+        """
+        today = datetime.now().date()
+        days = set()
+        for filename in os.listdir(self.logs_dir):
+            match = re.fullmatch(r'(?:logs|stats)-(\d{8})\.(?:log|json)', filename)
+            if match:
+                days.add(match.group(1))
+
+        for day in sorted(days):
+            try:
+                if datetime.strptime(day, '%d%m%Y').date() >= today:
+                    continue
+            except ValueError:
+                continue
+            if not os.path.exists(rollup_filename(self.logs_dir, day)):
+                self._write_rollup(self._load_stats(day))
+
+    def _switch_day(self, day: date):
+        """Passe au fichier d'un autre jour (minuit) et résume le jour quitté."""
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+        day = day.strftime('%d%m%Y')
+        if self.stats.day != day:
+            self._write_rollup(self.stats)
+            self._dirty = False
+            if self.archiver is not None:
+                self.archiver.submit(self.stats.day)
+
+        stats = self.stats if self.stats.day == day else self._load_stats(day)
+        self._stream = open(self.log_path(day), 'ab')
+
+        # Terminer une ligne interrompue pour que les suivantes restent lisibles
+        size = self._stream.tell()
+        if size != stats.offset:
+            self._stream.write(b'\n')
+            stats.offset = size + 1
+
+        with self.lock:
+            self.stats = stats
+
+    def run(self):
+        try:
+            self._rollup_missing()
+            # Compression seulement après les résumés, qui relisent les logs
+            if self.archiver is not None:
+                self.archiver.submit_finished_days()
+        except OSError as e:
+            print(f"⚠️ Erreur lors du résumé des jours précédents : {e}")
+
+        while not (self._stopping.is_set() and self.queue.empty()):
+            try:
+                record = self.queue.get(timeout=WRITER_POLL_SECONDS)
+            except queue.Empty:
+                record = None
+
+            if record is not None:
+                batch = [record]
+                while len(batch) < WRITE_BATCH_SIZE:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                self._write(batch)
+
+            # Minuit passé sans nouvelle ligne : résumer la veille sans attendre
+            today = datetime.now().date()
+            if today > self._day:
+                self._switch_day(today)
+                self._day = today
+
+            if self._dirty and time.monotonic() - self._persisted_at >= self.persist_interval:
+                self._persist()
+
+        if self._dirty:
+            self._persist()
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    @staticmethod
+    def _event(record: logging.LogRecord) -> dict:
+        """Événement JSON d'une ligne (les lignes sans événement gardent leur message)."""
+        event = getattr(record, 'event', None)
+        if event is None:
+            event = {
+                'timestamp': datetime.fromtimestamp(record.created, timezone.utc)
+                .isoformat(timespec='milliseconds'),
+                'status': record.levelname,
+                'message': record.getMessage()
+            }
+        return event
+
+    def _write(self, batch: List[logging.LogRecord]):
+        """Écrit un lot dans le fichier du jour de chaque ligne, puis flush une seule fois."""
+        for record in batch:
+            try:
+                # Une ligne datée d'avant minuit écrite après reste dans le nouveau fichier
+                day = datetime.fromtimestamp(record.created).date()
+                if self._stream is None or day > self._day:
+                    # Le fichier courant peut être celui d'un jour plus récent
+                    day = max(day, self._day)
+                    self._switch_day(day)
+                    self._day = day
+
+                event = self._event(record)
+                line = (json.dumps(event, ensure_ascii=False) + '\n').encode('utf-8')
+                self._stream.write(line)
+                with self.lock:
+                    self.stats.add(event)
+                    self.stats.offset += len(line)
+                self._dirty = True
+            except Exception as e:
+                print(f"⚠️ Erreur écriture log : {e}")
+
+        if self._stream is not None:
+            try:
+                self._stream.flush()
+            except OSError as e:
+                print(f"⚠️ Erreur écriture log : {e}")
+        self.written += len(batch)
+        self.batches += 1
+
+    def get_stats(self) -> dict:
+        """Statistiques du jour en cours, lues en mémoire."""
+        return self.snapshot().summary()
+
+    def snapshot(self) -> CommandStats:
+        """Copie des compteurs du jour en cours."""
+        today = datetime.now().strftime('%d%m%Y')
+        with self.lock:
+            return self.stats.copy() if self.stats.day == today else CommandStats(today)
+
+    def stop(self, timeout: float = 5.0):
+        """Écrit les lignes restantes, enregistre les compteurs puis arrête le thread."""
+        self._stopping.set()
+        self.join(timeout)
 
 
 class DailyFileLogger:
-    """Gestionnaire de logs quotidiens avec rotation automatique."""
+    """Gestionnaire de logs quotidiens (un fichier JSON lines par jour)."""
     
     def __init__(self, logs_dir: str = "/app/logs"):
         self.logs_dir = logs_dir
         self.command_logger = None
+        self.queue_handler: Optional[BoundedQueueHandler] = None
+        self.archiver: Optional[LogArchiver] = None
+        self._rollups: Dict[str, Tuple[float, CommandStats]] = {}  # jour -> (mtime, résumé)
         self._setup_logs_directory()
         self._setup_loggers()
     
@@ -45,63 +491,38 @@ class DailyFileLogger:
         return os.path.join(self.logs_dir, f"logs-{today}.log")
     
     def _setup_loggers(self):
-        """Configure les loggers avec rotation quotidienne."""
+        """Configure le logger des commandes et son thread d'écriture."""
         
         # LOGGER COMMANDES
         self.command_logger = logging.getLogger('faerun_commands')
         self.command_logger.setLevel(logging.INFO)
         
         # Éviter la duplication si déjà configuré
-        if not self.command_logger.handlers:
-            # CORRECTION : Utiliser directement le nom de fichier cohérent
-            today_filename = self._get_today_filename()
-            
-            # Handler avec rotation quotidienne
-            command_handler = TimedRotatingFileHandler(
-                filename=today_filename,
-                when='midnight',
-                interval=1,
-                backupCount=30,  # Garder 30 jours
-                encoding='utf-8'
-            )
-            
-            # Format pour les commandes
-            command_formatter = logging.Formatter(
-                '%(asctime)s | %(levelname)s | %(message)s',
-                datefmt='%d/%m/%Y %H:%M:%S'
-            )
-            command_handler.setFormatter(command_formatter)
-            
-            # CORRECTION : Fonction de nommage cohérente
-            command_handler.namer = self._get_rotated_filename
-            
-            self.command_logger.addHandler(command_handler)
-            print(f"✓ Logger configuré avec fichier : {today_filename}")
-    
-    def _get_rotated_filename(self, default_name: str) -> str:
-        """
-        Génère le nom de fichier au format logs-DDMMYYYY.log
-        CORRECTION : Gestion cohérente de la rotation
-        """
-        try:
-            # Extraire la date du nom par défaut
-            # Format TimedRotatingFileHandler : /path/logs-DDMMYYYY.log.2024-01-15
-            if '.log.' in default_name:
-                # Séparer le chemin et la date
-                base_path, date_suffix = default_name.rsplit('.log.', 1)
-                
-                # Parser la date (format ISO : YYYY-MM-DD)
-                date_obj = datetime.strptime(date_suffix, '%Y-%m-%d')
-                formatted_date = date_obj.strftime('%d%m%Y')
-                
-                # Reconstruire le nom : logs-DDMMYYYY.log
-                directory = os.path.dirname(base_path)
-                return os.path.join(directory, f"logs-{formatted_date}.log")
-        except (ValueError, IndexError) as e:
-            print(f"⚠️ Erreur parsing nom fichier log : {e}")
-        
-        # Fallback : garder le nom par défaut
-        return default_name
+        for handler in self.command_logger.handlers:
+            if isinstance(handler, BoundedQueueHandler):
+                self.queue_handler = handler
+                self.archiver = handler.writer.archiver if handler.writer else None
+                return
+
+        # Le thread d'écriture ouvre le fichier du jour de chaque ligne : pas
+        # de renommage à minuit, chaque jour a son fichier dès le départ
+        self.archiver = LogArchiver(self.logs_dir)
+        self.archiver.start()
+
+        log_queue = queue.Queue(maxsize=Config.LOG_QUEUE_SIZE)
+        self.queue_handler = BoundedQueueHandler(log_queue)
+        self.queue_handler.writer = LogWriterThread(log_queue, self.logs_dir,
+                                                    archiver=self.archiver)
+        self.queue_handler.writer.start()
+
+        self.command_logger.addHandler(self.queue_handler)
+        print(f"✓ Logger configuré avec fichier : {self._get_today_filename()}")
+
+    def _log_event(self, level: int, message: str, event: dict):
+        """Dépose un événement dans la file (le message reste lisible par les autres handlers)."""
+        event = {'timestamp': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+                 **event}
+        self.command_logger.log(level, message, extra={'event': event})
     
     def log_command_usage(self, 
                          interaction: discord.Interaction, 
@@ -112,43 +533,21 @@ class DailyFileLogger:
         Log l'utilisation d'une commande.
         """
         try:
-            # Informations utilisateur
-            user_info = f"{interaction.user.display_name} ({interaction.user.id})"
-            
-            # Informations serveur
-            if interaction.guild:
-                guild_info = f"{interaction.guild.name} ({interaction.guild.id})"
-            else:
-                guild_info = "DM"
-            
-            # Informations canal
-            if hasattr(interaction.channel, 'name'):
-                channel_info = f"#{interaction.channel.name}"
-            else:
-                channel_info = str(interaction.channel)
-            
-            # Statut
             status = "SUCCESS" if success else "ERROR"
-            
-            # Message de log principal
-            log_message = (
-                f"{status} | /{command_name} | "
-                f"User: {user_info} | "
-                f"Guild: {guild_info} | "
-                f"Channel: {channel_info}"
-            )
-            
-            # Ajouter l'erreur si présente
-            if error_msg:
-                # Nettoyer le message d'erreur pour éviter les injections
-                clean_error = str(error_msg).replace('\n', ' ').replace('\r', '')[:200]
-                log_message += f" | Error: {clean_error}"
+            event = {
+                'status': status,
+                'command': command_name,
+                'user_id': interaction.user.id,
+                'user_name': interaction.user.display_name,
+                'guild_id': interaction.guild.id if interaction.guild else None,
+                'channel_id': getattr(interaction.channel, 'id', None),
+                'latency_ms': _latency_ms(interaction),
+                'error': _clean(error_msg, 200) if error_msg else None
+            }
             
             # Logger selon le niveau
-            if success:
-                self.command_logger.info(log_message)
-            else:
-                self.command_logger.error(log_message)
+            self._log_event(logging.INFO if success else logging.ERROR,
+                            f"{status} /{command_name}", event)
                 
         except Exception as e:
             # Ne pas faire échouer le bot si le logging échoue
@@ -162,19 +561,21 @@ class DailyFileLogger:
         Log une action d'administration.
         """
         try:
-            admin_message = (
-                f"ADMIN | {action} | "
-                f"User: {user.display_name} ({user.id}) | "
-                f"Guild: {user.guild.name} ({user.guild.id})"
-            )
-            
+            event = {
+                'status': 'ADMIN',
+                'command': action,
+                'user_id': user.id,
+                'user_name': user.display_name,
+                'guild_id': user.guild.id,
+                'channel_id': None,
+                'latency_ms': None,
+                'error': None
+            }
             if details:
-                # Nettoyer les détails
-                clean_details = str(details).replace('\n', ' ').replace('\r', '')[:300]
-                admin_message += f" | Details: {clean_details}"
+                event['details'] = _clean(details, 300)
             
             # Les actions admin sont loggées en WARNING pour les distinguer
-            self.command_logger.warning(admin_message)
+            self._log_event(logging.WARNING, f"ADMIN {action}", event)
             
         except Exception as e:
             print(f"Erreur lors du logging d'action admin : {e}")
@@ -182,67 +583,70 @@ class DailyFileLogger:
     def get_today_stats(self) -> dict:
         """
         Retourne les statistiques du jour actuel.
-        CORRECTION : Parsing adapté au nouveau format avec INFO/WARNING/ERROR + SUCCESS/ADMIN
+
+        Lues dans les compteurs du thread d'écriture, sans relire le fichier
+        (les lignes encore dans la file ne sont pas comptées).
         """
-        today_file = self._get_today_filename()
-        
-        stats = {
-            'total_commands': 0,
-            'successful_commands': 0,
-            'failed_commands': 0,
-            'admin_actions': 0,
-            'unique_users': set(),
-            'most_used_commands': {}
-        }
-        
+        writer = self.queue_handler.writer if self.queue_handler else None
+        if writer is None:
+            return CommandStats(datetime.now().strftime('%d%m%Y')).summary()
+        return writer.get_stats()
+
+    def _load_rollup(self, day: str) -> Optional[CommandStats]:
+        """Résumé d'un jour écoulé (gardé en mémoire tant que le fichier ne change pas)."""
+        path = rollup_filename(self.logs_dir, day)
         try:
-            if os.path.exists(today_file):
-                with open(today_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        if '|' in line and len(line.strip()) > 0:
-                            parts = line.split('|')
-                            if len(parts) >= 4:  # CORRECTION : Au moins 4 parties maintenant
-                                # NOUVEAU FORMAT: DATE | LEVEL | STATUS | COMMAND | ...
-                                level = parts[1].strip()      # INFO, WARNING, ERROR
-                                status = parts[2].strip()     # SUCCESS, ADMIN, ERROR
-                                command_part = parts[3].strip()  # /command ou action
-                                
-                                # Compter seulement les vraies commandes (pas les logs système)
-                                if status in ['SUCCESS', 'ERROR', 'ADMIN']:
-                                    stats['total_commands'] += 1
-                                    
-                                    if status == 'SUCCESS':
-                                        stats['successful_commands'] += 1
-                                    elif status == 'ERROR':
-                                        stats['failed_commands'] += 1
-                                    elif status == 'ADMIN':
-                                        stats['admin_actions'] += 1
-                                    
-                                    # Extraire nom de commande
-                                    if command_part.startswith('/'):
-                                        cmd_name = command_part.split()[0][1:]  # Enlever le /
-                                        stats['most_used_commands'][cmd_name] = stats['most_used_commands'].get(cmd_name, 0) + 1
-                                    elif status == 'ADMIN':
-                                        # Pour les actions admin, utiliser le nom de l'action
-                                        action_name = command_part.strip()
-                                        stats['most_used_commands'][f"ADMIN_{action_name}"] = stats['most_used_commands'].get(f"ADMIN_{action_name}", 0) + 1
-                                    
-                                    # Extraire utilisateur (plus robuste)
-                                    if 'User:' in line:
-                                        try:
-                                            user_part = line.split('User:')[1].split('|')[0].strip()
-                                            if user_part and user_part != "SYSTEM (0)":  # Exclure les logs système
-                                                stats['unique_users'].add(user_part)
-                                        except (IndexError, AttributeError):
-                                            pass
-        
-        except Exception as e:
-            print(f"⚠️ Erreur lecture stats du fichier {today_file} : {e}")
-        
-        # Convertir set en nombre
-        stats['unique_users'] = len(stats['unique_users'])
-        
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+
+        cached = self._rollups.get(day)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                stats = CommandStats.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Résumé de logs illisible ({day}) : {e}")
+            return None
+        self._rollups[day] = (mtime, stats)
         return stats
+
+    def get_range_stats(self, start: date, end: date) -> dict:
+        """
+        Statistiques cumulées du `start` au `end` inclus, additionnées depuis
+        les résumés quotidiens (compteurs en mémoire pour aujourd'hui) :
+        aucun fichier de logs n'est relu.
+
+        Returns:
+            dict: Même clés que get_today_stats, plus 'start', 'end',
+            'daily_totals' ({date: commandes}) et 'days_with_data'
+        """
+        writer = self.queue_handler.writer if self.queue_handler else None
+        today = datetime.now().date()
+        total = CommandStats(f"{start:%d%m%Y}-{end:%d%m%Y}")
+        daily_totals: Dict[date, int] = {}
+
+        day = start
+        while day <= min(end, today):
+            if day == today:
+                stats = writer.snapshot() if writer else None
+            else:
+                stats = self._load_rollup(day.strftime('%d%m%Y'))
+            if stats is not None:
+                total.merge(stats)
+                daily_totals[day] = sum(stats.statuses.values())
+            day += timedelta(days=1)
+
+        summary = total.summary()
+        summary.update({
+            'start': start,
+            'end': end,
+            'daily_totals': daily_totals,
+            'days_with_data': len(daily_totals)
+        })
+        return summary
     
     def get_file_info(self) -> dict:
         """
@@ -282,38 +686,34 @@ class DailyFileLogger:
                 'path': today_file
             }
 
-    def cleanup_old_logs(self, days_to_keep: int = 30):
+    def get_queue_status(self) -> dict:
+        """Retourne l'état de la file d'écriture des logs."""
+        handler = self.queue_handler
+        writer = handler.writer if handler else None
+        return {
+            'queued': handler.queue.qsize() if handler else 0,
+            'capacity': handler.queue.maxsize if handler else 0,
+            'dropped': handler.dropped if handler else 0,
+            'written': writer.written if writer else 0,
+            'batches': writer.batches if writer else 0,
+            'writer_alive': bool(writer and writer.is_alive())
+        }
+
+    def close(self):
+        """Écrit les lignes en attente, enregistre les compteurs et arrête les threads."""
+        handler = self.queue_handler
+        if handler and handler.writer:
+            handler.writer.stop()
+        if self.archiver:
+            self.archiver.stop()
+
+    def cleanup_old_logs(self, days_to_keep: int = Config.LOG_RETENTION_DAYS):
         """
-        Nettoie les anciens fichiers de logs.
-        CORRECTION : Pattern de recherche cohérent
+        Nettoie les anciens fichiers de logs (appliqué automatiquement par
+        l'archiveur après chaque compression).
         """
         try:
-            import glob
-            from datetime import timedelta
-            
-            cutoff_date = datetime.now() - timedelta(days=days_to_keep)
-            
-            # CORRECTION : Pattern cohérent avec le nommage
-            pattern = os.path.join(self.logs_dir, "logs-????????.log")
-            old_files = glob.glob(pattern)
-            
-            deleted_count = 0
-            for file_path in old_files:
-                try:
-                    # Extraire la date du nom de fichier
-                    filename = os.path.basename(file_path)
-                    if filename.startswith('logs-') and filename.endswith('.log'):
-                        date_part = filename[5:-4]  # Enlever "logs-" et ".log"
-                        if len(date_part) == 8 and date_part.isdigit():
-                            file_date = datetime.strptime(date_part, '%d%m%Y')
-                            
-                            if file_date < cutoff_date:
-                                os.remove(file_path)
-                                deleted_count += 1
-                                print(f"✓ Supprimé: {filename}")
-                        
-                except (ValueError, IndexError):
-                    continue
+            deleted_count = enforce_retention(self.logs_dir, days_to_keep)
             
             if deleted_count > 0:
                 print(f"✓ Nettoyage terminé: {deleted_count} anciens fichiers supprimés")
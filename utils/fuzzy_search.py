@@ -0,0 +1,250 @@
+"""
+Recherche floue pondérée sur des lignes de texte (noms, type, source...).
+
+Chaque ligne est une suite de champs ; chaque champ a un poids. Les champs
+sont nettoyés une fois, et leurs mots et trigrammes (sans accents) pointent
+vers les lignes qui les contiennent. Une recherche ne score que les lignes
+qui partagent le plus de trigrammes avec le terme cherché.
+
+Le module ne dépend que de la bibliothèque standard et de
+utils.prefix_index : il est importé tel quel par les processus de
+utils/scoring_pool.py.
+"""
+
+import heapq
+from bisect import insort
+import re
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, List, Sequence, Tuple
+
+from utils.prefix_index import fold_accents
+
+# Nombre de candidats recevant le score complet
+CANDIDATE_LIMIT = 100
+
+# Bonus de présélection pour un mot du terme présent tel quel dans la ligne
+TOKEN_MATCH_BONUS = 3
+
+_PUNCTUATION = re.compile(r'[^\w\s]')
+
+
+def clean_text(text: str) -> str:
+    """Minuscules, sans ponctuation (même nettoyage que le score de similarité)."""
+    return _PUNCTUATION.sub('', text.lower()).strip()
+
+
+def trigrams(text: str) -> set:
+    """Trigrammes d'un texte (chaîne entière, espaces compris)."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def similarity(search_clean: str, search_words: List[str],
+               text_clean: str, text_words: List[str]) -> float:
+    """
+    Calcule la similarité entre le terme de recherche et un texte, tous deux
+    déjà nettoyés.
+
+    Returns:
+        float: Score de similarité (0.0 à 1.0)
+    """
+    if not search_clean or not text_clean:
+        return 0.0
+
+    # Correspondance exacte (score maximum)
+    if search_clean == text_clean:
+        return 1.0
+
+    # Correspondance de début de mot
+    if text_clean.startswith(search_clean):
+        return 0.9
+
+    # Correspondance contenue
+    if search_clean in text_clean:
+        return 0.8
+
+    # Similarité de séquence (fuzzy matching)
+    seq_similarity = SequenceMatcher(None, search_clean, text_clean).ratio()
+
+    # Bonus si les mots correspondent partiellement
+    word_matches = 0
+    for search_word in search_words:
+        for text_word in text_words:
+            if search_word in text_word or text_word in search_word:
+                word_matches += 1
+                break
+
+    if search_words:
+        word_score = word_matches / len(search_words) * 0.3
+        seq_similarity += word_score
+
+    return min(seq_similarity, 1.0)
+
+
+class FuzzyIndex:
+    """Index mots + trigrammes de lignes de texte à champs pondérés."""
+
+    def __init__(self, rows: Sequence[Sequence[str]], weights: Sequence[float]):
+        """
+        Args:
+            rows: Lignes, chacune une suite de champs (dans l'ordre des poids)
+            weights: Poids de chaque champ
+        """
+        self.weights = tuple(weights)
+        # Par ligne : [(texte nettoyé, mots, poids)] des champs non vides
+        self.fields: List[List[Tuple[str, List[str], float]]] = []
+        # Par ligne : champs sans accents (présélection des textes courts)
+        self.folded: List[List[str]] = []
+        # Par ligne : longueur du champ le plus court (départage des candidats)
+        self.lengths: List[int] = []
+        self.trigram_postings: Dict[str, List[int]] = {}
+        self.token_postings: Dict[str, List[int]] = {}
+
+        for row_id, row in enumerate(rows):
+            fields, folded_fields = self._encode(row)
+            self.fields.append(fields)
+            self.folded.append(folded_fields)
+            self.lengths.append(min((len(text) for text in folded_fields), default=0))
+            self._add_postings(row_id, folded_fields)
+
+    def _encode(self, row: Sequence[str]) -> Tuple[list, List[str]]:
+        """Champs nettoyés (texte, mots, poids) et champs sans accents d'une ligne."""
+        fields = []
+        folded_fields = []
+        for text, weight in zip(row, self.weights):
+            text_clean = clean_text(text or '')
+            if not text_clean:
+                continue
+            fields.append((text_clean, text_clean.split(), weight))
+            folded_fields.append(fold_accents(text_clean))
+        return fields, folded_fields
+
+    @staticmethod
+    def _terms(folded_fields: List[str]) -> Tuple[set, set]:
+        """Trigrammes et mots (sans accents) d'une ligne."""
+        row_trigrams = set()
+        row_tokens = set()
+        for folded in folded_fields:
+            row_trigrams.update(trigrams(folded))
+            row_tokens.update(folded.split())
+        return row_trigrams, row_tokens
+
+    def _add_postings(self, row_id: int, folded_fields: List[str]):
+        """Ajoute une ligne aux listes d'index (gardées triées par ligne)."""
+        row_trigrams, row_tokens = self._terms(folded_fields)
+        for postings, terms in ((self.trigram_postings, row_trigrams),
+                                (self.token_postings, row_tokens)):
+            for term in terms:
+                row_ids = postings.setdefault(term, [])
+                if row_ids and row_ids[-1] > row_id:
+                    insort(row_ids, row_id)
+                else:
+                    row_ids.append(row_id)
+
+    def _remove_postings(self, row_id: int, folded_fields: List[str]):
+        row_trigrams, row_tokens = self._terms(folded_fields)
+        for postings, terms in ((self.trigram_postings, row_trigrams),
+                                (self.token_postings, row_tokens)):
+            for term in terms:
+                row_ids = postings[term]
+                row_ids.remove(row_id)
+                if not row_ids:
+                    del postings[term]
+
+    def update(self, changes: Dict[int, Sequence[str]]):
+        """
+        Remplace des lignes sur place (même nombre de lignes) : seules les
+        lignes modifiées sont réencodées et leurs entrées d'index déplacées.
+
+        Args:
+            changes: {ligne: nouveaux champs}
+        """
+        for row_id, row in changes.items():
+            self._remove_postings(row_id, self.folded[row_id])
+            fields, folded_fields = self._encode(row)
+            self.fields[row_id] = fields
+            self.folded[row_id] = folded_fields
+            self.lengths[row_id] = min((len(text) for text in folded_fields), default=0)
+            self._add_postings(row_id, folded_fields)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def candidates(self, search_clean: str) -> List[int]:
+        """Lignes à scorer : celles qui partagent le plus de trigrammes/mots avec le terme."""
+        folded = fold_accents(search_clean)
+
+        if len(folded) < 3:
+            # Terme trop court pour des trigrammes : recherche de sous-chaîne
+            return [row_id for row_id, fields in enumerate(self.folded)
+                    if any(folded in text for text in fields)][:CANDIDATE_LIMIT]
+
+        counts = Counter()
+        for gram in trigrams(folded):
+            postings = self.trigram_postings.get(gram)
+            if postings:
+                counts.update(postings)
+        for token in folded.split():
+            postings = self.token_postings.get(token)
+            if postings:
+                for row_id in postings:
+                    counts[row_id] += TOKEN_MATCH_BONUS
+
+        # À égalité, les textes courts d'abord (favorisés par le score de séquence)
+        best = heapq.nsmallest(CANDIDATE_LIMIT, counts.items(),
+                               key=lambda entry: (-entry[1], self.lengths[entry[0]]))
+
+        # Ordre des lignes conservé pour départager les scores égaux
+        return sorted(row_id for row_id, _ in best)
+
+    def score(self, row_id: int, search_clean: str, search_words: List[str]) -> float:
+        """Meilleur score pondéré d'une ligne pour un terme déjà nettoyé."""
+        best_score = 0.0
+        for text_clean, text_words, weight in self.fields[row_id]:
+            score = similarity(search_clean, search_words, text_clean, text_words)
+            if score > 0:
+                best_score = max(best_score, score * weight)
+        return best_score
+
+    def rank(self, search_term: str, row_ids: Sequence[int], limit: int,
+             min_similarity: float) -> List[Tuple[int, float]]:
+        """
+        Score les lignes `row_ids` et garde les meilleures.
+
+        Returns:
+            List[Tuple[int, float]]: (ligne, score) triés par score décroissant
+        """
+        search_clean = clean_text(search_term)
+        if not search_clean:
+            return []
+        search_words = search_clean.split()
+
+        results = []
+        for row_id in row_ids:
+            best_score = self.score(row_id, search_clean, search_words)
+
+            # Ne garder que les résultats au-dessus du seuil
+            if best_score and best_score >= min_similarity:
+                results.append((row_id, best_score))
+
+        # Trier par score décroissant et limiter les résultats
+        results.sort(key=lambda x: x[1], reverse=True)
+        return results[:limit]
+
+    def search(self, search_term: str, limit: int,
+               min_similarity: float) -> List[Tuple[int, float]]:
+        """
+        Recherche floue : présélection par l'index puis score complet.
+
+        Args:
+            search_term: Terme de recherche
+            limit: Nombre maximum de résultats
+            min_similarity: Score minimum (après pondération) pour garder une ligne
+
+        Returns:
+            List[Tuple[int, float]]: (ligne, score) triés par score décroissant
+        """
+        search_clean = clean_text(search_term)
+        if not search_clean:
+            return []
+        return self.rank(search_term, self.candidates(search_clean), limit, min_similarity)
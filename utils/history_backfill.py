@@ -0,0 +1,211 @@
+"""
+Remplissage à rebours de l'historique des canaux indexés.
+
+Un canal jamais indexé démarre à son message le plus récent
+(voir MessageIndex.sync_channel). Cette tâche de fond parcourt ensuite
+l'historique plus ancien page par page, du plus récent au plus ancien, et
+enregistre après chaque page l'ID du plus ancien message atteint : un
+redémarrage reprend exactement où le remplissage s'était arrêté.
+
+Le rythme s'adapte aux limites de débit Discord : quand le bucket de
+`GET /channels/{id}/messages` n'a presque plus de requêtes disponibles,
+la tâche attend sa réinitialisation pour laisser la place aux commandes
+interactives qui lisent le même canal.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import discord
+
+from utils.channels import ChannelHelper
+
+logger = logging.getLogger(__name__)
+
+# Messages par page (maximum accepté par l'API Discord)
+PAGE_SIZE = 100
+
+# Pause entre deux pages (secondes), ajustée selon les limites de débit
+MIN_DELAY = 1.0
+MAX_DELAY = 30.0
+
+# Requêtes laissées libres dans le bucket pour les commandes interactives
+RESERVED_REQUESTS = 2
+
+# Au-delà de cette durée, une page a attendu une limite de débit (secondes)
+SLOW_PAGE_SECONDS = 3.0
+
+# Route utilisée par channel.history() dans discord.py
+HISTORY_ROUTE_KEY = "GET /channels/{channel_id}/messages"
+
+
+class HistoryBackfillWorker:
+    """Tâche de fond qui remplit l'index des messages à rebours."""
+
+    def __init__(self, client: discord.Client, index):
+        self.client = client
+        self.index = index
+        self.delay = MIN_DELAY
+        self._task: Optional[asyncio.Task] = None
+        # Progression de l'exécution en cours : {channel_id: (début, date atteinte au début)}
+        self._run_start: Dict[int, tuple] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Lance la tâche si elle ne tourne pas déjà."""
+        if not self.running:
+            self._task = asyncio.create_task(self.run())
+
+    def stop(self):
+        """Interrompt la tâche (le point de reprise est déjà enregistré)."""
+        if self.running:
+            self._task.cancel()
+
+    async def run(self):
+        """Remplit à rebours chaque canal suivi qui ne l'est pas encore."""
+        for guild in self.client.guilds:
+            for channel_key in (ChannelHelper.RECOMPENSES, ChannelHelper.QUETES):
+                channel = ChannelHelper.get_channel(guild, channel_key)
+                if not channel:
+                    continue
+
+                try:
+                    await self.backfill_channel(channel, channel_key)
+                except asyncio.CancelledError:
+                    raise
+                except discord.Forbidden:
+                    logger.warning(f"Accès refusé à #{channel.name} sur {guild.name} (remplissage interrompu)")
+                except Exception as e:
+                    logger.error(f"❌ Erreur remplissage de l'index #{channel.name} sur {guild.name}: {e}")
+
+    async def backfill_channel(self, channel: discord.TextChannel, channel_key: str):
+        """Parcourt l'historique d'un canal à rebours depuis son point de reprise."""
+        state = self.index.get_backfill_state(channel.id)
+        if state is None or state['completed']:
+            return
+
+        logger.info(f"Remplissage à rebours de #{channel.name} "
+                    f"(depuis le message {state['oldest_message_id']})")
+        self._run_start[channel.id] = (time.monotonic(), state['oldest_created_at'])
+
+        while True:
+            before = discord.Object(id=state['oldest_message_id'])
+            started = time.monotonic()
+            page = [message async for message in
+                    channel.history(limit=PAGE_SIZE, before=before)]
+            elapsed = time.monotonic() - started
+
+            self.index.store_backfill_page(channel.id, channel_key, page)
+            state = self.index.get_backfill_state(channel.id)
+
+            # Page incomplète : le premier message du canal est atteint
+            if len(page) < PAGE_SIZE:
+                if page:
+                    self.index.store_backfill_page(channel.id, channel_key, [])
+                logger.info(f"Remplissage de #{channel.name} terminé "
+                            f"({state['messages_indexed']} messages)")
+                break
+
+            await asyncio.sleep(self._next_delay(channel, elapsed))
+
+        self._run_start.pop(channel.id, None)
+
+    # ========================================================================
+    # RYTHME
+    # ========================================================================
+
+    def _history_bucket(self, channel: discord.abc.Snowflake):
+        """
+        Retourne l'état de limite de débit connu par discord.py pour
+        l'historique du canal (en-têtes X-RateLimit-*), ou None.
+        """
+        http = getattr(self.client, 'http', None)
+        buckets = getattr(http, '_buckets', None)
+        hashes = getattr(http, '_bucket_hashes', None)
+        if not isinstance(buckets, dict) or not isinstance(hashes, dict):
+            return None
+
+        bucket_hash = hashes.get(HISTORY_ROUTE_KEY, HISTORY_ROUTE_KEY)
+        return buckets.get(f"{bucket_hash}:{channel.id}")
+
+    def _next_delay(self, channel: discord.abc.Snowflake, elapsed: float) -> float:
+        """
+        Calcule la pause avant la page suivante.
+
+        Une page lente (discord.py a attendu une limite de débit) double la
+        pause ; sinon elle diminue progressivement. Si le bucket n'a plus
+        assez de requêtes libres, on attend au moins sa réinitialisation.
+        """
+        if elapsed >= SLOW_PAGE_SECONDS:
+            self.delay = min(self.delay * 2, MAX_DELAY)
+        else:
+            self.delay = max(self.delay * 0.75, MIN_DELAY)
+
+        bucket = self._history_bucket(channel)
+        remaining = getattr(bucket, 'remaining', None)
+        reset_after = getattr(bucket, 'reset_after', None)
+        if remaining is not None and reset_after and remaining <= RESERVED_REQUESTS:
+            return min(max(self.delay, reset_after), MAX_DELAY)
+        return self.delay
+
+    # ========================================================================
+    # PROGRESSION
+    # ========================================================================
+
+    def get_progress(self, channel: discord.TextChannel) -> Optional[dict]:
+        """
+        Retourne la progression du remplissage d'un canal.
+
+        L'avancement et l'ETA sont estimés sur la durée d'historique couverte,
+        entre le message de départ et la création du canal.
+        """
+        state = self.index.get_backfill_state(channel.id)
+        if state is None:
+            return None
+
+        oldest = state['oldest_created_at']
+        newest = state['newest_created_at']
+        origin = channel.created_at.timestamp()
+        progress = {
+            'messages_indexed': state['messages_indexed'],
+            'completed': bool(state['completed']),
+            'oldest_date': (datetime.fromtimestamp(oldest, tz=timezone.utc)
+                            if oldest is not None else None),
+            'percent': 100.0 if state['completed'] else 0.0,
+            'eta_seconds': 0.0 if state['completed'] else None
+        }
+        if state['completed'] or oldest is None or newest is None or newest <= origin:
+            return progress
+
+        progress['percent'] = min(100.0, 100.0 * (newest - oldest) / (newest - origin))
+
+        run = self._run_start.get(channel.id)
+        if run and run[1] is not None:
+            covered = run[1] - oldest
+            running_for = time.monotonic() - run[0]
+            if covered > 0 and running_for > 0:
+                progress['eta_seconds'] = (oldest - origin) * running_for / covered
+
+        return progress
+
+
+# Instance globale
+history_backfill: Optional[HistoryBackfillWorker] = None
+
+
+def init_history_backfill(client: discord.Client, index) -> HistoryBackfillWorker:
+    """Initialise la tâche de remplissage à rebours."""
+    global history_backfill
+    history_backfill = HistoryBackfillWorker(client, index)
+    return history_backfill
+
+
+def get_history_backfill() -> Optional[HistoryBackfillWorker]:
+    """Récupère la tâche de remplissage à rebours."""
+    return history_backfill
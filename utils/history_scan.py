@@ -0,0 +1,118 @@
+"""
+Coordination des parcours d'historique des canaux Discord.
+
+Quand plusieurs commandes parcourent le même canal au même moment
+(/recapmj, /mentionsomeone, /mesquetes en fin de session), un seul
+parcours est réellement effectué : les appels concurrents attendent le
+parcours en cours et son résultat reste en cache quelques secondes.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Durée de conservation d'un parcours terminé (secondes)
+DEFAULT_TTL = 60
+
+ScanKey = Tuple[int, Optional[int], Optional[int]]
+
+
+class HistoryScanCoordinator:
+    """Mutualise les parcours `channel.history()` identiques et concurrents."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        self.ttl = ttl
+        self._inflight: Dict[ScanKey, asyncio.Task] = {}
+        self._results: Dict[ScanKey, Tuple[float, List[discord.Message]]] = {}
+        self.stats = {'scans': 0, 'shared': 0, 'cached': 0}
+
+    @staticmethod
+    def _floor_to_minute(after: Optional[datetime]) -> Optional[datetime]:
+        """Arrondit la date de début à la minute pour regrouper les appels proches."""
+        if after is None:
+            return None
+        return after.replace(second=0, microsecond=0)
+
+    def _purge_expired(self, now: float):
+        """Supprime les résultats expirés."""
+        expired = [key for key, (expires, _) in self._results.items() if expires <= now]
+        for key in expired:
+            del self._results[key]
+
+    async def _scan(self, channel: discord.abc.Messageable, limit: Optional[int],
+                    after: Optional[datetime]) -> List[discord.Message]:
+        """Effectue réellement le parcours de l'historique."""
+        self.stats['scans'] += 1
+        return [message async for message in channel.history(limit=limit, after=after)]
+
+    async def fetch(self, channel: discord.abc.Messageable, limit: Optional[int] = 1000,
+                    after: Optional[datetime] = None) -> List[discord.Message]:
+        """
+        Retourne les messages de `channel.history(limit, after)`.
+
+        La date `after` est arrondie à la minute inférieure : le résultat
+        peut contenir quelques secondes d'historique en plus.
+
+        Args:
+            channel: Canal à parcourir
+            limit: Nombre maximum de messages (None = illimité)
+            after: Date de début (None = tout l'historique)
+
+        Returns:
+            List[discord.Message]: Messages du plus récent au plus ancien
+        """
+        after = self._floor_to_minute(after)
+        key = (channel.id,
+               int(after.timestamp()) if after else None,
+               limit)
+
+        now = time.monotonic()
+        self._purge_expired(now)
+
+        cached = self._results.get(key)
+        if cached:
+            self.stats['cached'] += 1
+            return cached[1]
+
+        task = self._inflight.get(key)
+        if task:
+            self.stats['shared'] += 1
+        else:
+            task = asyncio.ensure_future(self._scan(channel, limit, after))
+            self._inflight[key] = task
+
+            def _on_done(done: asyncio.Task, key=key):
+                self._inflight.pop(key, None)
+                if not done.cancelled() and done.exception() is None:
+                    self._results[key] = (time.monotonic() + self.ttl, done.result())
+
+            task.add_done_callback(_on_done)
+
+        # shield : l'annulation d'un appelant n'interrompt pas le parcours partagé
+        return await asyncio.shield(task)
+
+    def get_status(self) -> dict:
+        """Retourne l'état du coordinateur."""
+        return {
+            'inflight': len(self._inflight),
+            'cached': len(self._results),
+            **self.stats
+        }
+
+
+# Instance globale
+history_scanner: Optional[HistoryScanCoordinator] = None
+
+
+def get_history_scanner() -> HistoryScanCoordinator:
+    """Récupère le coordinateur de parcours (créé au premier appel)."""
+    global history_scanner
+    if history_scanner is None:
+        history_scanner = HistoryScanCoordinator()
+    return history_scanner
@@ -0,0 +1,86 @@
+"""
+Client HTTP partagé pour les appels sortants (exports CSV Google Sheets).
+
+Une seule session aiohttp, détenue par le bot, garde les connexions TLS
+vers docs.google.com ouvertes entre deux commandes (keep-alive) au lieu
+d'ouvrir une session, donc une poignée de main TCP+TLS, à chaque appel.
+La session est créée au premier usage et fermée à l'arrêt du bot.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Connexions simultanées au total et par hôte
+CONNECTION_LIMIT = 20
+CONNECTION_LIMIT_PER_HOST = 6
+
+# Durée de conservation des résolutions DNS (secondes)
+DNS_CACHE_TTL = 300
+
+# Durée de conservation d'une connexion inactive (secondes)
+KEEPALIVE_TIMEOUT = 60
+
+# Délais : total d'une requête, et établissement de la connexion (secondes)
+TOTAL_TIMEOUT = 30
+CONNECT_TIMEOUT = 10
+
+
+class SharedHttpClient:
+    """Session aiohttp unique avec pool de connexions, partagée par les commandes."""
+
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._lock = asyncio.Lock()
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Retourne la session partagée (créée au premier appel)."""
+        if self._session is None or self._session.closed:
+            async with self._lock:
+                if self._session is None or self._session.closed:
+                    connector = aiohttp.TCPConnector(
+                        limit=CONNECTION_LIMIT,
+                        limit_per_host=CONNECTION_LIMIT_PER_HOST,
+                        ttl_dns_cache=DNS_CACHE_TTL,
+                        keepalive_timeout=KEEPALIVE_TIMEOUT)
+                    timeout = aiohttp.ClientTimeout(total=TOTAL_TIMEOUT,
+                                                    connect=CONNECT_TIMEOUT)
+                    self._session = aiohttp.ClientSession(connector=connector,
+                                                          timeout=timeout)
+                    logger.info("Session HTTP partagée ouverte")
+        return self._session
+
+    async def close(self):
+        """Ferme la session et ses connexions."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("Session HTTP partagée fermée")
+        self._session = None
+
+
+# Instance globale
+http_client: Optional[SharedHttpClient] = None
+
+
+def init_http_client() -> SharedHttpClient:
+    """Initialise le client HTTP partagé."""
+    global http_client
+    http_client = SharedHttpClient()
+    return http_client
+
+
+def get_http_client() -> SharedHttpClient:
+    """Récupère le client HTTP partagé (créé au premier appel)."""
+    global http_client
+    if http_client is None:
+        http_client = SharedHttpClient()
+    return http_client
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Raccourci : session aiohttp du client partagé."""
+    return await get_http_client().get_session()
@@ -0,0 +1,240 @@
+"""
+Archivage et recherche des logs quotidiens.
+
+Une fois un jour terminé (et résumé, voir utils/file_logger.py), son
+fichier logs-DDMMYYYY.log est compressé en logs-DDMMYYYY.log.gz par un
+thread dédié, puis les fichiers plus anciens que LOG_RETENTION_DAYS sont
+supprimés. Les lignes JSON se compressent environ 10 fois.
+
+La recherche (/search-logs) est une chaîne de générateurs : fichiers du
+plus récent au plus ancien, lignes lues au fil de la décompression,
+préfiltre sur le texte brut, analyse JSON puis filtres. Elle s'arrête dès
+que le nombre de résultats demandé est atteint, sans ouvrir les archives
+plus anciennes ni charger un fichier entier en mémoire.
+"""
+
+import glob
+import gzip
+import json
+import os
+import queue
+import re
+import shutil
+import threading
+from collections import deque
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from config import Config
+
+# Jour d'un fichier de logs, compressé ou non
+LOG_FILE_PATTERN = re.compile(r'logs-(\d{8})\.log(\.gz)?')
+
+
+def _file_day(filename: str) -> Optional[date]:
+    """Jour d'un fichier logs-DDMMYYYY.log[.gz] (None pour un autre fichier)."""
+    match = LOG_FILE_PATTERN.fullmatch(filename)
+    if not match:
+        return None
+    try:
+        return datetime.strptime(match.group(1), '%d%m%Y').date()
+    except ValueError:
+        return None
+
+
+def compress_log(path: str) -> Optional[str]:
+    """
+    Compresse un fichier de logs terminé (path -> path.gz) puis supprime
+    l'original. Retourne le chemin de l'archive.
+    """
+    archive_path = f"{path}.gz"
+    tmp_path = f"{archive_path}.tmp"
+    with open(path, 'rb') as source, gzip.open(tmp_path, 'wb', compresslevel=6) as target:
+        shutil.copyfileobj(source, target, 1024 * 1024)
+    os.replace(tmp_path, archive_path)
+    os.remove(path)
+    return archive_path
+
+
+def enforce_retention(logs_dir: str, days_to_keep: int = Config.LOG_RETENTION_DAYS) -> int:
+    """
+    Supprime les logs (compressés ou non) et les compteurs plus anciens que
+    `days_to_keep` jours. Les résumés rollup-*.json (quelques Ko par jour)
+    sont gardés pour /stats-usage.
+
+    Returns:
+        int: Nombre de fichiers supprimés
+    """
+    cutoff = datetime.now().date() - timedelta(days=days_to_keep)
+    deleted = 0
+    for pattern in ("logs-????????.log", "logs-????????.log.gz", "stats-????????.json"):
+        for path in glob.glob(os.path.join(logs_dir, pattern)):
+            filename = os.path.basename(path)
+            try:
+                day = datetime.strptime(filename.split('-', 1)[1][:8], '%d%m%Y').date()
+            except ValueError:
+                continue
+            if day < cutoff:
+                try:
+                    os.remove(path)
+                    deleted += 1
+                    print(f"✓ Supprimé: {filename}")
+                except OSError as e:
+                    print(f"⚠️ Suppression de {filename} impossible : {e}")
+    return deleted
+
+
+class LogArchiver(threading.Thread):
+    """Thread qui compresse les jours terminés et applique la rétention."""
+
+    def __init__(self, logs_dir: str, days_to_keep: int = Config.LOG_RETENTION_DAYS):
+        """
+        Args:
+            logs_dir: Répertoire des logs
+            days_to_keep: Nombre de jours de logs conservés (0 : pas de suppression)
+        """
+        super().__init__(name="daily-log-archiver", daemon=True)
+        self.logs_dir = logs_dir
+        self.days_to_keep = days_to_keep
+        self.queue: queue.Queue = queue.Queue()
+        self.archived = 0
+        self.deleted = 0
+        self.errors = 0
+
+    def submit(self, day: str):
+        """Demande la compression d'un jour terminé (DDMMYYYY)."""
+        self.queue.put(day)
+
+    def submit_finished_days(self):
+        """Demande la compression de tous les jours terminés encore non compressés."""
+        today = datetime.now().date()
+        for filename in sorted(os.listdir(self.logs_dir)):
+            day = _file_day(filename)
+            if day is not None and day < today and not filename.endswith('.gz'):
+                self.submit(day.strftime('%d%m%Y'))
+
+    def run(self):
+        while True:
+            day = self.queue.get()
+            if day is None:
+                break
+
+            path = os.path.join(self.logs_dir, f"logs-{day}.log")
+            try:
+                if os.path.exists(path):
+                    compress_log(path)
+                    self.archived += 1
+            except OSError as e:
+                self.errors += 1
+                print(f"⚠️ Erreur compression de {os.path.basename(path)} : {e}")
+
+            # Rétention appliquée une fois la file vidée
+            if self.days_to_keep > 0 and self.queue.empty():
+                self.deleted += enforce_retention(self.logs_dir, self.days_to_keep)
+
+    def stop(self, timeout: float = 5.0):
+        """Termine les compressions demandées puis arrête le thread."""
+        self.queue.put(None)
+        self.join(timeout)
+
+    def get_status(self) -> dict:
+        return {
+            'pending': self.queue.qsize(),
+            'archived': self.archived,
+            'deleted': self.deleted,
+            'errors': self.errors,
+            'alive': self.is_alive()
+        }
+
+
+# ============================================================================
+# RECHERCHE
+# ============================================================================
+
+def log_files(logs_dir: str, start: date, end: date) -> Iterator[Tuple[date, str]]:
+    """
+    Fichier de logs de chaque jour du `start` au `end`, du plus récent au
+    plus ancien. Un seul fichier par jour : l'archive .gz si elle existe
+    (pendant ou après une compression interrompue, l'original est encore là).
+    """
+    files: Dict[date, str] = {}
+    for filename in os.listdir(logs_dir):
+        day = _file_day(filename)
+        if day is not None and start <= day <= end:
+            if day not in files or filename.endswith('.gz'):
+                files[day] = os.path.join(logs_dir, filename)
+
+    for day in sorted(files, reverse=True):
+        path = files[day]
+        # Compressé depuis la liste : lire l'archive
+        if not path.endswith('.gz') and not os.path.exists(path):
+            path = f"{path}.gz"
+        yield day, path
+
+
+def read_lines(path: str) -> Iterator[str]:
+    """Lignes d'un fichier de logs, décompressées au fil de la lecture."""
+    opener = gzip.open if path.endswith('.gz') else open
+    try:
+        with opener(path, 'rt', encoding='utf-8', errors='replace') as f:
+            yield from f
+    except (OSError, EOFError) as e:
+        # Archive tronquée ou fichier supprimé entre-temps : garder ce qui a été lu
+        print(f"⚠️ Lecture de {os.path.basename(path)} interrompue : {e}")
+
+
+def parse_events(lines: Iterable[str]) -> Iterator[dict]:
+    """Événements JSON des lignes (les anciennes lignes texte sont ignorées)."""
+    for line in lines:
+        if not line.startswith('{'):
+            continue
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(event, dict):
+            yield event
+
+
+def search_logs(logs_dir: str, start: date, end: date,
+                user_id: Optional[int] = None,
+                command: Optional[str] = None,
+                status: Optional[str] = None,
+                limit: int = 20) -> Iterator[dict]:
+    """
+    Événements qui correspondent aux filtres, du plus récent au plus ancien.
+
+    Args:
+        logs_dir: Répertoire des logs
+        start: Premier jour cherché
+        end: Dernier jour cherché
+        user_id: Identifiant de l'utilisateur
+        command: Nom de la commande (ou de l'action admin), sans "/"
+        status: SUCCESS, ERROR ou ADMIN
+        limit: Nombre maximum de résultats
+
+    Le fichier d'un jour est lu en entier (ses lignes sont dans l'ordre
+    chronologique) en ne gardant que ses `limit` derniers résultats ; les
+    jours plus anciens ne sont ouverts que s'il en manque.
+    """
+    # Préfiltre sur le texte brut : évite d'analyser les lignes sans rapport
+    needles = [str(value) for value in (user_id, command, status) if value]
+
+    def matches(event: dict) -> bool:
+        return ((user_id is None or event.get('user_id') == user_id)
+                and (command is None or event.get('command') == command)
+                and (status is None or event.get('status') == status))
+
+    if limit <= 0:
+        return
+
+    remaining = limit
+    for _, path in log_files(logs_dir, start, end):
+        lines = (line for line in read_lines(path) if all(needle in line for needle in needles))
+        recent = deque((event for event in parse_events(lines) if matches(event)),
+                       maxlen=remaining)
+        while recent:
+            yield recent.pop()
+            remaining -= 1
+        if remaining <= 0:
+            return
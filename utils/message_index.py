@@ -0,0 +1,808 @@
+"""
+Index local persistant des messages du canal récompenses.
+
+Ce module conserve dans une base SQLite les informations utiles aux
+commandes de statistiques (auteur, mentions, date, première ligne, lien)
+afin de ne plus reparcourir l'historique Discord à chaque appel.
+
+Au démarrage, chaque canal suivi est rattrapé uniquement à partir du
+dernier message déjà indexé ; ensuite les événements du gateway
+(création, modification, suppression) tiennent l'index à jour.
+
+Un canal jamais indexé démarre à son message le plus récent : l'historique
+plus ancien est rempli à rebours par utils/history_backfill.py.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+import discord
+
+from utils.channels import ChannelHelper
+from utils.message_stats import is_mj_post, mentioned_user_ids
+from utils.quest_dates import extract_quest_date
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                               "data", "message_index.sqlite3")
+
+# Nombre de messages insérés avant chaque commit pendant un rattrapage
+SYNC_BATCH_SIZE = 200
+
+# Périodes proposées par les classements : valeur -> (libellé, nombre de jours)
+PERIODES = {
+    '7j': ("7 derniers jours", 7),
+    '30j': ("30 derniers jours", 30),
+    '90j': ("90 derniers jours", 90),
+    '365j': ("365 derniers jours", 365),
+    'tout': ("tout l'historique", None)
+}
+
+SECONDS_PER_DAY = 86400
+
+# Version du schéma (PRAGMA user_version)
+# 1 : dates de quêtes extraites à l'ingestion (quest_participants)
+SCHEMA_VERSION = 1
+
+
+def periode_to_date(periode: str) -> Optional[datetime]:
+    """Retourne la date de début d'une période (None pour tout l'historique)."""
+    _, days = PERIODES.get(periode, PERIODES['30j'])
+    if days is None:
+        return None
+    return datetime.now(timezone.utc) - timedelta(days=days)
+
+
+def _to_timestamp(date: Optional[datetime]) -> Optional[float]:
+    """Convertit un datetime (naïf = UTC) en timestamp Unix."""
+    if date is None:
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date.timestamp()
+
+
+class MessageIndex:
+    """Index SQLite des messages des canaux suivis par le bot."""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.row_factory = sqlite3.Row
+        # Canaux rattrapés depuis la dernière connexion au gateway : seuls
+        # leurs messages reçus en direct font avancer le point de reprise
+        self._caught_up: Set[int] = set()
+        self._setup_database()
+
+    def _setup_database(self):
+        """Crée les tables et index s'ils n'existent pas."""
+        self._conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+
+            CREATE TABLE IF NOT EXISTS messages (
+                message_id INTEGER PRIMARY KEY,
+                guild_id INTEGER NOT NULL,
+                channel_id INTEGER NOT NULL,
+                channel_key TEXT NOT NULL,
+                author_id INTEGER NOT NULL,
+                author_name TEXT NOT NULL,
+                author_bot INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                first_line TEXT NOT NULL DEFAULT '',
+                jump_url TEXT NOT NULL,
+                mention_ids TEXT NOT NULL DEFAULT '[]',
+                mention_count INTEGER NOT NULL DEFAULT 0,
+                unique_mentions INTEGER NOT NULL DEFAULT 0
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_messages_channel_date
+                ON messages (channel_id, created_at);
+            CREATE INDEX IF NOT EXISTS idx_messages_author
+                ON messages (channel_id, author_id, created_at);
+
+            CREATE TABLE IF NOT EXISTS message_mentions (
+                message_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                PRIMARY KEY (message_id, user_id)
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_mentions_user
+                ON message_mentions (user_id);
+
+            CREATE TABLE IF NOT EXISTS sync_state (
+                channel_id INTEGER PRIMARY KEY,
+                guild_id INTEGER NOT NULL,
+                channel_key TEXT NOT NULL,
+                last_message_id INTEGER,
+                synced INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL
+            );
+
+            CREATE TABLE IF NOT EXISTS daily_stats (
+                guild_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                day INTEGER NOT NULL,
+                mentioned INTEGER NOT NULL DEFAULT 0,
+                mj_posts INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (guild_id, user_id, day)
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_daily_stats_day
+                ON daily_stats (guild_id, day);
+
+            CREATE TABLE IF NOT EXISTS backfill_state (
+                channel_id INTEGER PRIMARY KEY,
+                guild_id INTEGER NOT NULL,
+                channel_key TEXT NOT NULL,
+                oldest_message_id INTEGER,
+                oldest_created_at REAL,
+                newest_created_at REAL,
+                messages_indexed INTEGER NOT NULL DEFAULT 0,
+                completed INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL
+            );
+
+            CREATE TABLE IF NOT EXISTS quest_participants (
+                message_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                channel_id INTEGER NOT NULL,
+                quest_date REAL NOT NULL,
+                PRIMARY KEY (message_id, user_id)
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_quest_participants_date
+                ON quest_participants (channel_id, user_id, quest_date);
+        """)
+        self._conn.commit()
+
+        # Base créée avant l'ajout des agrégats : les reconstruire une fois
+        has_stats = self._conn.execute("SELECT 1 FROM daily_stats LIMIT 1").fetchone()
+        has_messages = self._conn.execute("SELECT 1 FROM messages LIMIT 1").fetchone()
+        if has_messages and not has_stats:
+            self._rebuild_daily_stats()
+
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            self._reindex_quest_channels()
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.commit()
+
+    def _reindex_quest_channels(self):
+        """
+        Relance le remplissage à rebours des canaux quêtes déjà indexés :
+        le texte complet n'est pas conservé, les dates de quêtes ne peuvent
+        être extraites qu'en relisant les messages.
+        """
+        rows = self._conn.execute(
+            "SELECT * FROM sync_state WHERE channel_key = ? AND last_message_id IS NOT NULL",
+            (ChannelHelper.QUETES,)).fetchall()
+        now = datetime.now(timezone.utc).timestamp()
+        for row in rows:
+            logger.info(f"Dates de quêtes à extraire pour le canal {row['channel_id']} : "
+                        f"remplissage à rebours relancé")
+            # Reprendre juste après le dernier message pour l'inclure
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO backfill_state (
+                    channel_id, guild_id, channel_key, oldest_message_id,
+                    oldest_created_at, newest_created_at, messages_indexed,
+                    completed, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, 0, 0, ?)
+                """, (row['channel_id'], row['guild_id'], row['channel_key'],
+                      row['last_message_id'] + 1, now, now, now))
+
+    # ========================================================================
+    # ÉCRITURE
+    # ========================================================================
+
+    def _build_row(self, message: discord.Message, channel_key: str) -> dict:
+        """Extrait d'un message Discord les champs conservés dans l'index."""
+        mention_ids = []
+        for user in message.mentions:
+            if user.id not in mention_ids:
+                mention_ids.append(user.id)
+
+        unique_mentions = len(mentioned_user_ids(message.author.id, mention_ids))
+        first_line = message.content.split('\n', 1)[0].strip()[:200]
+
+        # Date de quête extraite une seule fois, par rapport à la date de l'annonce
+        quest_date = None
+        if channel_key == ChannelHelper.QUETES and not message.author.bot:
+            quest_date, _ = extract_quest_date(message.content, message.created_at)
+
+        return {
+            'message_id': message.id,
+            'guild_id': message.guild.id if message.guild else 0,
+            'channel_id': message.channel.id,
+            'channel_key': channel_key,
+            'author_id': message.author.id,
+            'author_name': message.author.display_name,
+            'author_bot': 1 if message.author.bot else 0,
+            'created_at': _to_timestamp(message.created_at),
+            'first_line': first_line,
+            'jump_url': message.jump_url,
+            'mention_ids': mention_ids,
+            'mention_count': len(message.mentions),
+            'unique_mentions': unique_mentions,
+            'quest_date': _to_timestamp(quest_date)
+        }
+
+    def _fetch_row(self, message_id: int) -> Optional[dict]:
+        """Retourne la ligne brute d'un message indexé."""
+        row = self._conn.execute("SELECT * FROM messages WHERE message_id = ?",
+                                 (message_id,)).fetchone()
+        if not row:
+            return None
+        data = dict(row)
+        data['mention_ids'] = json.loads(data['mention_ids'])
+        return data
+
+    @staticmethod
+    def _daily_counts(row: dict) -> List[Tuple[int, int, int]]:
+        """
+        Contribution d'un message du canal récompenses aux compteurs
+        journaliers : (utilisateur, mentions reçues, posts MJ).
+
+        Mêmes règles que les classements : mentions uniques hors auteur pour
+        les messages humains, et post MJ dès 2 mentions.
+        """
+        if row['channel_key'] != ChannelHelper.RECOMPENSES:
+            return []
+
+        counts = []
+        if not row['author_bot']:
+            for user_id in mentioned_user_ids(row['author_id'], row['mention_ids']):
+                counts.append((user_id, 1, 0))
+
+        if is_mj_post(row['mention_count']):
+            counts.append((row['author_id'], 0, 1))
+        return counts
+
+    def _apply_daily_delta(self, row: dict, sign: int):
+        """
+        Ajoute (sign=1) ou retire (sign=-1) la contribution d'un message du
+        canal récompenses aux compteurs journaliers.
+        """
+        day = int(row['created_at'] // SECONDS_PER_DAY)
+        deltas = [(row['guild_id'], user_id, day, mentioned * sign, mj_posts * sign)
+                  for user_id, mentioned, mj_posts in self._daily_counts(row)]
+
+        self._conn.executemany(
+            """
+            INSERT INTO daily_stats (guild_id, user_id, day, mentioned, mj_posts)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(guild_id, user_id, day) DO UPDATE SET
+                mentioned = mentioned + excluded.mentioned,
+                mj_posts = mj_posts + excluded.mj_posts
+            """, deltas)
+
+    def _rebuild_daily_stats(self):
+        """Recalcule tous les compteurs journaliers depuis les messages indexés."""
+        logger.info("Reconstruction des statistiques journalières de l'index...")
+        self._conn.execute("DELETE FROM daily_stats")
+        for row in self._conn.execute("SELECT * FROM messages").fetchall():
+            data = dict(row)
+            data['mention_ids'] = json.loads(data['mention_ids'])
+            self._apply_daily_delta(data, 1)
+        self._conn.commit()
+
+    def _write_row(self, row: dict):
+        """Insère ou remplace une ligne et met à jour les agrégats (sans commit)."""
+        previous = self._fetch_row(row['message_id'])
+        if previous:
+            self._apply_daily_delta(previous, -1)
+        self._apply_daily_delta(row, 1)
+
+        self._conn.execute(
+            """
+            INSERT OR REPLACE INTO messages (
+                message_id, guild_id, channel_id, channel_key, author_id,
+                author_name, author_bot, created_at, first_line, jump_url,
+                mention_ids, mention_count, unique_mentions
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (row['message_id'], row['guild_id'], row['channel_id'],
+             row['channel_key'], row['author_id'], row['author_name'],
+             row['author_bot'], row['created_at'], row['first_line'],
+             row['jump_url'], json.dumps(row['mention_ids']),
+             row['mention_count'], row['unique_mentions']))
+
+        self._conn.execute("DELETE FROM message_mentions WHERE message_id = ?",
+                           (row['message_id'],))
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO message_mentions (message_id, user_id) VALUES (?, ?)",
+            [(row['message_id'], uid) for uid in row['mention_ids']])
+
+        self._conn.execute("DELETE FROM quest_participants WHERE message_id = ?",
+                           (row['message_id'],))
+        if row.get('quest_date') is not None:
+            self._conn.executemany(
+                """
+                INSERT OR IGNORE INTO quest_participants
+                    (message_id, user_id, channel_id, quest_date)
+                VALUES (?, ?, ?, ?)
+                """, [(row['message_id'], uid, row['channel_id'], row['quest_date'])
+                      for uid in row['mention_ids']])
+
+    def upsert_message(self, message: discord.Message, channel_key: str):
+        """
+        Ajoute ou met à jour un message dans l'index.
+
+        Pour un canal rattrapé depuis la dernière connexion, un message plus
+        récent fait avancer le point de reprise : le prochain rattrapage ne
+        le retéléchargera pas. Avant la fin du rattrapage, le point de
+        reprise n'est pas touché, sans quoi les messages postés pendant la
+        coupure seraient sautés.
+        """
+        self._write_row(self._build_row(message, channel_key))
+        if message.channel.id in self._caught_up:
+            self._conn.execute(
+                """
+                UPDATE sync_state SET last_message_id = ?, updated_at = ?
+                WHERE channel_id = ? AND synced = 1
+                  AND (last_message_id IS NULL OR last_message_id < ?)
+                """, (message.id, datetime.now(timezone.utc).timestamp(),
+                      message.channel.id, message.id))
+        self._conn.commit()
+
+    def _remove_row(self, message_id: int):
+        """Supprime un message et sa contribution aux agrégats (sans commit)."""
+        previous = self._fetch_row(message_id)
+        if not previous:
+            return
+        self._apply_daily_delta(previous, -1)
+        self._conn.execute("DELETE FROM messages WHERE message_id = ?",
+                           (message_id,))
+        self._conn.execute("DELETE FROM message_mentions WHERE message_id = ?",
+                           (message_id,))
+        self._conn.execute("DELETE FROM quest_participants WHERE message_id = ?",
+                           (message_id,))
+
+    def delete_message(self, message_id: int):
+        """Supprime un message de l'index."""
+        self._remove_row(message_id)
+        self._conn.commit()
+
+    def delete_messages(self, message_ids):
+        """Supprime plusieurs messages de l'index (suppression en masse)."""
+        for message_id in message_ids:
+            self._remove_row(message_id)
+        self._conn.commit()
+
+    # ========================================================================
+    # ÉTAT DE SYNCHRONISATION
+    # ========================================================================
+
+    def get_last_message_id(self, channel_id: int) -> Optional[int]:
+        """Retourne l'ID du dernier message indexé pour un canal."""
+        row = self._conn.execute(
+            "SELECT last_message_id FROM sync_state WHERE channel_id = ?",
+            (channel_id,)).fetchone()
+        return row['last_message_id'] if row else None
+
+    def reset_caught_up(self):
+        """
+        Oublie les canaux rattrapés : à appeler à chaque (re)connexion au
+        gateway, les événements manqués pendant la coupure restant à rattraper.
+        """
+        self._caught_up.clear()
+
+    def _save_sync_state(self, channel: discord.TextChannel, channel_key: str,
+                         last_message_id: Optional[int], synced: bool):
+        """Enregistre la progression du rattrapage d'un canal (sans commit)."""
+        self._conn.execute(
+            """
+            INSERT INTO sync_state (channel_id, guild_id, channel_key,
+                                    last_message_id, synced, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(channel_id) DO UPDATE SET
+                last_message_id = excluded.last_message_id,
+                synced = excluded.synced,
+                updated_at = excluded.updated_at
+            """,
+            (channel.id, channel.guild.id, channel_key, last_message_id,
+             1 if synced else 0, datetime.now(timezone.utc).timestamp()))
+
+    def is_channel_synced(self, channel_id: int,
+                          since: Optional[datetime] = None) -> bool:
+        """
+        Indique si l'index couvre un canal depuis une date.
+
+        Le canal doit être à jour côté messages récents, et le remplissage
+        à rebours doit être terminé ou avoir dépassé `since`
+        (None = tout l'historique).
+        """
+        row = self._conn.execute(
+            "SELECT synced FROM sync_state WHERE channel_id = ?",
+            (channel_id,)).fetchone()
+        if not (row and row['synced']):
+            return False
+
+        backfill = self.get_backfill_state(channel_id)
+        # Pas d'état de remplissage : canal indexé depuis son premier message
+        if backfill is None or backfill['completed']:
+            return True
+        if since is None or backfill['oldest_created_at'] is None:
+            return False
+        return backfill['oldest_created_at'] <= _to_timestamp(since)
+
+    async def _start_channel(self, channel: discord.TextChannel,
+                             channel_key: str) -> int:
+        """
+        Premier rattrapage d'un canal : indexe son message le plus récent et
+        prépare le remplissage à rebours de l'historique plus ancien.
+
+        Returns:
+            int: Nombre de messages indexés (0 ou 1)
+        """
+        newest = None
+        async for message in channel.history(limit=1):
+            newest = message
+
+        now = datetime.now(timezone.utc).timestamp()
+        if newest is None:
+            # Canal vide : rien à remplir
+            self._save_sync_state(channel, channel_key, None, True)
+            self._conn.execute(
+                """
+                INSERT INTO backfill_state (
+                    channel_id, guild_id, channel_key, completed, updated_at
+                ) VALUES (?, ?, ?, 1, ?)
+                ON CONFLICT(channel_id) DO UPDATE SET
+                    completed = 1, updated_at = excluded.updated_at
+                """, (channel.id, channel.guild.id, channel_key, now))
+            self._conn.commit()
+            logger.info(f"Index #{channel.name} initialisé (canal vide)")
+            return 0
+
+        row = self._build_row(newest, channel_key)
+        self._write_row(row)
+        self._save_sync_state(channel, channel_key, newest.id, True)
+        # Un remplissage déjà terminé n'est jamais relancé
+        self._conn.execute(
+            """
+            INSERT INTO backfill_state (
+                channel_id, guild_id, channel_key, oldest_message_id,
+                oldest_created_at, newest_created_at, messages_indexed,
+                completed, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, 1, 0, ?)
+            ON CONFLICT(channel_id) DO UPDATE SET
+                oldest_message_id = excluded.oldest_message_id,
+                oldest_created_at = excluded.oldest_created_at,
+                newest_created_at = excluded.newest_created_at,
+                messages_indexed = excluded.messages_indexed,
+                updated_at = excluded.updated_at
+            WHERE backfill_state.completed = 0
+            """, (channel.id, channel.guild.id, channel_key, newest.id,
+                  row['created_at'], row['created_at'], now))
+        self._conn.commit()
+
+        logger.info(f"Index #{channel.name} initialisé au message {newest.id}, "
+                    f"historique plus ancien en remplissage à rebours")
+        return 1
+
+    # ========================================================================
+    # REMPLISSAGE À REBOURS
+    # ========================================================================
+
+    def get_backfill_state(self, channel_id: int) -> Optional[dict]:
+        """Retourne l'état du remplissage à rebours d'un canal (None si aucun)."""
+        row = self._conn.execute(
+            "SELECT * FROM backfill_state WHERE channel_id = ?",
+            (channel_id,)).fetchone()
+        return dict(row) if row else None
+
+    def get_backfill_states(self) -> List[dict]:
+        """Retourne l'état du remplissage à rebours de tous les canaux."""
+        rows = self._conn.execute(
+            "SELECT * FROM backfill_state ORDER BY guild_id, channel_key").fetchall()
+        return [dict(row) for row in rows]
+
+    def store_backfill_page(self, channel_id: int, channel_key: str,
+                            messages: List[discord.Message]):
+        """
+        Indexe une page d'historique plus ancienne que le point de reprise
+        et y déplace le point de reprise. Une page vide termine le remplissage.
+        """
+        now = datetime.now(timezone.utc).timestamp()
+        if not messages:
+            self._conn.execute(
+                "UPDATE backfill_state SET completed = 1, updated_at = ? "
+                "WHERE channel_id = ?", (now, channel_id))
+            self._conn.commit()
+            return
+
+        oldest = min(messages, key=lambda message: message.id)
+        for message in messages:
+            self._write_row(self._build_row(message, channel_key))
+
+        self._conn.execute(
+            """
+            UPDATE backfill_state SET
+                oldest_message_id = ?, oldest_created_at = ?,
+                messages_indexed = messages_indexed + ?, updated_at = ?
+            WHERE channel_id = ?
+            """, (oldest.id, _to_timestamp(oldest.created_at), len(messages),
+                  now, channel_id))
+        self._conn.commit()
+
+    async def sync_channel(self, channel: discord.TextChannel,
+                           channel_key: str) -> int:
+        """
+        Rattrape un canal depuis le dernier message indexé.
+
+        Les messages sont parcourus du plus ancien au plus récent et la
+        progression est enregistrée par lots : un redémarrage reprend là
+        où le rattrapage s'était arrêté.
+
+        Pendant le rattrapage, le canal n'est plus marqué synchronisé : les
+        commandes relisent l'historique Discord jusqu'à ce qu'il soit terminé.
+
+        Returns:
+            int: Nombre de messages indexés
+        """
+        self._caught_up.discard(channel.id)
+        self._conn.execute("UPDATE sync_state SET synced = 0 WHERE channel_id = ?",
+                           (channel.id,))
+        self._conn.commit()
+
+        last_id = self.get_last_message_id(channel.id)
+        if last_id is not None:
+            after = discord.Object(id=last_id)
+            logger.info(
+                f"Rattrapage de l'index pour #{channel.name} (depuis le message {last_id})")
+        else:
+            backfill = self.get_backfill_state(channel.id)
+            if not (backfill and backfill['completed']):
+                indexed = await self._start_channel(channel, channel_key)
+                self._caught_up.add(channel.id)
+                return indexed
+            # Canal vide au premier rattrapage : tout son historique est plus
+            # récent, il est indexé depuis le début sans remplissage à rebours
+            after = None
+            logger.info(f"Rattrapage de l'index pour #{channel.name} (depuis le début)")
+
+        indexed = 0
+        pending = 0
+        async for message in channel.history(limit=None, after=after,
+                                             oldest_first=True):
+            self._write_row(self._build_row(message, channel_key))
+            last_id = message.id
+            indexed += 1
+            pending += 1
+
+            if pending >= SYNC_BATCH_SIZE:
+                self._save_sync_state(channel, channel_key, last_id, False)
+                self._conn.commit()
+                pending = 0
+
+        self._save_sync_state(channel, channel_key, last_id, True)
+        self._conn.commit()
+        self._caught_up.add(channel.id)
+
+        logger.info(f"Index #{channel.name} à jour : {indexed} nouveaux messages")
+        return indexed
+
+    # ========================================================================
+    # REQUÊTES
+    # ========================================================================
+
+    def _row_to_dict(self, row: sqlite3.Row) -> dict:
+        """Convertit une ligne SQLite en dictionnaire exploitable."""
+        data = dict(row)
+        data['mention_ids'] = json.loads(data['mention_ids'])
+        data['created_at'] = datetime.fromtimestamp(data['created_at'],
+                                                    tz=timezone.utc)
+        return data
+
+    def count_messages(self, channel_id: int,
+                       since: Optional[datetime] = None) -> int:
+        """Compte les messages indexés d'un canal depuis une date."""
+        row = self._conn.execute(
+            "SELECT COUNT(*) AS total FROM messages "
+            "WHERE channel_id = ? AND created_at >= ?",
+            (channel_id, _to_timestamp(since) or 0)).fetchone()
+        return row['total']
+
+    def count_messages_with_mentions(self, channel_id: int,
+                                     since: Optional[datetime] = None) -> int:
+        """Compte les messages humains mentionnant au moins une autre personne."""
+        row = self._conn.execute(
+            """
+            SELECT COUNT(*) AS total FROM messages
+            WHERE channel_id = ? AND created_at >= ?
+              AND author_bot = 0 AND unique_mentions > 0
+            """, (channel_id, _to_timestamp(since) or 0)).fetchone()
+        return row['total']
+
+    def _sum_daily_stats(self, column: str, guild_id: int,
+                         since: Optional[datetime]) -> Dict[int, int]:
+        """
+        Somme une colonne de daily_stats par utilisateur depuis une date.
+
+        Les jours entiers viennent des compteurs journaliers ; le début du
+        premier jour (de `since` à minuit UTC) est recompté depuis les
+        messages, pour couvrir exactement la même période que
+        count_messages et la relecture de l'historique.
+        """
+        since_ts = _to_timestamp(since) or 0
+        first_day = -int(-since_ts // SECONDS_PER_DAY)  # premier jour entier
+        rows = self._conn.execute(
+            f"""
+            SELECT user_id, SUM({column}) AS total FROM daily_stats
+            WHERE guild_id = ? AND day >= ?
+            GROUP BY user_id
+            """, (guild_id, first_day)).fetchall()
+        totals = {row['user_id']: row['total'] for row in rows}
+
+        position = 1 if column == 'mentioned' else 2
+        partial = self._conn.execute(
+            """
+            SELECT * FROM messages
+            WHERE channel_id IN (SELECT channel_id FROM sync_state
+                                 WHERE guild_id = ? AND channel_key = ?)
+              AND created_at >= ? AND created_at < ?
+            """, (guild_id, ChannelHelper.RECOMPENSES, since_ts,
+                  first_day * SECONDS_PER_DAY)).fetchall()
+        for row in partial:
+            data = dict(row)
+            data['mention_ids'] = json.loads(data['mention_ids'])
+            for counts in self._daily_counts(data):
+                totals[counts[0]] = totals.get(counts[0], 0) + counts[position]
+
+        return {user_id: total for user_id, total in totals.items() if total > 0}
+
+    def get_mention_totals(self, guild_id: int,
+                           since: Optional[datetime] = None) -> Dict[int, int]:
+        """Mentions reçues dans #recompenses par utilisateur depuis une date."""
+        return self._sum_daily_stats('mentioned', guild_id, since)
+
+    def get_mj_totals(self, guild_id: int,
+                      since: Optional[datetime] = None) -> Dict[int, int]:
+        """Posts MJ (2+ mentions) dans #recompenses par auteur depuis une date."""
+        return self._sum_daily_stats('mj_posts', guild_id, since)
+
+    def get_author_posts(self, channel_id: int, author_id: int,
+                         since: Optional[datetime] = None,
+                         min_unique_mentions: int = 0) -> List[dict]:
+        """Liste les messages d'un auteur, du plus récent au plus ancien."""
+        rows = self._conn.execute(
+            """
+            SELECT * FROM messages
+            WHERE channel_id = ? AND author_id = ? AND created_at >= ?
+              AND unique_mentions >= ?
+            ORDER BY created_at DESC
+            """, (channel_id, author_id, _to_timestamp(since) or 0,
+                  min_unique_mentions)).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def get_mentions_of(self, channel_id: int, user_id: int,
+                        since: Optional[datetime] = None) -> List[dict]:
+        """Liste les messages mentionnant un utilisateur, du plus récent au plus ancien."""
+        rows = self._conn.execute(
+            """
+            SELECT m.* FROM messages m
+            JOIN message_mentions mm ON mm.message_id = m.message_id
+            WHERE m.channel_id = ? AND mm.user_id = ? AND m.created_at >= ?
+            ORDER BY m.created_at DESC
+            """, (channel_id, user_id, _to_timestamp(since) or 0)).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def get_upcoming_quests(self, channel_id: int, user_id: int,
+                            from_date: datetime,
+                            since: Optional[datetime] = None) -> List[dict]:
+        """
+        Liste les quêtes d'un joueur datées à partir de `from_date`, de la plus
+        proche à la plus lointaine, parmi les annonces publiées depuis `since`.
+        """
+        rows = self._conn.execute(
+            """
+            SELECT m.*, qp.quest_date FROM quest_participants qp
+            JOIN messages m ON m.message_id = qp.message_id
+            WHERE qp.channel_id = ? AND qp.user_id = ? AND qp.quest_date >= ?
+              AND m.created_at >= ?
+            ORDER BY qp.quest_date
+            """, (channel_id, user_id, _to_timestamp(from_date),
+                  _to_timestamp(since) or 0)).fetchall()
+
+        quests = []
+        for row in rows:
+            data = self._row_to_dict(row)
+            data['quest_date'] = datetime.fromtimestamp(data['quest_date'],
+                                                        tz=timezone.utc)
+            quests.append(data)
+        return quests
+
+    def count_quest_mentions(self, channel_id: int, user_id: int,
+                             since: Optional[datetime] = None) -> int:
+        """Compte les annonces humaines mentionnant un joueur depuis une date."""
+        row = self._conn.execute(
+            """
+            SELECT COUNT(*) AS total FROM messages m
+            JOIN message_mentions mm ON mm.message_id = m.message_id
+            WHERE m.channel_id = ? AND mm.user_id = ? AND m.created_at >= ?
+              AND m.author_bot = 0
+            """, (channel_id, user_id, _to_timestamp(since) or 0)).fetchone()
+        return row['total']
+
+    def get_activity_counts(
+            self, channel_id: int, user_ids: List[int],
+            since: Optional[datetime] = None
+    ) -> Tuple[Dict[int, int], Dict[int, int]]:
+        """
+        Compte, pour une liste d'utilisateurs, les mentions reçues et les
+        posts MJ (2+ mentions uniques hors auteur).
+
+        Returns:
+            Tuple[Dict[int, int], Dict[int, int]]: (mentions, posts MJ)
+        """
+        mentions_count = {user_id: 0 for user_id in user_ids}
+        posts_mj_count = {user_id: 0 for user_id in user_ids}
+        since_ts = _to_timestamp(since) or 0
+
+        for row in self._conn.execute(
+                """
+                SELECT mm.user_id, COUNT(*) AS total
+                FROM message_mentions mm
+                JOIN messages m ON m.message_id = mm.message_id
+                WHERE m.channel_id = ? AND m.created_at >= ?
+                GROUP BY mm.user_id
+                """, (channel_id, since_ts)):
+            if row['user_id'] in mentions_count:
+                mentions_count[row['user_id']] = row['total']
+
+        for row in self._conn.execute(
+                """
+                SELECT author_id, COUNT(*) AS total FROM messages
+                WHERE channel_id = ? AND created_at >= ? AND unique_mentions >= 2
+                GROUP BY author_id
+                """, (channel_id, since_ts)):
+            if row['author_id'] in posts_mj_count:
+                posts_mj_count[row['author_id']] = row['total']
+
+        return mentions_count, posts_mj_count
+
+    def get_status(self) -> dict:
+        """Retourne un résumé de l'état de l'index."""
+        total = self._conn.execute(
+            "SELECT COUNT(*) AS total FROM messages").fetchone()['total']
+        channels = self._conn.execute(
+            "SELECT COUNT(*) AS total FROM sync_state WHERE synced = 1"
+        ).fetchone()['total']
+        backfilling = self._conn.execute(
+            "SELECT COUNT(*) AS total FROM backfill_state WHERE completed = 0"
+        ).fetchone()['total']
+        return {
+            'path': self.db_path,
+            'total_messages': total,
+            'synced_channels': channels,
+            'backfilling_channels': backfilling
+        }
+
+    def close(self):
+        """Ferme la connexion SQLite."""
+        self._conn.close()
+
+
+# Instance globale
+message_index: Optional[MessageIndex] = None
+
+
+def init_message_index(db_path: str = DEFAULT_DB_PATH) -> MessageIndex:
+    """Initialise l'index local des messages."""
+    global message_index
+    message_index = MessageIndex(db_path)
+    logger.info(f"Index des messages initialisé ({db_path})")
+    return message_index
+
+
+def get_message_index() -> Optional[MessageIndex]:
+    """Récupère l'instance de l'index des messages."""
+    return message_index
@@ -0,0 +1,63 @@
+"""
+Règles de comptage des classements et compteurs incrémentaux.
+
+Les commandes de classement replient chaque message dans ces compteurs au
+fil du parcours de l'historique, sans conserver les messages en mémoire.
+Les mêmes règles sont appliquées par l'index local (utils/message_index.py).
+"""
+
+from collections import defaultdict
+from typing import Iterable, Set
+
+import discord
+
+# Nombre minimum de mentions pour qu'un post compte comme une session MJ
+MJ_POST_MIN_MENTIONS = 2
+
+
+def mentioned_user_ids(author_id: int, mention_ids: Iterable[int]) -> Set[int]:
+    """Mentions uniques d'un message, auto-mention exclue."""
+    return {user_id for user_id in mention_ids if user_id != author_id}
+
+
+def is_mj_post(mention_count: int) -> bool:
+    """Indique si un message compte comme un post MJ."""
+    return mention_count >= MJ_POST_MIN_MENTIONS
+
+
+class MentionTally:
+    """Compte les mentions reçues par joueur (auteurs humains uniquement)."""
+
+    def __init__(self):
+        self.mention_counts = defaultdict(int)
+        self.total_messages = 0
+        self.messages_with_mentions = 0
+
+    def add(self, message: discord.Message):
+        """Ajoute un message au décompte."""
+        self.total_messages += 1
+
+        # Ignorer les messages de bots
+        if message.author.bot:
+            return
+
+        mentioned_users = mentioned_user_ids(message.author.id,
+                                             (user.id for user in message.mentions))
+        if mentioned_users:
+            self.messages_with_mentions += 1
+            for user_id in mentioned_users:
+                self.mention_counts[user_id] += 1
+
+
+class MjPostTally:
+    """Compte les posts MJ par auteur."""
+
+    def __init__(self):
+        self.mj_stats = defaultdict(int)
+        self.total_messages = 0
+
+    def add(self, message: discord.Message):
+        """Ajoute un message au décompte."""
+        self.total_messages += 1
+        if is_mj_post(len(message.mentions)):
+            self.mj_stats[message.author.id] += 1
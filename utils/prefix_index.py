@@ -0,0 +1,102 @@
+"""
+Index de préfixes pour l'autocomplétion des commandes slash.
+
+Les noms sont normalisés (minuscules, sans accents ni ponctuation) et rangés
+dans des tableaux triés : une saisie est complétée par recherche dichotomique
+(bisect), sans parcourir toute la liste ni appeler le réseau. Chaque mot d'un
+nom est aussi indexé, pour que "feu" propose "Épée de feu" après les noms
+qui commencent par "feu".
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import Iterable, List, Tuple
+
+# Nombre maximum de suggestions acceptées par Discord
+MAX_CHOICES = 25
+
+_PUNCTUATION = re.compile(r'[^\w\s]')
+
+
+def fold_accents(text: str) -> str:
+    """Retire les accents ('épée' -> 'epee')."""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def normalize_key(text: str) -> str:
+    """Clé de comparaison : minuscules, sans ponctuation ni accents, espaces réduits."""
+    return ' '.join(fold_accents(_PUNCTUATION.sub('', text.lower())).split())
+
+
+class PrefixIndex:
+    """Tableaux triés (clé normalisée, nom affiché) interrogés par bisect."""
+
+    def __init__(self, names: Iterable[str]):
+        """
+        Args:
+            names: Noms à proposer (noms vides et doublons à la casse/aux accents près ignorés)
+        """
+        full: List[Tuple[str, str]] = []
+        words: List[Tuple[str, str]] = []
+        seen = set()
+
+        for name in names:
+            name = (name or '').strip()
+            key = normalize_key(name)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            full.append((key, name))
+
+            # Suffixes commençant à chaque mot suivant ("de feu", "feu")
+            parts = key.split(' ')
+            for i in range(1, len(parts)):
+                words.append((' '.join(parts[i:]), name))
+
+        full.sort()
+        words.sort()
+        self._full_keys = [key for key, _ in full]
+        self._full_names = [name for _, name in full]
+        self._word_keys = [key for key, _ in words]
+        self._word_names = [name for _, name in words]
+
+    def __len__(self) -> int:
+        return len(self._full_keys)
+
+    @staticmethod
+    def _scan(keys: List[str], names: List[str], prefix: str, limit: int,
+              found: List[str], seen: set):
+        """Ajoute à `found` les noms dont la clé commence par `prefix`."""
+        position = bisect_left(keys, prefix)
+        while position < len(keys) and len(found) < limit:
+            if not keys[position].startswith(prefix):
+                break
+            name = names[position]
+            if name not in seen:
+                seen.add(name)
+                found.append(name)
+            position += 1
+
+    def complete(self, text: str, limit: int = MAX_CHOICES) -> List[str]:
+        """
+        Noms qui commencent par `text` (ordre alphabétique), puis ceux dont un
+        mot commence par `text`.
+
+        Args:
+            text: Saisie en cours
+            limit: Nombre maximum de noms
+
+        Returns:
+            List[str]: Noms proposés
+        """
+        prefix = normalize_key(text)
+        if not prefix:
+            return self._full_names[:limit]
+
+        found: List[str] = []
+        seen = set()
+        self._scan(self._full_keys, self._full_names, prefix, limit, found, seen)
+        self._scan(self._word_keys, self._word_names, prefix, limit, found, seen)
+        return found
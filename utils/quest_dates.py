@@ -0,0 +1,241 @@
+"""
+Extraction de la date d'une quête depuis le texte d'une annonce.
+
+Les MJ écrivent les dates dans de nombreux formats (JJ/MM, JJ/MM/AAAA,
+"28 juin", "june 28"...). Utilisé par /mesquetes et par l'index local des
+messages, qui extrait la date une seule fois à l'ingestion.
+
+Les tables sont construites une fois au chargement du module. Le message
+est parcouru une fois pour repérer les positions où une date peut
+commencer ; à chacune, une seule expression relève tous les formats qui y
+correspondent. Le premier format (par ordre de priorité) dont une
+correspondance donne une date valide l'emporte, comme avec l'ancienne
+boucle de re.finditer format par format.
+
+Benchmark et comparaison avec l'ancienne implémentation :
+benchmarks/quest_dates_benchmark.py
+"""
+
+import logging
+import re
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MOIS_FR = r'(janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)'
+_MOIS_FR_ABREGES = r'(jan|fév|mar|avr|mai|jun|jul|aoû|sep|oct|nov|déc)'
+_MOIS_EN = r'(january|february|march|april|may|june|july|august|september|october|november|december)'
+_MOIS_EN_ABREGES = r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)'
+
+# Formats reconnus, du plus prioritaire au moins prioritaire : (motif, type)
+# type : 'numerique' (JJ/MM[/AA[AA]]), 'iso' (AAAA/MM/JJ) ou 'texte' (JJ mois [AAAA])
+DATE_FORMATS = [
+    # === FORMATS AVEC ANNÉE COMPLÈTE ===
+    (r'(\d{1,2})[/\-\.](\d{1,2})[/\-\.](\d{4})', 'numerique'),  # JJ/MM/AAAA, JJ-MM-AAAA, JJ.MM.AAAA
+    (r'(\d{1,2})\s+(\d{1,2})\s+(\d{4})', 'numerique'),  # JJ MM AAAA
+    (r'(\d{4})[/\-\.](\d{1,2})[/\-\.](\d{1,2})', 'iso'),  # AAAA/MM/JJ (format ISO inversé)
+
+    # === FORMATS AVEC ANNÉE COURTE ===
+    (r'(\d{1,2})[/\-\.](\d{1,2})[/\-\.](\d{2})', 'numerique'),  # JJ/MM/AA, JJ-MM-AA, JJ.MM.AA
+    (r'(\d{1,2})\s+(\d{1,2})\s+(\d{2})', 'numerique'),  # JJ MM AA
+
+    # === FORMATS SANS ANNÉE (priorité aux plus spécifiques) ===
+    (r'(\d{1,2})[/\-\.](\d{1,2})(?:\s+[aà]\s+\d{1,2}[h:]?\d{0,2})', 'numerique'),  # JJ/MM à 14h30
+    (r'(\d{1,2})[/\-\.](\d{1,2})(?=\s+[^\d/\-\.])', 'numerique'),  # JJ/MM suivi d'un mot
+    (r'(\d{1,2})[/\-\.](\d{1,2})(?![/\-\.\d])', 'numerique'),  # JJ/MM pas suivi de chiffres
+    (r'(\d{1,2})\s+(\d{1,2})(?!\s+\d{2,4})', 'numerique'),  # JJ MM (pas suivi d'année)
+
+    # === FORMATS TEXTUELS FRANÇAIS ===
+    (r'(\d{1,2})\s+' + _MOIS_FR + r'\s+(\d{4})', 'texte'),
+    (r'(\d{1,2})\s+' + _MOIS_FR + r'\s+(\d{2})', 'texte'),
+    (r'(\d{1,2})\s+' + _MOIS_FR + r'(?!\s+\d)', 'texte'),
+    (r'(\d{1,2})\s+' + _MOIS_FR_ABREGES + r'\.?\s+(\d{4})', 'texte'),
+    (r'(\d{1,2})\s+' + _MOIS_FR_ABREGES + r'\.?(?!\s+\d)', 'texte'),
+
+    # === FORMATS ANGLAIS ===
+    (r'(\d{1,2})\s+' + _MOIS_EN + r'\s+(\d{4})', 'texte'),
+    (r'(\d{1,2})\s+' + _MOIS_EN + r'(?!\s+\d)', 'texte'),
+    (r'(\d{1,2})\s+' + _MOIS_EN_ABREGES + r'\.?\s+(\d{4})', 'texte'),
+    (r'(\d{1,2})\s+' + _MOIS_EN_ABREGES + r'\.?(?!\s+\d)', 'texte'),
+
+    # === FORMATS AVEC MOTS-CLÉS ===
+    (r'le\s+(\d{1,2})[/\-\.](\d{1,2})(?:[/\-\.](\d{2,4}))?', 'numerique'),  # "le 28/06" ou "le 28/06/2025"
+    (r'(\d{1,2})[/\-\.](\d{1,2})\s+prochain', 'numerique'),  # "28/06 prochain"
+    (r'(\d{1,2})[/\-\.](\d{1,2})\s+à\s+', 'numerique'),  # "28/06 à 14h30"
+]
+
+# Dictionnaire pour convertir les mois textuels (FR + EN)
+MOIS_MAPPING = {
+    # Français complet
+    'janvier': 1, 'février': 2, 'mars': 3, 'avril': 4,
+    'mai': 5, 'juin': 6, 'juillet': 7, 'août': 8,
+    'septembre': 9, 'octobre': 10, 'novembre': 11, 'décembre': 12,
+    # Français abrégé
+    'jan': 1, 'fév': 2, 'mar': 3, 'avr': 4,
+    'jun': 6, 'jul': 7, 'aoû': 8,
+    'sep': 9, 'oct': 10, 'nov': 11, 'déc': 12,
+    # Anglais complet
+    'january': 1, 'february': 2, 'march': 3, 'april': 4,
+    'may': 5, 'june': 6, 'july': 7, 'august': 8,
+    'september': 9, 'october': 10, 'november': 11, 'december': 12,
+    # Anglais abrégé (uniquement ceux différents du français)
+    'feb': 2, 'apr': 4, 'aug': 8, 'dec': 12
+}
+
+
+# Début commun à tous les formats : repère en un parcours les seules positions
+# où une date peut commencer (les chiffres des mentions sont écartés)
+_STARTS = re.compile(
+    r'\d(?=\d?(?:[/\-\.]\d|\s+[\djfmasond])|\d{3}[/\-\.]\d)|l(?=e\s+\d)',
+    re.IGNORECASE)
+
+
+def _build_scanner() -> Tuple[re.Pattern, List[Tuple[int, int, str]]]:
+    """
+    Assemble tous les formats en une seule expression.
+
+    Chaque format est placé dans une assertion avant optionnelle et capturé :
+    à chaque position du texte, on sait en une fois quels formats y
+    commencent.
+
+    Returns:
+        Tuple: (expression compilée, [(groupe du format, nb de groupes, type)])
+    """
+    parts = []
+    layout = []
+    group = 0
+    for pattern, kind in DATE_FORMATS:
+        inner = re.compile(pattern).groups
+        group += 1
+        layout.append((group, inner, kind))
+        group += inner
+        parts.append(f"(?:(?=({pattern})))?")
+
+    return re.compile("".join(parts), re.IGNORECASE), layout
+
+
+_SCANNER, _LAYOUT = _build_scanner()
+
+
+def determine_best_year(jour: int, mois: int, now: datetime) -> int:
+    """
+    Détermine l'année la plus logique pour une date JJ/MM sans année.
+
+    LOGIQUE INTELLIGENTE :
+    - Date future cette année → année actuelle
+    - Date passée de moins de 30 jours → année actuelle (vraiment passée)
+    - Date passée de plus de 30 jours → année prochaine (probablement futur)
+
+    Exemple (si on est le 30/01/2026) :
+    - "15/02" → 15/02/2026 (futur proche)
+    - "15/01" → 15/01/2026 (passé de 15j, on garde cette année)
+    - "15/12" → 15/12/2026 (passé de 46j, donc c'est l'année prochaine... non en fait futur)
+
+    En fait : si passé de plus de 30j, c'est probablement l'année suivante
+    """
+    current_year = now.year
+    seuil_jours_passes = 30  # Seuil pour considérer que c'est l'année suivante
+
+    try:
+        date_current_year = datetime(current_year, mois, jour, tzinfo=timezone.utc)
+        days_diff = (date_current_year - now).days
+
+        # Date future ou aujourd'hui → année actuelle
+        if days_diff >= 0:
+            return current_year
+
+        # Date passée récemment (< 30 jours) → vraiment passée, année actuelle
+        if days_diff >= -seuil_jours_passes:
+            return current_year
+
+        # Date passée de longtemps (> 30 jours) → probablement année prochaine
+        return current_year + 1
+
+    except ValueError:
+        # Date invalide (ex: 29/02 année non bissextile)
+        return current_year
+
+
+def _resolve_date(kind: str, groups: tuple, now: datetime) -> Optional[datetime]:
+    """
+    Convertit les groupes d'une correspondance en date.
+
+    Lève ValueError si la correspondance ne donne pas une date valide.
+    """
+    if kind == 'texte':
+        # Nom de mois reconnu seulement tel quel (minuscules)
+        if groups[1] not in MOIS_MAPPING:
+            raise ValueError(f"mois non reconnu : {groups[1]}")
+        jour = int(groups[0])
+        mois = MOIS_MAPPING[groups[1]]
+        annee_texte = groups[2] if len(groups) >= 3 else None
+
+    elif kind == 'iso':
+        # Format AAAA/MM/JJ (ISO inversé)
+        annee = int(groups[0])
+        mois = int(groups[1])
+        jour = int(groups[2])
+        annee_texte = None
+
+    else:
+        # Format numérique standard JJ/MM[/AA[AA]]
+        jour = int(groups[0])
+        mois = int(groups[1])
+        annee_texte = groups[2] if len(groups) >= 3 else None
+
+    if kind != 'iso':
+        if annee_texte:
+            annee = int(annee_texte)
+            if annee < 100:
+                annee = 2000 + annee if annee < 50 else 1900 + annee
+        else:
+            annee = determine_best_year(jour, mois, now)
+
+    # Validation des valeurs
+    if not (1 <= jour <= 31 and 1 <= mois <= 12):
+        return None
+
+    return datetime(annee, mois, jour, tzinfo=timezone.utc)
+
+
+def extract_quest_date(text: str, now: datetime) -> tuple:
+    """
+    Extrait une date du texte avec MAXIMUM de formats possibles.
+    Retourne (datetime_obj, date_string_found) ou (None, None)
+    """
+    # Nettoyer le texte pour éviter les faux positifs
+    text_clean = text.replace('h', ':').replace('H', ':')  # "14h30" -> "14:30"
+
+    # Un seul parcours : correspondances de chaque format, dans l'ordre du texte
+    candidates = [[] for _ in _LAYOUT]
+    for start_match in _STARTS.finditer(text_clean):
+        start = start_match.start()
+        match = _SCANNER.match(text_clean, start)
+        if match.lastindex is None:
+            continue
+        groups = match.groups()
+        for rank, (group, inner, _) in enumerate(_LAYOUT):
+            found = groups[group - 1]
+            if found is not None:
+                candidates[rank].append((start, start + len(found), found,
+                                         groups[group:group + inner]))
+
+    for rank, (_, _, kind) in enumerate(_LAYOUT):
+        # Correspondances sans chevauchement, comme re.finditer sur ce format
+        last_end = -1
+        for start, end, date_string_found, groups in candidates[rank]:
+            if start < last_end:
+                continue
+            last_end = end
+
+            try:
+                quest_date = _resolve_date(kind, groups, now)
+            except (ValueError, IndexError) as e:
+                logger.debug(f"Erreur parsing date '{date_string_found}': {e}")
+                continue
+
+            if quest_date:
+                return quest_date, date_string_found
+
+    return None, None
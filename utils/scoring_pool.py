@@ -0,0 +1,262 @@
+"""
+Score flou des recherches dans un petit pool de processus.
+
+SequenceMatcher est du pur Python : exécuté dans la boucle asyncio, il
+bloque le heartbeat de la gateway et retarde toutes les autres commandes.
+Les recherches sont donc envoyées à des processus dédiés, qui reçoivent une
+copie des lignes à leur démarrage (une fois par version du catalogue) et y
+construisent leur propre index de score (utils/batch_scorer.build_scorer).
+
+Chaque recherche a une échéance : passé ce délai, ou si le pool est
+indisponible, search() retourne None et l'appelant répond avec une
+recherche par préfixe, bien moins coûteuse.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Sequence, Tuple
+
+from config import Config
+from utils.batch_scorer import build_scorer
+
+logger = logging.getLogger(__name__)
+
+# Index construit dans chaque processus du pool
+_worker_index = None
+
+
+def _init_worker(rows: Sequence[Sequence[str]], weights: Sequence[float]):
+    """Initialise un processus du pool avec sa copie des lignes."""
+    global _worker_index
+    _worker_index = build_scorer(rows, weights)
+
+
+def _worker_search(search_term: str, limit: int,
+                   min_similarity: float) -> List[Tuple[int, float]]:
+    """Recherche exécutée dans un processus du pool."""
+    return _worker_index.search(search_term, limit, min_similarity)
+
+
+def _worker_ready() -> int:
+    """Tâche vide : force le démarrage d'un processus."""
+    return len(_worker_index) if _worker_index is not None else 0
+
+
+class ScoringPool:
+    """Pool de processus pour le score flou, avec échéance par recherche."""
+
+    def __init__(self, workers: int = Config.SEARCH_POOL_WORKERS,
+                 deadline: float = Config.SEARCH_DEADLINE):
+        """
+        Args:
+            workers: Nombre de processus (0 : pool désactivé)
+            deadline: Délai maximum d'une recherche (secondes)
+        """
+        self.workers = workers
+        self.deadline = deadline
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._version = None
+        # Pool d'une nouvelle version, en démarrage (remplace _executor une fois prêt)
+        self._pending: Optional[ProcessPoolExecutor] = None
+        self._pending_version = None
+        # Le remplacement se fait depuis un thread du pool
+        self._lock = threading.Lock()
+        self.stats = {'searches': 0, 'timeouts': 0, 'failures': 0, 'restarts': 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def _start(self, rows: Sequence[Sequence[str]],
+               weights: Sequence[float]) -> ProcessPoolExecutor:
+        """Démarre un pool avec sa copie des lignes."""
+        # spawn : pas de fork d'un processus qui a déjà des threads et une boucle asyncio
+        context = multiprocessing.get_context('spawn')
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(list(rows), tuple(weights))
+        )
+
+    def _load(self, version, rows: Sequence[Sequence[str]], weights: Sequence[float]):
+        """
+        Démarre un pool avec les lignes d'une nouvelle version.
+
+        Le pool courant continue de servir les recherches pendant que le
+        nouveau démarre ; il ne le remplace qu'une fois ses processus prêts
+        (voir _on_ready), et les recherches déjà lancées s'y terminent.
+        """
+        executor = self._start(rows, weights)
+        with self._lock:
+            self.stats['restarts'] += 1
+            if self._executor is None:
+                # Premier chargement : rien à garder en attendant
+                self._executor, self._version = executor, version
+                stale = None
+            else:
+                stale = self._pending
+                self._pending, self._pending_version = executor, version
+
+        if stale is not None:
+            # Version remplacée avant d'avoir servi
+            stale.shutdown(wait=False)
+
+        # Démarrer les processus tout de suite plutôt qu'à la première recherche
+        ready = [executor.submit(_worker_ready) for _ in range(self.workers)]
+        for future in ready:
+            future.add_done_callback(
+                lambda done, executor=executor, version=version, ready=ready:
+                    self._on_ready(executor, version, ready, done))
+        logger.info(f"Pool de recherche démarré: {self.workers} processus, "
+                    f"{len(rows)} lignes (version {version})")
+
+    def _on_ready(self, executor: ProcessPoolExecutor, version,
+                  ready: List[Future], done: Future):
+        """
+        Remplace le pool courant par le nouveau une fois ses processus
+        démarrés, ou abandonne ce dernier s'il n'a pas pu démarrer.
+        Appelée depuis un thread du pool.
+        """
+        failed = done.cancelled() or done.exception() is not None
+        if not failed and not all(future.done() for future in ready):
+            return
+
+        with self._lock:
+            if self._pending is not executor:
+                return
+            self._pending, self._pending_version = None, None
+            if failed:
+                self.stats['failures'] += 1
+                old = executor
+            else:
+                old = self._executor
+                self._executor, self._version = executor, version
+
+        if failed:
+            logger.error(f"Pool de recherche (version {version}) non démarré: "
+                         f"{done.exception() if not done.cancelled() else 'annulé'}")
+        else:
+            logger.info(f"Pool de recherche prêt (version {version})")
+        # Sans annuler : les recherches en cours sur l'ancien pool se terminent
+        old.shutdown(wait=False)
+
+    def _executor_for(self, version) -> Optional[ProcessPoolExecutor]:
+        """Pool chargé avec une version des lignes (prêt ou en démarrage)."""
+        with self._lock:
+            if self._executor is not None and self._version == version:
+                return self._executor
+            if self._pending is not None and self._pending_version == version:
+                return self._pending
+            return None
+
+    def prepare(self, version, rows: Sequence[Sequence[str]], weights: Sequence[float]):
+        """Charge une nouvelle version des lignes à l'avance (hors recherche)."""
+        if self.enabled and self._executor_for(version) is None:
+            self._load(version, rows, weights)
+
+    async def search(self, version, rows: Sequence[Sequence[str]], weights: Sequence[float],
+                     search_term: str, limit: int,
+                     min_similarity: float) -> Optional[List[Tuple[int, float]]]:
+        """
+        Recherche floue dans le pool.
+
+        Args:
+            version: Version des lignes (le pool est rechargé quand elle change)
+            rows: Lignes à champs pondérés (copiées dans les processus)
+            weights: Poids de chaque champ
+            search_term: Terme de recherche
+            limit: Nombre maximum de résultats
+            min_similarity: Score minimum pour garder une ligne
+
+        Returns:
+            (ligne, score) triés par score décroissant, ou None si le pool est
+            désactivé, indisponible ou n'a pas répondu avant l'échéance
+        """
+        if not self.enabled:
+            return None
+
+        self.prepare(version, rows, weights)
+        # Les numéros de ligne renvoyés n'ont de sens que pour cette version :
+        # pendant son démarrage, la recherche attend le nouveau pool
+        executor = self._executor_for(version)
+        if executor is None:
+            self.stats['failures'] += 1
+            return None
+
+        self.stats['searches'] += 1
+        try:
+            future = executor.submit(_worker_search, search_term, limit, min_similarity)
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.deadline)
+
+        except asyncio.TimeoutError:
+            self.stats['timeouts'] += 1
+            future.cancel()
+            logger.warning(f"Recherche '{search_term}' hors délai ({self.deadline}s)")
+            return None
+
+        except BrokenProcessPool as e:
+            # Un processus est mort : le pool sera redémarré à la prochaine recherche
+            self.stats['failures'] += 1
+            logger.error(f"Pool de recherche hors service: {e}")
+            self._discard(executor)
+            return None
+
+        except Exception as e:
+            self.stats['failures'] += 1
+            logger.error(f"Erreur dans le pool de recherche: {e}")
+            return None
+
+    def _discard(self, executor: ProcessPoolExecutor):
+        """Oublie un pool hors service et arrête ses processus."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor, self._version = None, None
+            if self._pending is executor:
+                self._pending, self._pending_version = None, None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        """Arrête le pool (à l'arrêt du bot), sans attendre les recherches en cours."""
+        with self._lock:
+            executors = [executor for executor in (self._executor, self._pending)
+                         if executor is not None]
+            self._executor = self._version = None
+            self._pending = self._pending_version = None
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if executors:
+            logger.info("Pool de recherche arrêté")
+
+    def get_status(self) -> dict:
+        """Retourne l'état du pool."""
+        return {
+            'workers': self.workers,
+            'deadline': self.deadline,
+            'running': self._executor is not None,
+            'warming': self._pending is not None,
+            **self.stats
+        }
+
+
+# Instance globale
+scoring_pool: Optional[ScoringPool] = None
+
+
+def init_scoring_pool() -> ScoringPool:
+    """Initialise le pool de recherche (les processus démarrent au premier usage)."""
+    global scoring_pool
+    scoring_pool = ScoringPool()
+    return scoring_pool
+
+
+def get_scoring_pool() -> ScoringPool:
+    """Récupère le pool de recherche (créé au premier appel)."""
+    global scoring_pool
+    if scoring_pool is None:
+        scoring_pool = ScoringPool()
+    return scoring_pool
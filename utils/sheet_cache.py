@@ -0,0 +1,342 @@
+"""
+Cache mémoire des feuilles Google Sheets (exports CSV).
+
+Chaque feuille est gardée en mémoire déjà analysée :
+- fraîche (moins de SHEET_CACHE_TTL secondes) : servie directement ;
+- périmée : servie immédiatement, et rechargée en tâche de fond ;
+- absente : téléchargée et analysée avant de répondre.
+
+Les rechargements envoient If-None-Match / If-Modified-Since quand Google
+a fourni un ETag ou un Last-Modified, et comparent sinon l'empreinte du
+CSV : une feuille inchangée n'est pas réanalysée.
+
+Chaque feuille analysée est aussi enregistrée sur disque (data/sheets/,
+une ligne JSON d'en-tête puis une ligne JSON par ligne de la feuille).
+Ces instantanés sont rechargés au démarrage du bot : les commandes
+répondent tout de suite, et restent servies si Google est injoignable.
+
+Quand une feuille change, chaque ligne analysée est comparée par empreinte
+à la version précédente : les lignes inchangées gardent leur objet
+d'origine. Les structures dérivées (catalogue, index...) reconnaissent
+ainsi les lignes déjà traitées et ne recalculent que les lignes modifiées.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config import Config
+from utils.http_client import get_http_session
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                                    "data", "sheets")
+
+# Version du format des instantanés (les autres versions sont ignorées)
+SNAPSHOT_VERSION = 1
+
+
+def row_digest(row: Any) -> bytes:
+    """Empreinte d'une ligne analysée (dictionnaire, liste...)."""
+    encoded = json.dumps(row, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=16).digest()
+
+
+class SheetEntry:
+    """Feuille analysée et métadonnées de validation."""
+
+    __slots__ = ('data', 'fetched_at', 'etag', 'last_modified', 'digest',
+                 'row_digests', 'changed_rows')
+
+    def __init__(self, data: Any, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None, digest: str = '',
+                 row_digests: Optional[List[bytes]] = None):
+        self.data = data
+        self.fetched_at = time.monotonic()
+        self.etag = etag
+        self.last_modified = last_modified
+        self.digest = digest
+        # Empreinte de chaque ligne (calculée à la première comparaison)
+        self.row_digests = row_digests
+        # Lignes nouvelles ou modifiées lors du dernier changement
+        self.changed_rows = 0
+
+
+class SheetCache:
+    """Cache TTL + stale-while-revalidate des exports CSV Google Sheets."""
+
+    def __init__(self, ttl: float = Config.SHEET_CACHE_TTL,
+                 snapshot_dir: str = DEFAULT_SNAPSHOT_DIR):
+        self.ttl = ttl
+        self.snapshot_dir = snapshot_dir
+        self._entries: Dict[str, SheetEntry] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self.stats = {'hits': 0, 'stale': 0, 'misses': 0,
+                      'not_modified': 0, 'reparsed': 0, 'changed_rows': 0}
+
+    async def get(self, url: str, parse: Callable[[str], Any]) -> Any:
+        """
+        Retourne la feuille `url` analysée par `parse`.
+
+        Args:
+            url: URL d'export CSV
+            parse: Fonction CSV brut -> données (appelée seulement si le CSV a changé)
+
+        Raises:
+            Exception: Si la feuille n'est pas en cache et que le téléchargement échoue
+        """
+        entry = self._entries.get(url)
+        if entry is None:
+            # Les appels simultanés attendent le même téléchargement
+            self.stats['misses'] += 1
+            entry = await asyncio.shield(self._schedule_refresh(url, parse))
+            return entry.data
+
+        if time.monotonic() - entry.fetched_at < self.ttl:
+            self.stats['hits'] += 1
+        else:
+            self.stats['stale'] += 1
+            self._schedule_refresh(url, parse)
+        return entry.data
+
+    async def refresh(self, url: str, parse: Callable[[str], Any]) -> Any:
+        """
+        Recharge la feuille `url` maintenant, même si elle est encore fraîche
+        (utilisé par le préchargement, jamais par les commandes).
+
+        Raises:
+            Exception: Si le téléchargement échoue
+        """
+        entry = await asyncio.shield(self._schedule_refresh(url, parse))
+        return entry.data
+
+    def _schedule_refresh(self, url: str, parse: Callable[[str], Any]) -> asyncio.Task:
+        """Lance un rechargement en tâche de fond (un seul à la fois par feuille)."""
+        if url in self._refreshing:
+            return self._refreshing[url]
+
+        task = asyncio.ensure_future(self._refresh(url, parse))
+        self._refreshing[url] = task
+
+        def _on_done(done: asyncio.Task, url=url):
+            self._refreshing.pop(url, None)
+            if not done.cancelled() and done.exception() is not None:
+                logger.warning(f"Rechargement échoué ({url}): {done.exception()}")
+
+        task.add_done_callback(_on_done)
+        return task
+
+    async def _refresh(self, url: str, parse: Callable[[str], Any]) -> SheetEntry:
+        """Télécharge la feuille, avec requête conditionnelle si possible."""
+        previous = self._entries.get(url)
+        headers = {}
+        if previous and previous.etag:
+            headers['If-None-Match'] = previous.etag
+        if previous and previous.last_modified:
+            headers['If-Modified-Since'] = previous.last_modified
+
+        session = await get_http_session()
+        logger.info(f"Récupération des données depuis: {url}")
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304 and previous:
+                self.stats['not_modified'] += 1
+                previous.fetched_at = time.monotonic()
+                return previous
+
+            if response.status != 200:
+                raise Exception(f"Erreur HTTP {response.status}: {await response.text()}")
+
+            content = await response.text()
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+
+        # Empreinte, analyse et comparaison des lignes hors de la boucle asyncio
+        digest, entry = await asyncio.to_thread(self._analyze, previous, content, parse)
+        changed = entry is not None
+        if changed:
+            self.stats['reparsed'] += 1
+            entry.etag, entry.last_modified, entry.digest = etag, last_modified, digest
+            self.stats['changed_rows'] += entry.changed_rows
+            logger.info(f"Feuille modifiée: {entry.changed_rows}/{len(entry.data)} "
+                        f"ligne(s) nouvelle(s) ou modifiée(s) ({url})")
+        else:
+            # Contenu identique : garder les données déjà analysées
+            self.stats['not_modified'] += 1
+            entry = SheetEntry(previous.data, etag, last_modified, digest,
+                               previous.row_digests)
+        self._entries[url] = entry
+
+        if changed:
+            try:
+                await asyncio.to_thread(self._write_snapshot, url, entry)
+            except Exception as e:
+                logger.warning(f"Impossible d'enregistrer l'instantané de {url}: {e}")
+        return entry
+
+    @classmethod
+    def _analyze(cls, previous: Optional[SheetEntry], content: str,
+                 parse: Callable[[str], Any]) -> Tuple[str, Optional[SheetEntry]]:
+        """
+        Empreinte du CSV, puis analyse et comparaison des lignes s'il a
+        changé (exécuté dans un thread).
+
+        Returns:
+            Tuple (empreinte, nouvelle entrée ou None si le contenu est identique)
+        """
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        if previous and previous.digest == digest:
+            return digest, None
+        return digest, cls._diff_rows(previous, parse(content))
+
+    @staticmethod
+    def _diff_rows(previous: Optional[SheetEntry], data: Any) -> SheetEntry:
+        """
+        Compare les nouvelles lignes à la version précédente : une ligne
+        inchangée est remplacée par l'objet précédent (même identité).
+        """
+        if not isinstance(data, list):
+            return SheetEntry(data)
+
+        digests = [row_digest(row) for row in data]
+        if previous is None or not isinstance(previous.data, list):
+            entry = SheetEntry(data, row_digests=digests)
+            entry.changed_rows = len(data)
+            return entry
+
+        if previous.row_digests is None:
+            previous.row_digests = [row_digest(row) for row in previous.data]
+
+        # Lignes précédentes par empreinte (les doublons sont repris dans l'ordre)
+        reusable: Dict[bytes, List[Any]] = {}
+        for row, digest in zip(previous.data, previous.row_digests):
+            reusable.setdefault(digest, []).append(row)
+        for rows in reusable.values():
+            rows.reverse()
+
+        changed = 0
+        for i, digest in enumerate(digests):
+            rows = reusable.get(digest)
+            if rows:
+                data[i] = rows.pop()
+            else:
+                changed += 1
+
+        entry = SheetEntry(data, row_digests=digests)
+        entry.changed_rows = changed
+        return entry
+
+    # ========================================================================
+    # INSTANTANÉS SUR DISQUE
+    # ========================================================================
+
+    def _snapshot_path(self, url: str) -> str:
+        """Chemin de l'instantané d'une feuille."""
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.snapshot_dir, f"{name}.jsonl")
+
+    def _write_snapshot(self, url: str, entry: SheetEntry):
+        """Écrit l'instantané d'une feuille (remplacement atomique)."""
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        path = self._snapshot_path(url)
+        header = {
+            'version': SNAPSHOT_VERSION,
+            'url': url,
+            'fetched_at': time.time(),
+            'etag': entry.etag,
+            'last_modified': entry.last_modified,
+            'digest': entry.digest,
+            'rows': len(entry.data)
+        }
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(header, ensure_ascii=False) + "\n")
+            for row in entry.data:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, path)
+
+    def load_snapshots(self) -> int:
+        """
+        Charge les instantanés enregistrés. Leur âge est conservé : un
+        instantané plus vieux que le TTL est servi puis rechargé en fond.
+
+        Returns:
+            int: Nombre de feuilles chargées
+        """
+        if not os.path.isdir(self.snapshot_dir):
+            return 0
+
+        loaded = 0
+        for filename in sorted(os.listdir(self.snapshot_dir)):
+            if not filename.endswith(".jsonl"):
+                continue
+            path = os.path.join(self.snapshot_dir, filename)
+            try:
+                with open(path, encoding='utf-8') as f:
+                    header = json.loads(f.readline())
+                    if header.get('version') != SNAPSHOT_VERSION:
+                        continue
+                    data = [json.loads(line) for line in f if line.strip()]
+            except (OSError, ValueError) as e:
+                logger.warning(f"Instantané illisible ignoré ({filename}): {e}")
+                continue
+
+            if len(data) != header.get('rows'):
+                logger.warning(f"Instantané incomplet ignoré ({filename})")
+                continue
+
+            url = header['url']
+            if url in self._entries:
+                continue
+
+            entry = SheetEntry(data, header.get('etag'), header.get('last_modified'),
+                               header.get('digest', ''))
+            entry.fetched_at -= max(0.0, time.time() - header['fetched_at'])
+            self._entries[url] = entry
+            loaded += 1
+
+        logger.info(f"{loaded} feuille(s) chargée(s) depuis les instantanés")
+        return loaded
+
+    def peek(self, url: str) -> Any:
+        """
+        Retourne la feuille en cache sans jamais la télécharger (même périmée).
+
+        Returns:
+            Données analysées, ou None si la feuille n'a jamais été chargée
+        """
+        entry = self._entries.get(url)
+        return entry.data if entry is not None else None
+
+    def invalidate(self, url: Optional[str] = None):
+        """Oublie une feuille (ou toutes) : le prochain appel la retélécharge."""
+        if url is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(url, None)
+
+    def get_status(self) -> dict:
+        """Retourne l'état du cache."""
+        return {
+            'ttl': self.ttl,
+            'sheets': len(self._entries),
+            'refreshing': len(self._refreshing),
+            **self.stats
+        }
+
+
+# Instance globale
+sheet_cache: Optional[SheetCache] = None
+
+
+def get_sheet_cache() -> SheetCache:
+    """Récupère le cache des feuilles (créé au premier appel)."""
+    global sheet_cache
+    if sheet_cache is None:
+        sheet_cache = SheetCache()
+    return sheet_cache
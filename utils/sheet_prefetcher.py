@@ -0,0 +1,169 @@
+"""
+Préchargement des feuilles Google Sheets en tâche de fond.
+
+Les commandes déclarent leurs feuilles (URL d'export, fonction d'analyse,
+et éventuellement une fonction de réindexation). Une fois le bot démarré,
+la tâche recharge chaque feuille toutes les SHEET_PREFETCH_INTERVAL
+secondes, avant l'expiration du cache : les commandes trouvent toujours une
+feuille fraîche et n'attendent jamais un téléchargement.
+
+Quand une feuille a changé, le cache ne remplace que les lignes modifiées
+(voir SheetCache._diff_rows), puis les fonctions de réindexation sont
+appelées ici, hors des commandes : le catalogue et les index ne recalculent
+que les lignes nouvelles ou modifiées.
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from config import Config
+from utils.sheet_cache import get_sheet_cache
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchTarget:
+    """Feuille préchargée et fonctions à appeler quand elle change."""
+
+    def __init__(self, name: str, url: str, parse: Callable[[str], Any]):
+        self.name = name
+        self.url = url
+        self.parse = parse
+        self.on_update: List[Callable[[Any], None]] = []
+        self.data = None
+        self.refreshes = 0
+        self.updates = 0
+        self.errors = 0
+
+
+class SheetPrefetcher:
+    """Tâche de fond qui recharge les feuilles déclarées selon un intervalle fixe."""
+
+    def __init__(self, interval: float = Config.SHEET_PREFETCH_INTERVAL):
+        """
+        Args:
+            interval: Délai entre deux rechargements d'une feuille (secondes, 0 : désactivé)
+        """
+        self.interval = interval
+        self.targets: Dict[str, PrefetchTarget] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def register(self, name: str, url: str, parse: Callable[[str], Any],
+                 on_update: Optional[Callable[[Any], None]] = None):
+        """
+        Déclare une feuille à précharger (une seule fois par URL).
+
+        Args:
+            name: Nom affiché dans les logs et le statut
+            url: URL d'export CSV (la même que celle lue par la commande)
+            parse: Fonction CSV brut -> données, passée au cache
+            on_update: Appelée avec les nouvelles données quand la feuille change
+                (ignorée si elle est déjà déclarée pour cette feuille)
+        """
+        target = self.targets.get(url)
+        if target is None:
+            target = self.targets[url] = PrefetchTarget(name, url, parse)
+        if on_update is not None and on_update not in target.on_update:
+            target.on_update.append(on_update)
+
+    def clear_callbacks(self):
+        """
+        Oublie les fonctions de réindexation déclarées par les commandes
+        (avant de les recréer, voir FaerunBot.load_commands). Les feuilles
+        et leurs données restent en place.
+        """
+        for target in self.targets.values():
+            target.on_update.clear()
+
+    def start(self):
+        """Lance la tâche si elle ne tourne pas déjà."""
+        if self.interval > 0 and not self.running:
+            self._task = asyncio.create_task(self.run())
+
+    def stop(self):
+        """Interrompt la tâche."""
+        if self.running:
+            self._task.cancel()
+
+    async def run(self):
+        """Recharge toutes les feuilles, puis recommence après l'intervalle."""
+        logger.info(f"Préchargement des feuilles: {len(self.targets)} feuille(s), "
+                    f"toutes les {self.interval:.0f}s")
+        while True:
+            for target in list(self.targets.values()):
+                await self.refresh_target(target)
+            await asyncio.sleep(self.interval)
+
+    async def refresh_target(self, target: PrefetchTarget):
+        """Recharge une feuille et réindexe si elle a changé."""
+        cache = get_sheet_cache()
+        try:
+            if target.data is None:
+                # Premier passage : partir de l'instantané s'il existe
+                target.data = cache.peek(target.url)
+                if target.data is not None:
+                    self._notify(target, target.data)
+
+            data = await cache.refresh(target.url, target.parse)
+            target.refreshes += 1
+
+        except asyncio.CancelledError:
+            raise
+
+        except Exception as e:
+            target.errors += 1
+            logger.warning(f"Préchargement de {target.name} échoué: {e}")
+            return
+
+        if data is not target.data:
+            target.data = data
+            target.updates += 1
+            self._notify(target, data)
+
+    @staticmethod
+    def _notify(target: PrefetchTarget, data: Any):
+        """Appelle les fonctions de réindexation d'une feuille."""
+        for on_update in target.on_update:
+            try:
+                on_update(data)
+            except Exception as e:
+                logger.error(f"Réindexation de {target.name} échouée: {e}")
+
+    def get_status(self) -> dict:
+        """Retourne l'état du préchargement."""
+        return {
+            'interval': self.interval,
+            'running': self.running,
+            'sheets': {
+                target.name: {
+                    'refreshes': target.refreshes,
+                    'updates': target.updates,
+                    'errors': target.errors
+                }
+                for target in self.targets.values()
+            }
+        }
+
+
+# Instance globale
+sheet_prefetcher: Optional[SheetPrefetcher] = None
+
+
+def init_sheet_prefetcher() -> SheetPrefetcher:
+    """Initialise le préchargement (lancé par FaerunBot.setup_hook)."""
+    global sheet_prefetcher
+    sheet_prefetcher = SheetPrefetcher()
+    return sheet_prefetcher
+
+
+def get_sheet_prefetcher() -> SheetPrefetcher:
+    """Récupère le préchargement des feuilles (créé au premier appel)."""
+    global sheet_prefetcher
+    if sheet_prefetcher is None:
+        sheet_prefetcher = SheetPrefetcher()
+    return sheet_prefetcher
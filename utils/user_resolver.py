@@ -0,0 +1,128 @@
+"""
+Résolution des noms d'utilisateurs pour l'affichage des classements.
+
+Ordre de recherche : membre du serveur (cache local), cache LRU partagé,
+cache utilisateurs du client, puis appels `fetch_user` lancés en parallèle
+(sous sémaphore) pour les identifiants restants.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN_USER = "Utilisateur inconnu"
+
+
+class UserResolver:
+    """Résout des IDs en noms affichables avec un cache LRU + TTL partagé."""
+
+    def __init__(self, bot: discord.Client, max_size: int = 2000,
+                 ttl: float = 3600, concurrency: int = 5):
+        self.bot = bot
+        self.max_size = max_size
+        self.ttl = ttl
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._cache: "OrderedDict[int, tuple]" = OrderedDict()
+
+    def _cache_get(self, user_id: int) -> Optional[str]:
+        """Lit un nom en cache (None si absent ou expiré)."""
+        entry = self._cache.get(user_id)
+        if not entry:
+            return None
+        expires, name = entry
+        if expires <= time.monotonic():
+            del self._cache[user_id]
+            return None
+        self._cache.move_to_end(user_id)
+        return name
+
+    def _cache_set(self, user_id: int, name: str):
+        """Ajoute un nom au cache en évinçant le plus ancien si nécessaire."""
+        self._cache[user_id] = (time.monotonic() + self.ttl, name)
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    async def _fetch_name(self, user_id: int) -> str:
+        """Récupère un utilisateur via l'API (limité par le sémaphore)."""
+        async with self._semaphore:
+            try:
+                user = await self.bot.fetch_user(user_id)
+                name = user.display_name
+            except discord.NotFound:
+                name = UNKNOWN_USER
+            except discord.HTTPException as e:
+                logger.warning(f"Impossible de récupérer l'utilisateur {user_id}: {e}")
+                return UNKNOWN_USER
+        self._cache_set(user_id, name)
+        return name
+
+    async def resolve_names(self, guild: Optional[discord.Guild],
+                            user_ids: Iterable[int]) -> Dict[int, str]:
+        """
+        Résout une liste d'IDs en noms affichés.
+
+        Args:
+            guild: Serveur (pour les pseudos des membres), optionnel
+            user_ids: Identifiants à résoudre
+
+        Returns:
+            Dict[int, str]: Nom affiché par ID
+        """
+        names = {}
+        missing = []
+
+        for user_id in dict.fromkeys(user_ids):
+            member = guild.get_member(user_id) if guild else None
+            if member:
+                names[user_id] = member.display_name
+                continue
+
+            cached = self._cache_get(user_id)
+            if cached:
+                names[user_id] = cached
+                continue
+
+            user = self.bot.get_user(user_id)
+            if user:
+                names[user_id] = user.display_name
+                self._cache_set(user_id, user.display_name)
+                continue
+
+            missing.append(user_id)
+
+        if missing:
+            results = await asyncio.gather(*(self._fetch_name(uid) for uid in missing))
+            names.update(zip(missing, results))
+
+        return names
+
+    async def resolve_name(self, guild: Optional[discord.Guild], user_id: int) -> str:
+        """Résout un seul ID en nom affiché."""
+        return (await self.resolve_names(guild, [user_id]))[user_id]
+
+    def clear_cache(self):
+        """Vide le cache."""
+        self._cache.clear()
+
+
+# Instance globale
+user_resolver: Optional[UserResolver] = None
+
+
+def init_user_resolver(bot: discord.Client) -> UserResolver:
+    """Initialise le résolveur d'utilisateurs partagé."""
+    global user_resolver
+    user_resolver = UserResolver(bot)
+    return user_resolver
+
+
+def get_user_resolver() -> Optional[UserResolver]:
+    """Récupère le résolveur d'utilisateurs partagé."""
+    return user_resolver